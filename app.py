@@ -1,22 +1,30 @@
 import streamlit as st
-import pickle
 import pandas as pd
-import numpy as np
-import re
-import unicodedata
-import nltk
-from nltk.corpus import stopwords
-from pysentimiento import create_analyzer
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import seaborn as sns
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import io
-import base64
 from datetime import datetime
 import time
+import os
+import uuid
+
+from sentimento.texto import obter_stopwords
+from sentimento.cache import CachePredicoes
+from sentimento.classificacao import CATEGORIAS, COLUNAS_PROBAS, reclassificar
+from sentimento.streaming import tarefa_pontuar_csv
+from sentimento.jobs import CANCELADO, CONCLUIDO, ERRO, FilaJobs, tarefa_em_blocos
+from sentimento.dashboard import MemoriaDashboard, hash_textos, impressao, impressao_arquivo
+from sentimento.termos import IndiceTermos
+from sentimento.produtos import COLUNAS_PRODUTO, IndiceProdutos
+from sentimento.tendencias import ArmazemTendencias, gerar_dados_sinteticos
+from sentimento.duplicatas import LIMIAR_PADRAO, IndiceDuplicatas, colapsar_duplicatas, identificador_duplicatas
+from sentimento.microbatch import MicroBatcher
+from sentimento.artefato import ArtefatoInvalido
+from sentimento.aquecimento import ESTADO_MODELO, iniciar_aquecimento
+from sentimento.backends import BACKENDS
+from sentimento.modelo import BACKEND_PADRAO, carregar_pipeline, obter_analyzer, obter_manifesto
+from sentimento.metricas import METRICAS
+
+# Dependências pesadas (torch/pysentimiento, Plotly, matplotlib/WordCloud)
+# são importadas só onde são usadas: a página é pintada antes de o modelo
+# carregar, e cada modo só paga pelos gráficos que exibe.
 
 # Configuração da página
 st.set_page_config(
@@ -51,6 +59,23 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Artefato do modelo (sentimento.artefato): o manifesto define os padrões
+# de threshold e truncamento; sem artefato, valem os padrões do notebook
+try:
+    manifesto = obter_manifesto()
+except ArtefatoInvalido as e:
+    st.error(f"❌ Artefato do modelo inválido: {e}")
+    st.stop()
+preprocessamento = manifesto["preprocessamento"] if manifesto else {}
+
+# Carrega e aquece o modelo em segundo plano, uma vez por processo: o
+# Streamlit não tem gancho de inicialização, então começa na primeira
+# execução do script, enquanto a página é pintada. O estado é compartilhado
+# entre as sessões.
+iniciar_aquecimento(max_tokens=preprocessamento.get("max_tokens", 128),
+                    truncamento=preprocessamento.get("truncamento", "inicio"))
+estado_modelo = ESTADO_MODELO.como_dict()
+
 # Sidebar
 with st.sidebar:
     st.title("⚙️ Configurações")
@@ -63,164 +88,258 @@ with st.sidebar:
     
     # Configurações avançadas
     with st.expander("🔧 Configurações Avançadas"):
-        threshold = st.slider("📊 Threshold de Confiança", 0.0, 1.0, 0.55, 0.05)
+        threshold = st.slider("📊 Threshold de Confiança", 0.0, 1.0,
+                              manifesto["threshold"] if manifesto else 0.55, 0.05)
+        backend = st.selectbox(
+            "⚙️ Backend de Inferência", BACKENDS, index=BACKENDS.index(BACKEND_PADRAO),
+            help="fp32: modelo original; int8: quantização dinâmica (mais rápido em CPU); "
+                 "onnx: ONNX Runtime sobre o artefato local. Compare com python -m benchmarks.backends"
+        )
         max_textos = st.number_input("📝 Máximo de Textos", 1, 1000, 100)
+        tamanho_lote = st.number_input("📦 Tamanho do Lote (inferência)", 1, 256, 32)
+        max_tokens = st.number_input("✂️ Máximo de Tokens por Texto", 8, 512,
+                                     preprocessamento.get("max_tokens", 128))
+        truncamento = st.selectbox("✂️ Truncamento", ["inicio", "fim"],
+                                   index=["inicio", "fim"].index(preprocessamento.get("truncamento", "inicio")),
+                                   help="Parte do texto mantida quando excede o máximo de tokens")
+        stopwords_extras = st.text_input(
+            "🚫 Stop words do domínio",
+            placeholder="produto, celular",
+            help="Palavras extras ignoradas na análise, separadas por vírgula"
+        )
+        processos_inferencia = st.number_input(
+            "🧵 Processos de Inferência", 0, os.cpu_count() or 1, 0,
+            help="Divide as análises em lote entre vários processos (0 = desativado)"
+        )
+        threads_por_processo = st.number_input(
+            "🧵 Threads do Torch por Processo", 1, os.cpu_count() or 1, 1,
+            help="Mantenha processos × threads ≤ número de núcleos"
+        )
+        janela_microlote = st.number_input(
+            "⏱️ Janela do Micro-lote (ms)", 0, 100, 5,
+            help="Análises individuais de sessões diferentes que chegam dentro da janela "
+                 "são inferidas juntas (0 = desativado)"
+        )
+        max_microlote = st.number_input("⏱️ Máximo de Textos por Micro-lote", 1, 256, 32)
+        limiar_duplicatas = st.slider(
+            "🧬 Similaridade de Quase-Duplicatas", 0.0, 1.0, 0.0, 0.05,
+            help="Nas análises em lote, textos com similaridade de Jaccard ≥ este valor com outro já "
+                 "visto reaproveitam a predição dele, sem passar pelo modelo (0 = desativado)"
+        )
+        cache_persistente = st.checkbox(
+            "💾 Cache Persistente (SQLite)", True,
+            help="Mantém as predições entre reinícios do app"
+        )
+        medir_desempenho = st.checkbox(
+            "⏱️ Medir Desempenho", False, key="medir_desempenho",
+            help="Registra a latência de cada etapa (limpeza, stop words, inferência, gráficos, nuvem de palavras)"
+        )
         mostrar_detalhes = st.checkbox("🔍 Mostrar Detalhes do Processamento", True)
         auto_analise = st.checkbox("⚡ Análise Automática", False)
     
     # Informações do modelo
     with st.expander("📊 Informações do Modelo"):
         st.write("**Modelo:** PySentimiento")
+        st.write(f"**Backend:** {backend}")
+        if manifesto:
+            st.write(f"**Artefato:** {manifesto['modelo_id']} v{manifesto['versao']}")
         st.write("**Idioma:** Português")
         st.write("**Tarefa:** Análise de Sentimento")
         st.write("**Classes:** Positivo, Negativo, Neutro")
+        st.write(f"**Estado:** {estado_modelo['mensagem']}")
+        if estado_modelo["carregamento_s"] is not None:
+            st.write(f"**Carregamento:** {estado_modelo['carregamento_s']:.1f}s")
+        if estado_modelo["aquecimento_ms"]:
+            st.caption("Aquecimento (ms, primeira → última passagem): " + "; ".join(
+                f"lote {tamanho}: {tempos[0]:.0f} → {tempos[-1]:.0f}"
+                for tamanho, tempos in estado_modelo["aquecimento_ms"].items()
+            ))
+        info_cache = st.empty()
 
-# Funções necessárias do notebook
-def limpar_texto_completo(texto):
-    """
-    Limpa o texto, removendo URLs, menções, hashtags, caracteres especiais,
-    pontuações, números, espaços extras e acentos, convertendo para lowercase.
-    """
-    if isinstance(texto, str):
-        # Remove URLs
-        texto = re.sub(r'http\S+|www\S+|https\S+', '', texto, flags=re.MULTILINE)
-        # Remove menções (@)
-        texto = re.sub(r'@\w+', '', texto)
-        # Remove hashtags (#)
-        texto = re.sub(r'#\w+', '', texto)
-        # Remove caracteres especiais e pontuações, mantendo espaços
-        texto = re.sub(r'[^\w\s]', '', texto)
-        # Remove números
-        texto = re.sub(r'\d+', '', texto)
-        # Remove acentos
-        texto = ''.join((c for c in unicodedata.normalize('NFD', texto) if unicodedata.category(c) != 'Mn'))
-        # Remove espaços extras
-        texto = ' '.join(texto.split())
-        return texto.lower()
-    return ''
-
-def remover_stop_words(texto):
-    """
-    Remove stop words de um texto.
-    """
-    if isinstance(texto, str):
-        stop_words = set(stopwords.words('portuguese'))
-        palavras = texto.split()
-        texto_sem_stopwords = [palavra for palavra in palavras if palavra not in stop_words]
-        return ' '.join(texto_sem_stopwords)
-    return ''
-
-def classificar_sentimento_binario(texto, threshold=0.55):
-    resultado = analyzer.predict(texto)
-    probas = resultado.probas
-
-    if resultado.output == "POS":
-        return pd.Series(["positivo", round(probas["POS"], 3)])
-    elif resultado.output == "NEG":
-        return pd.Series(["negativo", round(probas["NEG"], 3)])
-    else:
-        # Se for neutro, compara POS e NEG e decide pela maior, se confiável
-        if probas["POS"] >= threshold:
-            return pd.Series(["positivo", round(probas["POS"], 3)])
-        elif probas["NEG"] >= threshold:
-            return pd.Series(["negativo", round(probas["NEG"], 3)])
-        else:
-            return pd.Series(["incerto", max(round(probas["POS"], 3), round(probas["NEG"], 3))])
-
-# Classe SentimentPipeline do notebook
-class SentimentPipeline:
-    def __init__(self):
-        pass
-
-    def processar_texto(self, texto):
-        texto_limpo = limpar_texto_completo(texto)
-        texto_sem_stop = remover_stop_words(texto_limpo)
-        sentimento, prob = classificar_sentimento_binario(texto_sem_stop)
-        return {
-            "texto_original": texto,
-            "texto_processado": texto_sem_stop,
-            "sentimento": sentimento,
-            "probabilidade": prob,
-            "timestamp": datetime.now()
-        }
-
-    def processar_dataframe(self, df, coluna="comentario_limpo"):
-        resultados = df[coluna].apply(self.processar_texto)
-        return pd.DataFrame(resultados.tolist())
+    # Preenchido ao final, depois das etapas medidas nesta execução
+    with st.expander("⏱️ Desempenho"):
+        info_desempenho = st.empty()
+
+# O registro é compartilhado entre as sessões, mas a medição só é ligada
+# na execução do script desta sessão (e nos jobs que ela submeter)
+METRICAS.ativar_local(medir_desempenho)
+
+# Pipeline, carregamento do modelo e esquema dos resultados ficam no pacote
+# sentimento, compartilhado com o app_simples.py
 
 # Carregar componentes
 @st.cache_resource
-def carregar_analyzer():
+def carregar_analyzer(backend):
     try:
-        return create_analyzer(task="sentiment", lang="pt")
+        return obter_analyzer(backend=backend)
     except Exception as e:
         st.error(f"Erro ao carregar o analyzer: {e}")
         return None
 
 @st.cache_resource
-def carregar_modelo():
+def carregar_modelo(backend):
     try:
-        with open('sentiment_pipeline.pkl', 'rb') as f:
-            return pickle.load(f)
+        return carregar_pipeline(backend=backend)
     except Exception as e:
         st.error(f"Erro ao carregar o modelo: {e}")
         return None
 
+@st.cache_resource
+def carregar_cache_predicoes(persistente):
+    caminho = os.environ.get("SENTIMENTO_CACHE_SQLITE", "cache_predicoes.sqlite") if persistente else None
+    return CachePredicoes(caminho_sqlite=caminho)
+
+@st.cache_resource(max_entries=1)
+def carregar_pool_inferencia(num_processos, threads_por_processo, backend):
+    # Ao trocar a configuração a instância anterior sai do cache e, ao ser
+    # coletada, o executor encerra os seus processos
+    if num_processos == 0:
+        return None
+    from functools import partial
+    from sentimento.paralelo import PoolInferencia
+    return PoolInferencia(num_processos, threads_por_processo,
+                          fabrica_analyzer=partial(obter_analyzer, None, backend))
+
+@st.cache_resource
+def carregar_microbatcher(janela_ms, max_lote, max_tokens, truncamento, backend):
+    # Compartilhado entre as sessões com a mesma configuração
+    if janela_ms == 0:
+        return None
+    from sentimento.inferencia import prever_probas_lote
+    analyzer = obter_analyzer(backend=backend)
+    return MicroBatcher(
+        lambda textos: prever_probas_lote(analyzer, textos, max_lote, max_tokens, truncamento),
+        janela_ms, max_lote
+    )
+
+@st.cache_resource
+def carregar_fila_jobs():
+    return FilaJobs(os.environ.get("SENTIMENTO_JOBS_DIR", ".jobs"))
+
+@st.cache_resource
+def carregar_memoria_dashboard():
+    return MemoriaDashboard(os.environ.get("SENTIMENTO_DASHBOARD_DIR", ".dashboard"))
+
+@st.cache_resource
+def carregar_armazem_tendencias():
+    diretorio = os.environ.get("SENTIMENTO_TENDENCIAS_DIR", ".tendencias")
+    os.makedirs(diretorio, exist_ok=True)
+    return ArmazemTendencias(os.path.join(diretorio, "diario.csv"))
+
+@st.cache_resource(max_entries=1)
+def carregar_tendencias_demo(linhas):
+    return ArmazemTendencias().registrar_resultados(gerar_dados_sinteticos(linhas))
+
+@st.cache_data(max_entries=2)
+def ler_dados_dashboard(caminho, impressao_dados):
+    # A impressão do conteúdo entra na chave: o arquivo só é relido quando muda
+    return pd.read_csv(caminho)
+
+@st.cache_resource(max_entries=16)
+def carregar_indice_duplicatas(chave, limiar):
+    # Como carregar_indice_termos: um índice por análise exibida, não um compartilhado entre as sessões
+    return IndiceDuplicatas(limiar)
+
+@st.cache_resource
+def carregar_indice_stopwords(extras):
+    return obter_stopwords().com_palavras(extras) if extras else obter_stopwords()
+
+# Acima deste tamanho, o modo Lote sugere o processamento em streaming
+LIMITE_STREAMING_BYTES = 50 * 1024 * 1024
+
+# Colunas do índice de produtos, como aparecem na interface
+NOMES_DIMENSOES = {"Titulo": "Produto", "Pesquisa": "Pesquisa"}
+
+# Itens exibidos no ranking de negatividade
+ITENS_RANKING = 20
+
+# Períodos do modo Tendências
+NOMES_GRANULARIDADES = {"D": "Diário", "W": "Semanal", "M": "Mensal"}
+
+# Termos por sentimento nas tabelas abaixo das nuvens de palavras
+TERMOS_TABELA = 15
+
+# Dados analisados pelo Dashboard Completo
+ARQUIVO_DASHBOARD = "comments_amazon.csv"
+
+# Textos por bloco dos jobs em segundo plano (progresso e parciais a cada bloco)
+TAMANHO_BLOCO_JOB = 1000
+
+# Intervalo entre atualizações da página enquanto há jobs em andamento
+INTERVALO_ATUALIZACAO_JOBS = 1.0
+
+# Intervalo entre atualizações da página enquanto o modelo é aquecido
+INTERVALO_ATUALIZACAO_MODELO = 0.5
+
+# Título principal (pintado antes de o modelo carregar)
+st.markdown('<h1 class="main-header">🤖 Análise de Sentimento Avançada</h1>', unsafe_allow_html=True)
+
 # Inicializar componentes
-analyzer = carregar_analyzer()
-modelo = carregar_modelo()
+# Tendências usa dados sintéticos e não precisa do modelo
+usa_modelo = modo_analise != "Tendências"
+
+# Os modos com modelo só abrem depois do aquecimento, para a primeira
+# análise não pagar o carregamento
+if usa_modelo and not estado_modelo["pronto"]:
+    if estado_modelo["erro"]:
+        st.error(f"❌ Não foi possível carregar o modelo: {estado_modelo['erro']}")
+        if st.button("🔄 Tentar Novamente"):
+            ESTADO_MODELO.reiniciar()
+            st.rerun()
+        st.stop()
+    st.info(f"⏳ {estado_modelo['mensagem']}... a análise fica disponível em instantes.")
+    time.sleep(INTERVALO_ATUALIZACAO_MODELO)
+    st.rerun()
 
-if analyzer is None or modelo is None:
+# O aquecimento cobre o backend padrão; os outros são preparados na primeira
+# escolha (o int8 quantiza o modelo, o onnx pode precisar exportá-lo)
+if usa_modelo and backend != BACKEND_PADRAO:
+    with st.spinner(f"Preparando o backend {backend}..."):
+        analyzer = carregar_analyzer(backend)
+else:
+    analyzer = carregar_analyzer(backend) if usa_modelo else None
+modelo = carregar_modelo(backend)
+
+if (usa_modelo and analyzer is None) or modelo is None:
     st.error("❌ Não foi possível carregar os componentes necessários.")
     st.stop()
 
-# Título principal
-st.markdown('<h1 class="main-header">🤖 Análise de Sentimento Avançada</h1>', unsafe_allow_html=True)
+palavras_extras = tuple(sorted({p.strip() for p in stopwords_extras.split(",") if p.strip()}))
+indice_stopwords = carregar_indice_stopwords(palavras_extras)
+cache_predicoes = carregar_cache_predicoes(cache_persistente)
+pool_inferencia = carregar_pool_inferencia(processos_inferencia, threads_por_processo, backend)
+microbatcher = carregar_microbatcher(janela_microlote, max_microlote, max_tokens, truncamento,
+                                     backend) if usa_modelo else None
+fila_jobs = carregar_fila_jobs()
+memoria_dashboard = carregar_memoria_dashboard()
+armazem_tendencias = carregar_armazem_tendencias()
 
-# Funções de visualização
-def criar_grafico_sentimentos(df):
-    """Cria gráfico de pizza com distribuição de sentimentos"""
-    fig = px.pie(
-        df, 
-        names='sentimento', 
-        title='Distribuição de Sentimentos',
-        color_discrete_map={'positivo': '#28a745', 'negativo': '#dc3545', 'incerto': '#ffc107'}
-    )
-    fig.update_layout(height=400)
-    return fig
-
-def criar_grafico_confianca(df):
-    """Cria histograma de confiança"""
-    fig = px.histogram(
-        df, 
-        x='probabilidade', 
-        color='sentimento',
-        title='Distribuição de Confiança por Sentimento',
-        nbins=20
-    )
-    fig.update_layout(height=400)
-    return fig
+# Configuração do modelo (sem o threshold) nas chaves do Dashboard e das Tendências
+if usa_modelo:
+    from sentimento.inferencia import identificador_modelo
+    config_modelo = impressao(identificador_modelo(analyzer, max_tokens, truncamento), palavras_extras,
+                              limiar_duplicatas > 0 and identificador_duplicatas(limiar_duplicatas))
+else:
+    config_modelo = None
 
-def criar_wordcloud(textos, titulo):
-    """Cria wordcloud dos textos"""
-    if not textos:
-        return None
-    
-    texto_completo = ' '.join(textos)
-    wordcloud = WordCloud(
-        width=800, 
-        height=400, 
-        background_color='white',
-        colormap='viridis'
-    ).generate(texto_completo)
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wordcloud, interpolation='bilinear')
-    ax.axis('off')
-    ax.set_title(titulo)
-    
-    return fig
+# Opções das análises de texto único (modos Individual e Comparação)
+opcoes_individuais = dict(microbatcher=microbatcher, max_tokens=max_tokens, truncamento=truncamento)
+
+# Marcado por exibir_job quando há job em andamento na página
+aguardando_jobs = False
 
+# Jobs desta sessão (o limite de jobs finalizados guardados vale por sessão)
+id_sessao = st.session_state.setdefault("id_sessao", uuid.uuid4().hex)
+with st.sidebar:
+    jobs_sessao = fila_jobs.listar(st.session_state.get("jobs", []))
+    if jobs_sessao:
+        with st.expander("📋 Jobs em Segundo Plano", expanded=any(j.ativo for j in jobs_sessao)):
+            for job in jobs_sessao[:10]:
+                st.write(f"**{job.descricao}** — {job.estado} ({job.progresso:.0%})")
+                if job.ativo:
+                    aguardando_jobs = True
+
+# Funções de visualização
 def criar_metricas_avancadas(df):
     """Cria métricas avançadas"""
     col1, col2, col3, col4 = st.columns(4)
@@ -237,6 +356,199 @@ def criar_metricas_avancadas(df):
     with col4:
         st.metric("📉 Menor Confiança", f"{df['probabilidade'].min():.1%}")
 
+def criar_processador_bloco(threshold, relatorio=None):
+    """
+    Função que processa um bloco de textos com as configurações atuais da
+    sidebar, fixadas no momento da criação (o job continua com elas mesmo
+    que a sidebar mude depois).
+    """
+    configuracao = dict(
+        batch_size=tamanho_lote,
+        threshold=threshold,
+        max_tokens=max_tokens,
+        truncamento=truncamento,
+        indice_stopwords=indice_stopwords,
+        cache=cache_predicoes,
+        pool=pool_inferencia,
+        # Um índice de quase-duplicatas por análise: os grupos e representantes
+        # dependem só dos textos dela, e o índice é liberado quando o job termina
+        duplicatas=IndiceDuplicatas(limiar_duplicatas) if limiar_duplicatas > 0 else None,
+        relatorio=relatorio
+    )
+    
+    medir = medir_desempenho
+    config = config_modelo
+    
+    def processar_bloco(textos):
+        # O job roda em outra thread: a medição segue a sessão que o submeteu
+        with METRICAS.ativado(medir):
+            df_bloco = modelo.processar_lote(textos, **configuracao).para_dataframe()
+        # Reanalisar o mesmo bloco (mesmo arquivo, outro threshold) não conta os textos de novo
+        chave = impressao(hash_textos(textos).tobytes().hex(), config)
+        armazem_tendencias.registrar_resultados(df_bloco, chave)
+        return df_bloco
+    
+    return processar_bloco
+
+def registrar_job(job):
+    """Guarda o ID do job na sessão, para listá-lo na sidebar"""
+    st.session_state.setdefault("jobs", []).append(job.id)
+
+def exibir_job(job):
+    """Mostra o estado de um job; enquanto ele roda, a página se atualiza sozinha"""
+    global aguardando_jobs
+    if job is None:
+        st.warning("⚠️ Job não encontrado (o servidor pode ter sido reiniciado).")
+    elif job.ativo:
+        aguardando_jobs = True
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.progress(job.progresso, text=f"⏳ {job.descricao} — {job.mensagem or 'na fila'}")
+        with col2:
+            if st.button("⏹️ Cancelar", key=f"cancelar_{job.id}"):
+                job.cancelar()
+    elif job.estado == CONCLUIDO:
+        st.success(f"✅ {job.descricao} — concluído em {job.finalizado_em - job.iniciado_em:.1f}s")
+    elif job.estado == CANCELADO:
+        st.warning(f"⏹️ {job.descricao} — cancelado (resultados parciais abaixo)")
+    elif job.estado == ERRO:
+        st.error(f"Erro no processamento: {job.erro}")
+    else:
+        st.warning(f"⚠️ {job.descricao} — interrompido por um reinício do servidor")
+
+def resultados_job(job):
+    """Resultados finais de um job concluído, ou os parciais disponíveis até agora"""
+    if job is None:
+        return None
+    if job.estado == CONCLUIDO:
+        return fila_jobs.resultado(job.id)
+    return job.parciais()
+
+def exibir_agregados(agregados):
+    """Métricas e distribuição a partir dos agregados de uma análise em streaming"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📊 Total de Análises", agregados["total"])
+    with col2:
+        st.metric("📈 Confiança Média", f"{agregados['media_probabilidade']:.1%}")
+    with col3:
+        st.metric("🎯 Maior Confiança", f"{agregados['max_probabilidade']:.1%}")
+    with col4:
+        st.metric("📉 Menor Confiança", f"{agregados['min_probabilidade']:.1%}")
+    
+    import plotly.express as px
+    from sentimento.graficos import CORES_SENTIMENTO
+
+    contagem = pd.DataFrame(list(agregados["contagem"].items()), columns=["sentimento", "quantidade"])
+    with METRICAS.medir("graficos"):
+        fig = px.pie(
+            contagem,
+            names='sentimento',
+            values='quantidade',
+            title='Distribuição de Sentimentos',
+            color='sentimento',
+            color_discrete_map=CORES_SENTIMENTO
+        )
+        fig.update_layout(height=400)
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_resource(max_entries=16)
+def carregar_indice_termos(chave):
+    # Um índice por análise exibida (e threshold); cada rerun acrescenta só as linhas novas
+    return IndiceTermos()
+
+def exibir_termos(indice, titulo):
+    """Nuvens de palavras (PNG em cache) e termos mais frequentes dos sentimentos positivo e negativo"""
+    from sentimento.graficos import criar_wordcloud
+
+    st.subheader(titulo)
+    colunas = st.columns(2)
+    for coluna, sentimento, legenda in zip(colunas, ("positivo", "negativo"),
+                                           ("Palavras Positivas", "Palavras Negativas")):
+        with coluna:
+            png = criar_wordcloud(indice.frequencias(sentimento))
+            if png is None:
+                continue
+            st.image(png, caption=legenda, use_container_width=True)
+            st.dataframe(
+                indice.top(sentimento, TERMOS_TABELA).style.format({"participacao": "{:.1%}"}),
+                hide_index=True, use_container_width=True
+            )
+
+@st.cache_resource(max_entries=16)
+def carregar_indice_produtos(chave):
+    # Como carregar_indice_termos: um índice por análise exibida, atualizado com as linhas novas
+    return IndiceProdutos()
+
+def exibir_produtos(indice, df_resultados, df_origem):
+    """Ranking de produtos/pesquisas por negatividade e detalhe de um deles, pelo índice de produtos"""
+    if not indice.dimensoes:
+        return
+    st.subheader("🏷️ Produtos e Pesquisas")
+    col1, col2 = st.columns(2)
+    with col1:
+        dimensao = st.radio("Agrupar por", indice.dimensoes, format_func=NOMES_DIMENSOES.get, horizontal=True)
+    with col2:
+        minimo = st.number_input("Mínimo de comentários", 1, 1000, 3)
+    
+    ranking = indice.ranking_negatividade(dimensao, minimo)
+    if ranking.empty:
+        st.info(f"Nenhum item com pelo menos {minimo} comentários.")
+        return
+    st.write(f"**Mais negativos** ({len(ranking)} com pelo menos {minimo} comentários)")
+    st.dataframe(
+        ranking.head(ITENS_RANKING)[
+            ["total", "negativo", "pct_negativo", "positivo", "pct_positivo", "confianca_media", "confianca_desvio"]
+        ].style.format({
+            "pct_negativo": "{:.1%}", "pct_positivo": "{:.1%}",
+            "confianca_media": "{:.1%}", "confianca_desvio": "{:.3f}"
+        }),
+        use_container_width=True
+    )
+    
+    # Detalhe: as linhas vêm das posições guardadas no índice
+    escolha = st.selectbox("🔎 Detalhar", ranking.index.tolist())
+    linha = ranking.loc[escolha]
+    posicoes = indice.posicoes(dimensao, escolha)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💬 Comentários", int(linha["total"]))
+    with col2:
+        st.metric("😞 Negativos", f"{linha['pct_negativo']:.1%}")
+    with col3:
+        st.metric("😊 Positivos", f"{linha['pct_positivo']:.1%}")
+    with col4:
+        st.metric("📈 Confiança Média", f"{linha['confianca_media']:.1%}",
+                  f"± {linha['confianca_desvio']:.3f}", delta_color="off")
+    if "Link" in df_origem.columns and len(posicoes):
+        st.markdown(f"[🔗 Abrir anúncio]({df_origem['Link'].iloc[posicoes[0]]})")
+    st.dataframe(
+        df_resultados.iloc[posicoes][["texto_original", "sentimento", "probabilidade", "prob_neg"]]
+        .sort_values("prob_neg", ascending=False),
+        hide_index=True, use_container_width=True
+    )
+
+def exibir_relatorio_padding(relatorio):
+    """Exibe a eficiência de padding da inferência em lote"""
+    if not relatorio:
+        return
+    with st.expander("📐 Eficiência de Padding"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(
+                "Eficiência (agrupado por tamanho)",
+                f"{relatorio['eficiencia']:.1%}",
+                f"{relatorio['eficiencia'] - relatorio['eficiencia_ordem_original']:+.1%}"
+            )
+        with col2:
+            st.metric("Eficiência (ordem original)", f"{relatorio['eficiencia_ordem_original']:.1%}")
+        with col3:
+            st.metric("✂️ Textos Truncados", relatorio["textos_truncados"])
+        st.caption(
+            f"{relatorio['tokens_reais']} tokens reais ÷ {relatorio['tokens_com_padding']} tokens com padding "
+            f"(ordem original: {relatorio['tokens_com_padding_ordem_original']})"
+        )
+
 # Interface principal baseada no modo selecionado
 if modo_analise == "Individual":
     st.header("📝 Análise Individual")
@@ -266,7 +578,7 @@ if modo_analise == "Individual":
     if auto_analise and texto.strip():
         with st.spinner("Analisando automaticamente..."):
             time.sleep(0.5)
-            resultado = modelo.processar_texto(texto)
+            resultado = modelo.processar_texto(texto, indice_stopwords, cache_predicoes, threshold, **opcoes_individuais)
             st.session_state.resultado = resultado
     
     # Botão de análise
@@ -275,8 +587,10 @@ if modo_analise == "Individual":
             with st.spinner("Analisando sentimento..."):
                 try:
                     # Processar o texto
-                    resultado = modelo.processar_texto(texto)
+                    resultado = modelo.processar_texto(texto, indice_stopwords, cache_predicoes, threshold, **opcoes_individuais)
                     st.session_state.resultado = resultado
+                    armazem_tendencias.registrar([resultado['timestamp']], [resultado['sentimento']],
+                                                 [resultado['probabilidade']])
                     
                     # Exibir resultados
                     st.success("✅ Análise concluída!")
@@ -325,6 +639,7 @@ if modo_analise == "Individual":
                                 st.json({
                                     "sentimento": resultado["sentimento"],
                                     "probabilidade": resultado["probabilidade"],
+                                    "probabilidades": {c: round(float(resultado[c]), 3) for c in COLUNAS_PROBAS.values()},
                                     "timestamp": str(resultado["timestamp"])
                                 })
                     
@@ -334,6 +649,8 @@ if modo_analise == "Individual":
             st.warning("⚠️ Por favor, digite um texto para análise.")
 
 elif modo_analise == "Lote":
+    from sentimento.graficos import criar_grafico_confianca, criar_grafico_sentimentos
+
     st.header("📊 Análise em Lote")
     
     # Upload de arquivo
@@ -345,7 +662,17 @@ elif modo_analise == "Lote":
     
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            # Arquivos grandes são lidos e pontuados em blocos, sem carregar tudo
+            modo_streaming = st.checkbox(
+                "🌊 Processar em streaming",
+                uploaded_file.size > LIMITE_STREAMING_BYTES,
+                help="Lê e analisa o CSV em blocos, gravando os resultados em disco (memória limitada)"
+            )
+            if modo_streaming:
+                df = pd.read_csv(uploaded_file, nrows=5)
+                uploaded_file.seek(0)
+            else:
+                df = pd.read_csv(uploaded_file)
             st.write("**Arquivo carregado:**")
             st.dataframe(df.head())
             
@@ -360,158 +687,264 @@ elif modo_analise == "Lote":
             with col1:
                 processar_todos = st.checkbox("Processar todos os textos", True)
             with col2:
+                if modo_streaming:
+                    linhas_por_bloco = st.number_input("Linhas por bloco", 100, 100_000, 5000, 100)
                 if not processar_todos:
-                    num_textos = st.number_input("Número de textos", 1, len(df), min(100, len(df)))
+                    if modo_streaming:
+                        num_textos = st.number_input("Número de textos", 1, None, 100)
+                    else:
+                        num_textos = st.number_input("Número de textos", 1, len(df), min(100, len(df)))
             
-            if st.button("📈 Iniciar Análise em Lote", type="primary"):
-                if processar_todos:
-                    df_processar = df
-                else:
-                    df_processar = df.head(num_textos)
+            if modo_streaming and st.button("📈 Iniciar Análise em Lote", type="primary"):
+                # A análise anterior (e o CSV de resultados dela) é descartada
+                anterior = st.session_state.pop("analise_lote_streaming", None)
+                if anterior is not None:
+                    fila_jobs.descartar(anterior["job_id"])
+                
+                # O job grava o upload no disco e lê os blocos de lá, sem outra cópia em memória
+                job = fila_jobs.submeter(
+                    f"Lote (streaming): {uploaded_file.name}",
+                    tarefa_pontuar_csv(
+                        uploaded_file,
+                        coluna_texto,
+                        criar_processador_bloco(threshold),
+                        tamanho_bloco=linhas_por_bloco,
+                        limite_linhas=None if processar_todos else num_textos
+                    ),
+                    sessao=id_sessao
+                )
+                registrar_job(job)
+                st.session_state.analise_lote_streaming = {
+                    "arquivo": uploaded_file.file_id,
+                    "job_id": job.id
+                }
+            
+            analise_streaming = st.session_state.get("analise_lote_streaming")
+            if (modo_streaming and analise_streaming is not None
+                    and analise_streaming["arquivo"] == uploaded_file.file_id):
+                job = fila_jobs.obter(analise_streaming["job_id"])
+                exibir_job(job)
+                resultado = fila_jobs.resultado(job.id) if job is not None and job.estado == CONCLUIDO else None
                 
-                # Barra de progresso
-                progress_bar = st.progress(0)
-                status_text = st.empty()
+                if job is not None and job.ativo and "agregados" in job.info:
+                    exibir_agregados(job.info["agregados"])
                 
-                with st.spinner("Processando arquivo..."):
-                    try:
-                        # Processar textos
-                        resultados = []
-                        total = len(df_processar)
-                        
-                        for idx, row in df_processar.iterrows():
-                            resultado = modelo.processar_texto(row[coluna_texto])
-                            resultados.append(resultado)
-                            
-                            # Atualizar progresso
-                            progress = (idx + 1) / total
-                            progress_bar.progress(progress)
-                            status_text.text(f"Processando... {idx + 1}/{total}")
-                        
-                        # Criar DataFrame de resultados
-                        df_resultados = pd.DataFrame(resultados)
-                        df_final = pd.concat([df_processar, df_resultados], axis=1)
-                        
-                        st.success(f"✅ Análise concluída! {len(df_resultados)} textos processados.")
-                        
-                        # Métricas avançadas
-                        criar_metricas_avancadas(df_resultados)
-                        
-                        # Visualizações
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.plotly_chart(criar_grafico_sentimentos(df_resultados), use_container_width=True)
-                        
-                        with col2:
-                            st.plotly_chart(criar_grafico_confianca(df_resultados), use_container_width=True)
-                        
-                        # Wordclouds
-                        st.subheader("☁️ Nuvens de Palavras")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            textos_positivos = df_resultados[df_resultados['sentimento'] == 'positivo']['texto_processado'].tolist()
-                            if textos_positivos:
-                                fig = criar_wordcloud(textos_positivos, "Palavras Positivas")
-                                if fig:
-                                    st.pyplot(fig)
-                        
-                        with col2:
-                            textos_negativos = df_resultados[df_resultados['sentimento'] == 'negativo']['texto_processado'].tolist()
-                            if textos_negativos:
-                                fig = criar_wordcloud(textos_negativos, "Palavras Negativas")
-                                if fig:
-                                    st.pyplot(fig)
-                        
-                        # Tabela de resultados
-                        st.subheader("📋 Resultados Detalhados")
-                        st.dataframe(df_final)
-                        
-                        # Download dos resultados
-                        csv = df_final.to_csv(index=False)
+                if resultado is not None and os.path.exists(resultado["caminho"]):
+                    exibir_agregados(resultado["agregados"])
+                    
+                    st.subheader("📋 Amostra dos Resultados")
+                    st.dataframe(resultado["amostra"])
+                    
+                    # O download sai direto do arquivo gravado em disco
+                    with open(resultado["caminho"], "rb") as arquivo_resultados:
                         st.download_button(
                             label="📥 Download dos Resultados (CSV)",
-                            data=csv,
+                            data=arquivo_resultados,
                             file_name=f"analise_sentimento_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                             mime="text/csv"
                         )
-                        
-                    except Exception as e:
-                        st.error(f"Erro no processamento: {e}")
-                        
+            
+            if not modo_streaming and st.button("📈 Iniciar Análise em Lote", type="primary"):
+                if processar_todos:
+                    df_processar = df
+                else:
+                    df_processar = df.head(num_textos)
+                
+                # A análise roda como job em segundo plano; a página só acompanha.
+                # O job da análise anterior (e o resultado gravado) é descartado
+                anterior = st.session_state.pop("analise_lote", None)
+                if anterior is not None:
+                    fila_jobs.descartar(anterior["job_id"])
+                relatorio_padding = {}
+                job = fila_jobs.submeter(
+                    f"Lote: {uploaded_file.name} ({len(df_processar)} textos)",
+                    tarefa_em_blocos(
+                        df_processar[coluna_texto].tolist(),
+                        criar_processador_bloco(threshold, relatorio_padding),
+                        TAMANHO_BLOCO_JOB
+                    ),
+                    sessao=id_sessao
+                )
+                registrar_job(job)
+                st.session_state.analise_lote = {
+                    "arquivo": uploaded_file.file_id,
+                    "df_processar": df_processar,
+                    "job_id": job.id,
+                    "relatorio_padding": relatorio_padding
+                }
+            
+            analise = st.session_state.get("analise_lote")
+            df_base = None
+            if not modo_streaming and analise is not None and analise["arquivo"] == uploaded_file.file_id:
+                job = fila_jobs.obter(analise["job_id"])
+                exibir_job(job)
+                df_base = resultados_job(job)
+            
+            if df_base is not None and not df_base.empty:
+                # Resultados (parciais ou finais) ficam no job: mudar o threshold só reclassifica
+                df_resultados = reclassificar(df_base, threshold)
+                df_final = pd.concat(
+                    [analise["df_processar"].head(len(df_resultados)).reset_index(drop=True), df_resultados],
+                    axis=1
+                )
+                relatorio_padding = analise["relatorio_padding"]
+                
+                # Métricas avançadas
+                criar_metricas_avancadas(df_resultados)
+                
+                if mostrar_detalhes:
+                    exibir_relatorio_padding(relatorio_padding)
+                
+                # Visualizações
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.plotly_chart(criar_grafico_sentimentos(df_resultados), use_container_width=True)
+                
+                with col2:
+                    st.plotly_chart(criar_grafico_confianca(df_resultados), use_container_width=True)
+                
+                # Wordclouds
+                indice_termos = carregar_indice_termos(f"lote:{analise['job_id']}:{threshold}")
+                exibir_termos(indice_termos.atualizar(df_resultados), "☁️ Nuvens de Palavras")
+                
+                # Por produto/pesquisa, se o arquivo tiver essas colunas
+                df_origem = analise["df_processar"]
+                if any(coluna in df_origem.columns for coluna in COLUNAS_PRODUTO):
+                    indice_produtos = carregar_indice_produtos(f"lote:{analise['job_id']}:{threshold}")
+                    exibir_produtos(indice_produtos.atualizar(df_origem, df_resultados), df_resultados, df_origem)
+                
+                # Tabela de resultados
+                st.subheader("📋 Resultados Detalhados")
+                if st.checkbox("🧬 Agrupar quase-duplicatas", False,
+                               help="Uma linha por grupo de textos repetidos ou quase iguais (spam, cópias)"):
+                    indice = carregar_indice_duplicatas(f"lote:{analise['job_id']}", limiar_duplicatas or LIMIAR_PADRAO)
+                    grupos = indice.agrupar(df_resultados["texto_processado"])
+                    df_grupos = colapsar_duplicatas(df_resultados, grupos)
+                    st.caption(f"{len(df_resultados)} textos em {len(df_grupos)} grupos "
+                               f"({1 - len(df_grupos) / len(df_resultados):.1%} repetidos ou quase iguais)")
+                    st.dataframe(df_grupos, hide_index=True)
+                else:
+                    st.dataframe(df_final)
+                
+                # Download dos resultados
+                csv = df_final.to_csv(index=False)
+                st.download_button(
+                    label="📥 Download dos Resultados (CSV)",
+                    data=csv,
+                    file_name=f"analise_sentimento_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+                
         except Exception as e:
             st.error(f"Erro ao ler o arquivo: {e}")
 
 elif modo_analise == "Dashboard Completo":
+    import plotly.express as px
+    from sentimento.graficos import criar_grafico_confianca, criar_grafico_sentimentos
+
     st.header("📊 Dashboard Completo")
     
     # Carregar dados de exemplo
     try:
-        df_exemplo = pd.read_csv('comments_amazon.csv')
+        impressao_dados = impressao_arquivo(ARQUIVO_DASHBOARD)
+        df_exemplo = ler_dados_dashboard(ARQUIVO_DASHBOARD, impressao_dados)
         st.write("**Dados de Exemplo Carregados:**")
         st.dataframe(df_exemplo.head())
         
-        if st.button("🚀 Executar Análise Completa", type="primary"):
-            with st.spinner("Executando análise completa..."):
-                # Processar dados
-                df_processar = df_exemplo.head(500)  # Limitar para performance
-                resultados = []
-                
-                progress_bar = st.progress(0)
-                for idx, row in df_processar.iterrows():
-                    resultado = modelo.processar_texto(row['Comentario'])
-                    resultados.append(resultado)
-                    progress_bar.progress((idx + 1) / len(df_processar))
-                
-                df_resultados = pd.DataFrame(resultados)
-                
-                # Dashboard completo
-                st.success("✅ Dashboard gerado com sucesso!")
-                
-                # Métricas principais
-                criar_metricas_avancadas(df_resultados)
-                
-                # Gráficos
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.plotly_chart(criar_grafico_sentimentos(df_resultados), use_container_width=True)
-                with col2:
-                    st.plotly_chart(criar_grafico_confianca(df_resultados), use_container_width=True)
+        # Análises guardadas por arquivo + configuração do modelo (sentimento.dashboard):
+        # com a mesma impressão, nada passa pelo modelo; o threshold é aplicado na exibição
+        textos_dashboard = df_exemplo['Comentario'].dropna().astype(str).tolist()
+        chave_dashboard = impressao(impressao_dados, config_modelo)
+        analise_guardada = memoria_dashboard.obter(chave_dashboard)
+        
+        if analise_guardada is None:
+            relatorio_padding = {}
+            tarefa = memoria_dashboard.tarefa(
+                chave_dashboard, textos_dashboard, config_modelo,
+                criar_processador_bloco(threshold, relatorio_padding), TAMANHO_BLOCO_JOB, relatorio_padding
+            )
+            pendentes = memoria_dashboard.pendentes(textos_dashboard, config_modelo)
+            if pendentes == 0:
+                # Todos os textos já têm resultado (ex.: linhas removidas do arquivo)
+                tarefa(None)
+                analise_guardada = memoria_dashboard.obter(chave_dashboard)
+            else:
+                st.info(f"📝 {pendentes} de {len(textos_dashboard)} comentários ainda não foram analisados "
+                        f"com esta configuração; os demais são reaproveitados.")
+                if st.button("🚀 Executar Análise Completa", type="primary"):
+                    # O resultado fica na memória do dashboard, não precisa ser gravado pelo job
+                    job = fila_jobs.submeter(f"Dashboard: {pendentes} comentários novos", tarefa,
+                                             guardar_resultado=False, sessao=id_sessao)
+                    registrar_job(job)
+                    st.session_state.analise_dashboard = {
+                        "job_id": job.id,
+                        "chave": chave_dashboard,
+                        "relatorio_padding": relatorio_padding
+                    }
+        
+        df_resultados = None
+        if analise_guardada is not None:
+            df_resultados = reclassificar(analise_guardada["resultados"], threshold)
+            relatorio_padding = analise_guardada["relatorio_padding"]
+            st.caption(f"✅ {len(df_resultados)} comentários — {analise_guardada['novas']} analisados pelo modelo, "
+                       f"{analise_guardada['reaproveitadas']} reaproveitados de análises anteriores")
+        else:
+            # Job em andamento para esta mesma impressão: parciais com os comentários novos
+            analise = st.session_state.get("analise_dashboard")
+            if analise is not None and analise["chave"] == chave_dashboard:
+                job = fila_jobs.obter(analise["job_id"])
+                exibir_job(job)
+                df_parcial = resultados_job(job)
+                if df_parcial is not None and not df_parcial.empty:
+                    df_resultados = reclassificar(df_parcial, threshold)
+                    relatorio_padding = analise["relatorio_padding"]
+        
+        if df_resultados is not None and not df_resultados.empty:
+            # Métricas principais
+            criar_metricas_avancadas(df_resultados)
+            
+            if mostrar_detalhes:
+                exibir_relatorio_padding(relatorio_padding)
+            
+            # Gráficos
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(criar_grafico_sentimentos(df_resultados), use_container_width=True)
+            with col2:
+                st.plotly_chart(criar_grafico_confianca(df_resultados), use_container_width=True)
+            
+            # Análise temporal (se houver timestamp)
+            if 'timestamp' in df_resultados.columns:
+                # Sem alterar df_resultados: ele é a análise guardada, compartilhada entre sessões
+                horas = pd.to_datetime(df_resultados['timestamp']).dt.hour.rename('hora')
                 
-                # Análise temporal (se houver timestamp)
-                if 'timestamp' in df_resultados.columns:
-                    df_resultados['timestamp'] = pd.to_datetime(df_resultados['timestamp'])
-                    df_resultados['hora'] = df_resultados['timestamp'].dt.hour
-                    
+                with METRICAS.medir("graficos"):
                     fig = px.line(
-                        df_resultados.groupby('hora')['sentimento'].value_counts().unstack(fill_value=0),
+                        df_resultados.groupby(horas)['sentimento'].value_counts().unstack(fill_value=0),
                         title='Tendência de Sentimentos por Hora'
                     )
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                # Wordclouds
-                st.subheader("☁️ Análise de Palavras")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    textos_positivos = df_resultados[df_resultados['sentimento'] == 'positivo']['texto_processado'].tolist()
-                    if textos_positivos:
-                        fig = criar_wordcloud(textos_positivos, "Palavras Positivas")
-                        if fig:
-                            st.pyplot(fig)
-                
-                with col2:
-                    textos_negativos = df_resultados[df_resultados['sentimento'] == 'negativo']['texto_processado'].tolist()
-                    if textos_negativos:
-                        fig = criar_wordcloud(textos_negativos, "Palavras Negativas")
-                        if fig:
-                            st.pyplot(fig)
-                
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Wordclouds
+            indice_termos = carregar_indice_termos(
+                f"dashboard:{chave_dashboard}:{threshold}" if analise_guardada is not None
+                else f"job:{analise['job_id']}:{threshold}"
+            )
+            exibir_termos(indice_termos.atualizar(df_resultados), "☁️ Análise de Palavras")
+            
+            # Por produto/pesquisa: só com a análise completa, alinhada às linhas do arquivo
+            if analise_guardada is not None:
+                df_origem = df_exemplo[df_exemplo['Comentario'].notna()]
+                indice_produtos = carregar_indice_produtos(f"dashboard:{chave_dashboard}:{threshold}")
+                exibir_produtos(indice_produtos.atualizar(df_origem, df_resultados), df_resultados, df_origem)
+            
     except Exception as e:
         st.error(f"Erro ao carregar dados de exemplo: {e}")
 
 elif modo_analise == "Comparação":
+    import plotly.express as px
+
     st.header("🔄 Comparação de Textos")
     
     col1, col2 = st.columns(2)
@@ -525,8 +958,10 @@ elif modo_analise == "Comparação":
     if st.button("🔄 Comparar Sentimentos", type="primary"):
         if texto1.strip() and texto2.strip():
             with st.spinner("Comparando sentimentos..."):
-                resultado1 = modelo.processar_texto(texto1)
-                resultado2 = modelo.processar_texto(texto2)
+                resultado1 = modelo.processar_texto(texto1, indice_stopwords, cache_predicoes, threshold,
+                                                    **opcoes_individuais)
+                resultado2 = modelo.processar_texto(texto2, indice_stopwords, cache_predicoes, threshold,
+                                                    **opcoes_individuais)
                 
                 # Comparação
                 col1, col2 = st.columns(2)
@@ -549,59 +984,111 @@ elif modo_analise == "Comparação":
                     {'Texto': 'Texto 2', 'Sentimento': resultado2['sentimento'], 'Confiança': resultado2['probabilidade']}
                 ])
                 
-                fig = px.bar(
-                    df_comparacao, 
-                    x='Texto', 
-                    y='Confiança', 
-                    color='Sentimento',
-                    title='Comparação de Confiança'
-                )
+                with METRICAS.medir("graficos"):
+                    fig = px.bar(
+                        df_comparacao, 
+                        x='Texto', 
+                        y='Confiança', 
+                        color='Sentimento',
+                        title='Comparação de Confiança'
+                    )
                 st.plotly_chart(fig, use_container_width=True)
 
 elif modo_analise == "Tendências":
+    import plotly.express as px
+    from sentimento.graficos import CORES_SENTIMENTO
+
     st.header("📈 Análise de Tendências")
     
     st.info("🔍 Esta funcionalidade permite analisar tendências temporais nos sentimentos.")
     
-    # Simulação de dados temporais
-    if st.button("📊 Gerar Análise de Tendências", type="primary"):
-        # Simular dados temporais
-        dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
-        np.random.seed(42)
-        
-        # Simular sentimentos com tendência
-        sentimentos = []
-        for i in range(len(dates)):
-            if i < len(dates) // 2:
-                # Primeira metade: mais positivos
-                sentimento = np.random.choice(['positivo', 'negativo', 'incerto'], p=[0.6, 0.3, 0.1])
-            else:
-                # Segunda metade: mais negativos
-                sentimento = np.random.choice(['positivo', 'negativo', 'incerto'], p=[0.3, 0.6, 0.1])
-            sentimentos.append(sentimento)
+    # Agregados por período (sentimento.tendencias): as consultas não percorrem os textos
+    fonte = st.radio("Fonte dos Dados", ["Análises realizadas", "Demonstração (sintética)"], horizontal=True)
+    if fonte == "Análises realizadas":
+        armazem = armazem_tendencias
+    else:
+        linhas_demo = st.select_slider("Textos sintéticos", [100_000, 1_000_000, 5_000_000], 1_000_000)
+        armazem = carregar_tendencias_demo(linhas_demo)
+    
+    if armazem.registros == 0:
+        st.warning("⚠️ Nenhuma análise registrada ainda. Analise textos nos outros modos "
+                   "ou use os dados de demonstração.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            granularidade = st.selectbox("📅 Período", list(NOMES_GRANULARIDADES),
+                                         format_func=NOMES_GRANULARIDADES.get)
+        with col2:
+            dias_janela = st.number_input("📏 Janela Móvel (dias)", 1, 365, 7)
+        st.caption(f"{armazem.registros:,} textos registrados. As datas são as da análise (quando cada "
+                   "texto foi pontuado), não as dos comentários; reanalisar o mesmo arquivo não conta "
+                   "os textos de novo.")
         
-        df_tendencias = pd.DataFrame({
-            'data': dates,
-            'sentimento': sentimentos,
-            'probabilidade': np.random.uniform(0.5, 0.95, len(dates))
-        })
+        serie = armazem.serie(granularidade)
+        janela = armazem.janela_movel(dias_janela)
         
         # Gráfico de tendências
-        fig = px.line(
-            df_tendencias.groupby(['data', 'sentimento']).size().reset_index(name='count'),
-            x='data',
-            y='count',
-            color='sentimento',
-            title='Tendência de Sentimentos ao Longo do Tempo'
-        )
+        with METRICAS.medir("graficos"):
+            fig = px.line(
+                serie[list(CATEGORIAS)],
+                labels={'index': 'data', 'value': 'textos', 'variable': 'sentimento'},
+                color_discrete_map=CORES_SENTIMENTO,
+                title='Tendência de Sentimentos ao Longo do Tempo'
+            )
+            fig_janela = px.line(
+                janela[[f"pct_{s}" for s in CATEGORIAS]].rename(columns=lambda c: c[4:]),
+                labels={'index': 'data', 'value': 'participação', 'variable': 'sentimento'},
+                color_discrete_map=CORES_SENTIMENTO,
+                title=f'Participação de Cada Sentimento (janela móvel de {dias_janela} dias)'
+            )
+            fig_janela.update_yaxes(tickformat='.0%')
         st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_janela, use_container_width=True)
         
-        # Estatísticas mensais
-        df_tendencias['mes'] = df_tendencias['data'].dt.month
-        stats_mensais = df_tendencias.groupby(['mes', 'sentimento']).size().unstack(fill_value=0)
-        
-        st.subheader("📊 Estatísticas Mensais")
-        st.dataframe(stats_mensais)
+        # Comparação com o período anterior
+        st.subheader("📊 Comparação com o Período Anterior")
+        comparacao = armazem.comparar_periodos(granularidade).tail(12)
+        st.dataframe(
+            comparacao.style.format(
+                {coluna: "{:+.1%}" for coluna in comparacao.columns if coluna.startswith(("variacao", "delta"))}
+                | {coluna: "{:.1%}" for coluna in comparacao.columns if coluna.startswith(("pct", "confianca"))}
+                | {"total": "{:,.0f}"},
+                na_rep="—"
+            ),
+            use_container_width=True
+        )
+
+# Estatísticas do cache (preenchidas ao final, já com as análises desta execução)
+with info_cache.container():
+    estatisticas_cache = cache_predicoes.estatisticas()
+    st.write("**Cache de Predições:**")
+    st.write(f"- Acertos (memória): {estatisticas_cache['acertos_memoria']}")
+    st.write(f"- Acertos (disco): {estatisticas_cache['acertos_disco']}")
+    st.write(f"- Faltas: {estatisticas_cache['faltas']}")
+    st.write(f"- Taxa de acerto: {estatisticas_cache['taxa_acerto']:.1%}")
+    st.write(f"- Itens em memória: {estatisticas_cache['itens_memoria']}")
+    if microbatcher is not None:
+        estatisticas_microlote = microbatcher.estatisticas()
+        st.write("**Micro-lotes:**")
+        st.write(f"- Lotes inferidos: {estatisticas_microlote['lotes']}")
+        st.write(f"- Textos por lote (média): {estatisticas_microlote['media_por_lote']:.1f}")
+
+# Latência por etapa (preenchida ao final, já com as etapas desta execução)
+with info_desempenho.container():
+    resumo_desempenho = METRICAS.resumo()
+    if not medir_desempenho and not resumo_desempenho:
+        st.caption("Ative \"Medir Desempenho\" nas configurações avançadas.")
+    elif not resumo_desempenho:
+        st.caption("Nenhuma etapa medida ainda.")
+    else:
+        st.dataframe(
+            pd.DataFrame(resumo_desempenho).T[["chamadas", "media_ms", "p50_ms", "p95_ms", "p99_ms"]].round(2),
+            use_container_width=True
+        )
+        st.download_button("📥 JSON", METRICAS.como_json(), "desempenho.json", "application/json")
+        st.download_button("📥 Prometheus", METRICAS.como_prometheus(), "desempenho.prom", "text/plain")
+        if st.button("🗑️ Zerar Medições"):
+            METRICAS.limpar()
 
 # Footer
 st.markdown("---")
@@ -621,4 +1108,9 @@ with col3:
     st.markdown("- NLP")
     st.markdown("- IA Generativa")
 
-st.markdown("*Análise de Sentimento Avançada - Modelo Completo*")
\ No newline at end of file
+st.markdown("*Análise de Sentimento Avançada - Modelo Completo*")
+
+# Acompanhar jobs em andamento: a página se atualiza até eles terminarem
+if aguardando_jobs:
+    time.sleep(INTERVALO_ATUALIZACAO_JOBS)
+    st.rerun()
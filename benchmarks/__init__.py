@@ -0,0 +1,4 @@
+"""
+Benchmarks do pipeline de sentimento. Cada módulo roda com
+`python -m benchmarks.<modulo>` a partir da raiz do projeto.
+"""
@@ -0,0 +1,99 @@
+"""
+Paridade e latência dos backends de inferência (sentimento.backends)
+contra o fp32, sobre os comentários de comments_amazon.csv já limpos.
+
+    python -m benchmarks.backends --backends fp32 int8 onnx
+
+Para cada backend: concordância do sentimento final (com --threshold) e da
+classe de maior probabilidade com o fp32, maior diferença absoluta de
+probabilidade, latência de um texto por chamada (p50/p95) e vazão em lotes
+de --batch-size. O tempo de preparo (quantizar/exportar/carregar) é
+reportado à parte. Código de saída 1 se algum backend concordar com o fp32
+em menos de --min-concordancia dos textos.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from sentimento.backends import BACKENDS, BackendIndisponivel
+from sentimento.classificacao import CLASSES, decidir_sentimento
+from sentimento.modelo import obter_analyzer
+from sentimento.pipeline import preprocessar_textos
+
+
+def medir_backend(analyzer, textos, batch_size, n_individual):
+    from sentimento.inferencia import prever_probas_lote
+
+    # Primeira passagem fora das medições
+    prever_probas_lote(analyzer, textos[:batch_size], batch_size)
+
+    latencias = []
+    for texto in textos[:n_individual]:
+        inicio = time.perf_counter()
+        prever_probas_lote(analyzer, [texto], 1)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    probas = prever_probas_lote(analyzer, textos, batch_size)
+    segundos = time.perf_counter() - inicio
+    return probas, latencias, len(textos) / segundos
+
+
+def comparar_probas(base, probas, threshold):
+    """(concordância do sentimento, concordância da classe, maior |Δprob|) contra `base`."""
+    sentimentos = sum(
+        decidir_sentimento(b, threshold)[0] == decidir_sentimento(p, threshold)[0] for b, p in zip(base, probas)
+    )
+    classes = sum(max(CLASSES, key=b.get) == max(CLASSES, key=p.get) for b, p in zip(base, probas))
+    delta = max(abs(b[c] - p[c]) for b, p in zip(base, probas) for c in CLASSES)
+    return sentimentos / len(base), classes / len(base), delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="comments_amazon.csv")
+    parser.add_argument("--modelo", help="artefato ou modelo (padrão: o mesmo do app)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--individual", type=int, default=200, help="textos da medição de latência individual")
+    parser.add_argument("--threshold", type=float, default=0.55)
+    parser.add_argument("--min-concordancia", type=float, default=0.97)
+    args = parser.parse_args()
+
+    comentarios = pd.read_csv(args.csv)["Comentario"].dropna().astype(str).tolist()
+    textos = preprocessar_textos(comentarios)
+    print(f"{len(textos)} textos, {os.cpu_count()} núcleos\n")
+    print(f"{'backend':>8} {'preparo (s)':>11} {'p50 ms':>8} {'p95 ms':>8} {'textos/s':>10} {'speedup':>8} "
+          f"{'sentimento':>10} {'classe':>8} {'máx |Δp|':>9}")
+
+    base = None
+    abaixo = []
+    for backend in ["fp32"] + [b for b in args.backends if b != "fp32"]:
+        inicio = time.perf_counter()
+        try:
+            analyzer = obter_analyzer(args.modelo, backend)
+        except BackendIndisponivel as e:
+            print(f"{backend:>8} indisponível: {e}")
+            continue
+        preparo = time.perf_counter() - inicio
+        probas, latencias, vazao = medir_backend(analyzer, textos, args.batch_size, args.individual)
+        p50, p95 = np.percentile(latencias, [50, 95])
+        if base is None:
+            base, vazao_base = probas, vazao
+        sentimentos, classes, delta = comparar_probas(base, probas, args.threshold)
+        if sentimentos < args.min_concordancia:
+            abaixo.append(backend)
+        print(f"{backend:>8} {preparo:>11.2f} {p50:>8.2f} {p95:>8.2f} {vazao:>10.1f} {vazao / vazao_base:>8.2f} "
+              f"{sentimentos:>10.2%} {classes:>8.2%} {delta:>9.4f}")
+
+    if abaixo:
+        print(f"\nConcordância abaixo de {args.min_concordancia:.0%}: {', '.join(abaixo)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Vazão (textos/s) da inferência em função do número de processos do
+PoolInferencia, sobre os comentários de comments_amazon.csv já limpos.
+
+    python -m benchmarks.bench_paralelo --processos 1 2 4 8 16 --threads 1
+
+O tempo de criação do pool (carregar o modelo em cada processo) é
+reportado à parte e não entra na vazão. A linha "em processo" é a
+inferência sem pool, com todas as threads do torch no processo atual.
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+import torch
+
+from sentimento.inferencia import criar_analyzer, prever_probas_lote
+from sentimento.paralelo import PoolInferencia
+from sentimento.texto import NORMALIZADOR, obter_stopwords
+
+
+def carregar_textos(caminho, repeticoes=1):
+    comentarios = pd.read_csv(caminho)["Comentario"]
+    textos = obter_stopwords().remover_serie(NORMALIZADOR.normalizar_serie(comentarios)).tolist()
+    return textos * repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="comments_amazon.csv")
+    parser.add_argument("--repeticoes", type=int, default=1, help="repete o dataset N vezes")
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads", type=int, default=1, help="threads do torch por processo")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    textos = carregar_textos(args.csv, args.repeticoes)
+    print(f"{len(textos)} textos, {os.cpu_count()} núcleos, {args.threads} thread(s) por processo\n")
+    print(f"{'processos':>12} {'criação (s)':>12} {'inferência (s)':>15} {'textos/s':>10} {'speedup':>8}")
+
+    analyzer = criar_analyzer()
+    inicio = time.perf_counter()
+    prever_probas_lote(analyzer, textos, args.batch_size)
+    base = time.perf_counter() - inicio
+    print(f"{'em processo':>12} {'-':>12} {base:>15.2f} {len(textos) / base:>10.1f} {1.0:>8.2f}")
+
+    for n in args.processos:
+        inicio = time.perf_counter()
+        with PoolInferencia(n, args.threads) as pool:
+            criacao = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            pool.prever_probas(textos, args.batch_size)
+            segundos = time.perf_counter() - inicio
+        print(f"{n:>12} {criacao:>12.2f} {segundos:>15.2f} {len(textos) / segundos:>10.1f} {base / segundos:>8.2f}")
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(os.cpu_count() or 1)
+    main()
@@ -0,0 +1,78 @@
+"""
+Compara o acúmulo de resultados antigo (pd.Series por classificação, dict
+com datetime.now() por texto, lista de dicts -> pd.DataFrame) com o
+BufferResultados colunar, em tempo e memória.
+
+As probabilidades são sintéticas: o objetivo é medir só o custo de montar
+os resultados, sem o modelo.
+
+    python -m benchmarks.bench_resultados [linhas ...]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from sentimento.classificacao import decidir_sentimento
+from sentimento.resultados import BufferResultados
+
+TAMANHO_LOTE = 32
+
+
+def dados_sinteticos(linhas, semente=42):
+    rng = np.random.default_rng(semente)
+    textos = [f"comentario numero {i}" for i in range(linhas)]
+    probas = rng.dirichlet([1.0, 1.0, 1.0], size=linhas).astype(np.float32)
+    return textos, probas
+
+
+def abordagem_antiga(textos, probas, threshold=0.55):
+    resultados = []
+    for texto, (pos, neg, neu) in zip(textos, probas.tolist()):
+        sentimento, prob = pd.Series(decidir_sentimento({"POS": pos, "NEG": neg, "NEU": neu}, threshold))
+        resultados.append({
+            "texto_original": texto,
+            "texto_processado": texto,
+            "sentimento": sentimento,
+            "probabilidade": prob,
+            "timestamp": datetime.now()
+        })
+    return pd.DataFrame(resultados)
+
+
+def abordagem_colunar(textos, probas, threshold=0.55):
+    buffer = BufferResultados(len(textos))
+    for inicio in range(0, len(textos), TAMANHO_LOTE):
+        fim = inicio + TAMANHO_LOTE
+        buffer.adicionar(textos[inicio:fim], textos[inicio:fim], probas[inicio:fim], threshold)
+    return buffer.para_dataframe()
+
+
+def medir(funcao, textos, probas):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    df = funcao(textos, probas)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "segundos": segundos,
+        "pico_mb": pico / 2**20,
+        "df_mb": df.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def main(linhas=(10_000, 100_000)):
+    print(f"{'linhas':>8} {'abordagem':>10} {'tempo (s)':>10} {'pico (MB)':>10} {'DataFrame (MB)':>15}")
+    for n in linhas:
+        textos, probas = dados_sinteticos(n)
+        for nome, funcao in (("antiga", abordagem_antiga), ("colunar", abordagem_colunar)):
+            r = medir(funcao, textos, probas)
+            print(f"{n:>8} {nome:>10} {r['segundos']:>10.3f} {r['pico_mb']:>10.1f} {r['df_mb']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or (10_000, 100_000))
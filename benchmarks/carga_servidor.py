@@ -0,0 +1,127 @@
+"""
+Teste de carga do servidor HTTP (sentimento.servidor) na mesma máquina.
+
+    python -m sentimento.servidor --porta 8000 &
+    python -m benchmarks.carga_servidor --clientes 1 8 32 --requisicoes 200
+
+Cada cliente é uma thread com uma conexão keep-alive própria, enviando
+comentários de comments_amazon.csv para /analisar (ou lotes para
+/analisar/lote com --lote N). Reporta vazão e latências p50/p95/p99
+medidas no cliente e o tempo médio de inferência informado pelo servidor.
+Antes das rodadas, espera GET /pronto e mede a latência da primeira
+requisição, que com o modelo aquecido deve ficar na faixa do p50.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def cliente(host, porta, caminho, corpos, latencias, inferencias, erros):
+    conexao = http.client.HTTPConnection(host, porta)
+    try:
+        for corpo in corpos:
+            inicio = time.perf_counter()
+            conexao.request("POST", caminho, corpo, {"Content-Type": "application/json"})
+            resposta = conexao.getresponse()
+            dados = resposta.read()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if resposta.status != 200:
+                erros.append(resposta.status)
+                continue
+            inferencias.append(json.loads(dados)["tempo_ms"]["inferencia"])
+    finally:
+        conexao.close()
+
+
+def aguardar_pronto(host, porta, timeout):
+    limite = time.monotonic() + timeout
+    while True:
+        conexao = http.client.HTTPConnection(host, porta, timeout=5)
+        try:
+            conexao.request("GET", "/pronto")
+            resposta = conexao.getresponse()
+            dados = json.loads(resposta.read())
+            if resposta.status == 200:
+                return dados["modelo"]
+        except (ConnectionError, OSError):
+            dados = None
+        finally:
+            conexao.close()
+        if time.monotonic() > limite:
+            raise SystemExit(f"servidor não ficou pronto em {timeout:.0f}s: {dados}")
+        time.sleep(0.5)
+
+
+def primeira_requisicao(host, porta, texto):
+    conexao = http.client.HTTPConnection(host, porta)
+    try:
+        inicio = time.perf_counter()
+        conexao.request("POST", "/analisar", json.dumps({"texto": texto}).encode("utf-8"),
+                        {"Content-Type": "application/json"})
+        conexao.getresponse().read()
+        return (time.perf_counter() - inicio) * 1000
+    finally:
+        conexao.close()
+
+
+def rodada(host, porta, textos, clientes, requisicoes, lote):
+    caminho = "/analisar/lote" if lote else "/analisar"
+    latencias, inferencias, erros = [], [], []
+    threads = []
+    for c in range(clientes):
+        corpos = []
+        for r in range(requisicoes):
+            inicio = (c * requisicoes + r) * max(lote, 1)
+            if lote:
+                selecao = [textos[(inicio + i) % len(textos)] for i in range(lote)]
+                corpos.append(json.dumps({"textos": selecao}).encode("utf-8"))
+            else:
+                corpos.append(json.dumps({"texto": textos[inicio % len(textos)]}).encode("utf-8"))
+        threads.append(threading.Thread(
+            target=cliente, args=(host, porta, caminho, corpos, latencias, inferencias, erros)
+        ))
+
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    segundos = time.perf_counter() - inicio
+
+    textos_enviados = len(latencias) * max(lote, 1)
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+    print(f"{clientes:>8} {len(latencias) / segundos:>10.1f} {textos_enviados / segundos:>10.1f} "
+          f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {np.mean(inferencias) if inferencias else 0:>12.1f} {len(erros):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--csv", default="comments_amazon.csv")
+    parser.add_argument("--clientes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requisicoes", type=int, default=100, help="requisições por cliente")
+    parser.add_argument("--lote", type=int, default=0, help="textos por requisição em /analisar/lote (0 = /analisar)")
+    parser.add_argument("--espera", type=float, default=300, help="segundos esperando o modelo ficar pronto")
+    args = parser.parse_args()
+
+    textos = pd.read_csv(args.csv)["Comentario"].dropna().astype(str).tolist()
+    modelo = aguardar_pronto(args.host, args.porta, args.espera)
+    if modelo:
+        print(f"Modelo carregado em {modelo['carregamento_s']:.2f}s; aquecimento (ms por lote):")
+        for tamanho, tempos in modelo["aquecimento_ms"].items():
+            print(f"  lote {tamanho:>3}: " + " → ".join(f"{t:.1f}" for t in tempos))
+    print(f"Primeira requisição: {primeira_requisicao(args.host, args.porta, textos[0]):.1f} ms\n")
+    print(f"{'clientes':>8} {'req/s':>10} {'textos/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'inferência ms':>12} {'erros':>6}")
+    for clientes in args.clientes:
+        rodada(args.host, args.porta, textos, clientes, args.requisicoes, args.lote)
+
+
+if __name__ == "__main__":
+    main()
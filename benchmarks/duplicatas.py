@@ -0,0 +1,74 @@
+"""
+Inferência economizada pela detecção de quase-duplicatas
+(sentimento.duplicatas) sobre os comentários de comments_amazon.csv.
+
+    python -m benchmarks.duplicatas --limiares 0.95 0.9 0.8 0.7
+    python -m benchmarks.duplicatas --concordancia    # compara com o modelo
+
+Para cada limiar: quantos textos passariam pelo modelo só com a
+deduplicação exata (prever_com_cache) e com os grupos de quase-duplicatas,
+a inferência economizada e o tempo para agrupar. Com --concordancia, cada
+texto também é pontuado individualmente e o sentimento reaproveitado do
+representante é comparado com o próprio.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from sentimento.classificacao import decidir_sentimento
+from sentimento.duplicatas import IndiceDuplicatas
+from sentimento.pipeline import preprocessar_textos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="comments_amazon.csv")
+    parser.add_argument("--limiares", nargs="+", type=float, default=[0.95, 0.9, 0.8, 0.7])
+    parser.add_argument("--concordancia", action="store_true", help="pontua todos os textos com o modelo")
+    parser.add_argument("--threshold", type=float, default=0.55)
+    parser.add_argument("--exemplos", type=int, default=5, help="grupos com variações mostrados por limiar")
+    args = parser.parse_args()
+
+    comentarios = pd.read_csv(args.csv)["Comentario"].dropna().astype(str).tolist()
+    textos = preprocessar_textos(comentarios)
+    distintos = list(dict.fromkeys(textos))
+    print(f"{len(textos)} textos, {len(distintos)} distintos "
+          f"(dedup. exata economiza {1 - len(distintos) / len(textos):.1%})\n")
+
+    sentimentos = None
+    if args.concordancia:
+        from sentimento.inferencia import prever_probas_lote
+        from sentimento.modelo import obter_analyzer
+
+        probas = prever_probas_lote(obter_analyzer(), distintos)
+        sentimentos = {t: decidir_sentimento(p, args.threshold)[0] for t, p in zip(distintos, probas)}
+
+    print(f"{'limiar':>6} {'grupos':>7} {'vs. total':>9} {'vs. exata':>9} {'agrupar ms':>10}"
+          + (f" {'concordância':>12}" if sentimentos else ""))
+    exemplos = {}
+    for limiar in args.limiares:
+        indice = IndiceDuplicatas(limiar)
+        inicio = time.perf_counter()
+        grupos = indice.agrupar(textos)
+        milissegundos = (time.perf_counter() - inicio) * 1000
+        n_grupos = len(indice.representantes)
+        linha = (f"{limiar:>6.2f} {n_grupos:>7} {1 - n_grupos / len(textos):>9.1%} "
+                 f"{1 - n_grupos / len(distintos):>9.1%} {milissegundos:>10.1f}")
+        if sentimentos:
+            iguais = sum(sentimentos[t] == sentimentos[indice.representantes[g]] for t, g in zip(textos, grupos))
+            linha += f" {iguais / len(textos):>12.2%}"
+        print(linha)
+
+        variacoes = pd.Series(textos).groupby(grupos).unique()
+        exemplos[limiar] = [list(v) for v in variacoes if len(v) > 1][:args.exemplos]
+
+    for limiar, grupos in exemplos.items():
+        if grupos:
+            print(f"\nLimiar {limiar:.2f}, exemplos de grupos:")
+            for grupo in grupos:
+                print("  " + " | ".join(grupo))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Relatório de tempo de inicialização do app (estilo `python -X importtime`).
+
+    python -m benchmarks.inicializacao
+    python -m benchmarks.inicializacao --revisao HEAD~1   # antes × depois
+
+Tudo o que app.py importa no nível do módulo é pago a cada início a frio
+antes de a página ser pintada. O relatório executa esses imports num
+processo novo com -X importtime e mostra o total e os módulos mais caros.
+Em seguida mede, também em processos novos, o custo incremental de cada
+grupo de dependências pesadas que os modos importam sob demanda.
+Com --revisao, o mesmo é feito com o app.py daquela revisão do git.
+"""
+import argparse
+import ast
+import subprocess
+import sys
+
+# Grupos importados sob demanda e os modos que os usam
+GRUPOS = {
+    "modelo (torch + pysentimiento)": ("import sentimento.inferencia", "todos, exceto Tendências"),
+    "gráficos (plotly.express)": ("import plotly.express", "Lote, Dashboard, Comparação, Tendências"),
+    "nuvem de palavras (wordcloud)": ("import wordcloud", "Lote, Dashboard"),
+}
+
+
+def imports_de_modulo(codigo):
+    """Instruções de import no nível do módulo, como texto."""
+    arvore = ast.parse(codigo)
+    return [ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))]
+
+
+def _codigo_protegido(imports):
+    # Um módulo ausente não interrompe a medição dos demais
+    linhas = ["import sys"]
+    for instrucao in imports:
+        linhas += ["try:", f"    {instrucao}", "except ImportError as e:",
+                   f"    print('AUSENTE', {instrucao!r}, e, file=sys.stderr)"]
+    return "\n".join(linhas)
+
+
+def medir_imports(imports):
+    """Retorna (total_s, [(cumulativo_s, módulo)] de primeiro nível, ausentes)."""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _codigo_protegido(imports)],
+        capture_output=True, text=True
+    )
+    total = 0
+    modulos = []
+    ausentes = []
+    for linha in processo.stderr.splitlines():
+        if linha.startswith("AUSENTE"):
+            ausentes.append(linha[len("AUSENTE "):])
+            continue
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, cumulativo, nome = linha[len("import time:"):].split("|")
+        total += int(proprio)
+        # Nível de aninhamento = espaços antes do nome (2 por nível)
+        if len(nome) - len(nome.lstrip()) <= 1:
+            modulos.append((int(cumulativo) / 1e6, nome.strip()))
+    return total / 1e6, sorted(modulos, reverse=True), ausentes
+
+
+def medir_grupo(imports_base, grupo):
+    """Tempo (s) de `grupo` importado depois dos imports de módulo."""
+    codigo = "\n".join([
+        _codigo_protegido(imports_base),
+        "import time",
+        "inicio = time.perf_counter()",
+        "try:",
+        f"    {grupo}",
+        "except ImportError as e:",
+        "    print('AUSENTE', e)",
+        "else:",
+        "    print(time.perf_counter() - inicio)",
+    ])
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True).stdout.strip()
+    return saida.splitlines()[-1] if saida else "erro"
+
+
+def relatorio(titulo, codigo, top):
+    imports = imports_de_modulo(codigo)
+    total, modulos, ausentes = medir_imports(imports)
+    print(f"== {titulo} ==")
+    print(f"imports no nível do módulo (antes da primeira pintura): {total:.3f}s")
+    for cumulativo, nome in modulos[:top]:
+        print(f"  {cumulativo:>8.3f}s  {nome}")
+    for ausente in ausentes:
+        print(f"  ausente: {ausente}")
+    print("sob demanda (incremental, por grupo):")
+    for nome, (grupo, modos) in GRUPOS.items():
+        resultado = medir_grupo(imports, grupo)
+        try:
+            resultado = f"{float(resultado):.3f}s"
+        except ValueError:
+            pass
+        print(f"  {nome:<45} {resultado:>10}  [{modos}]")
+    print()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="app.py")
+    parser.add_argument("--revisao", help="revisão do git para comparar (ex.: HEAD~1)")
+    parser.add_argument("--top", type=int, default=15, help="módulos mais caros exibidos")
+    args = parser.parse_args()
+
+    with open(args.script, encoding="utf-8") as f:
+        atual = relatorio(f"{args.script} (árvore atual)", f.read(), args.top)
+    if args.revisao:
+        codigo = subprocess.run(["git", "show", f"{args.revisao}:{args.script}"],
+                                capture_output=True, text=True, check=True).stdout
+        anterior = relatorio(f"{args.script} em {args.revisao}", codigo, args.top)
+        print(f"imports antes da primeira pintura: {anterior:.3f}s -> {atual:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Suíte de benchmarks do pipeline e da renderização, com resultado em JSON
+e comparação contra uma linha de base.
+
+    python -m benchmarks.suite --saida bench.json
+    python -m benchmarks.suite --saida novo.json --comparar bench.json
+    python -m benchmarks.suite --resultado novo.json --comparar bench.json
+
+Conjuntos: os comentários de comments_amazon.csv e versões sintéticas de
+10k/100k linhas (palavras do próprio CSV, com a distribuição de tamanhos
+dos comentários reais; semente fixa). Etapas medidas, cada uma
+separadamente:
+
+    limpeza              limpar_texto_completo texto a texto
+    limpeza_serie        NORMALIZADOR.normalizar_serie (usada em lote)
+    stopwords            remover_serie
+    inferencia_individual  uma chamada ao modelo por texto
+    inferencia_lote        prever em lotes de --batch-size
+    processar_dataframe  pipeline completo até o DataFrame de resultados
+    graficos             pizza + histograma do Plotly
+    wordcloud            índice de termos + PNG da nuvem de cada sentimento
+
+O modelo pode ser um stub determinístico (padrão; sem torch nem rede),
+o modelo do pysentimiento (--modelo pysentimiento) ou um diretório local
+com os pesos (--modelo caminho/do/modelo). As etapas de inferência usam
+no máximo --max-inferencia textos de cada conjunto. Etapas cujas
+dependências não estão instaladas são marcadas como indisponíveis.
+
+Na comparação, uma etapa regrediu quando a mediana atual passa da linha de
+base por mais de --tolerancia (fração); o código de saída é 1 nesse caso.
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from sentimento.classificacao import CATEGORIAS
+from sentimento.pipeline import pontuar_textos
+from sentimento.termos import IndiceTermos
+from sentimento.texto import NORMALIZADOR, limpar_texto_completo, obter_stopwords
+
+PACOTES = ("numpy", "pandas", "nltk", "torch", "transformers", "pysentimiento", "plotly",
+           "matplotlib", "wordcloud", "streamlit")
+
+
+class PrevisorStub:
+    """
+    Substitui o modelo: probabilidades derivadas do hash do texto, com custo
+    simulado fixo por chamada e por texto (em ms), como o overhead e o
+    custo marginal de um forward.
+    """
+
+    def __init__(self, custo_chamada_ms=1.0, custo_texto_ms=0.05):
+        self.custo_chamada = custo_chamada_ms / 1000
+        self.custo_texto = custo_texto_ms / 1000
+        self.identificador = f"stub|{custo_chamada_ms}|{custo_texto_ms}"
+
+    def __call__(self, textos):
+        time.sleep(self.custo_chamada + self.custo_texto * len(textos))
+        probas = []
+        for texto in textos:
+            a, b, c = hashlib.blake2b(texto.encode("utf-8"), digest_size=3).digest()
+            total = a + b + c + 3
+            probas.append({"POS": (a + 1) / total, "NEG": (b + 1) / total, "NEU": (c + 1) / total})
+        return probas
+
+
+def criar_previsor(modelo, batch_size):
+    """Retorna (prever(textos), descrição do modelo)."""
+    if modelo == "stub":
+        stub = PrevisorStub()
+        return stub, stub.identificador
+    from sentimento.inferencia import criar_analyzer, prever_probas_lote
+
+    analyzer = criar_analyzer(None if modelo == "pysentimiento" else modelo)
+    return (lambda textos: prever_probas_lote(analyzer, textos, batch_size),
+            analyzer.model.config._name_or_path)
+
+
+def gerar_textos_sinteticos(textos_base, quantidade, semente=42):
+    """Textos com palavras do corpus e tamanhos amostrados dos comentários reais."""
+    rng = np.random.default_rng(semente)
+    palavras_por_texto = [t.split() for t in textos_base]
+    vocabulario = np.array([p for palavras in palavras_por_texto for p in palavras], dtype=object)
+    tamanhos = rng.choice([max(len(p), 1) for p in palavras_por_texto], size=quantidade)
+    indices = rng.integers(0, len(vocabulario), size=int(tamanhos.sum()))
+    limites = np.cumsum(tamanhos)[:-1]
+    return [" ".join(palavras) for palavras in np.split(vocabulario[indices], limites)]
+
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def medir_conjunto(textos, prever, args):
+    """Mede todas as etapas sobre `textos`; retorna {etapa: medição}."""
+    n_inferencia = min(len(textos), args.max_inferencia)
+    n_individual = min(len(textos), args.max_individual)
+    textos_inferencia = textos[:n_inferencia]
+    serie = pd.Series(textos, dtype=object)
+    limpos = NORMALIZADOR.normalizar_serie(serie)
+    stopwords = obter_stopwords()
+    processados = stopwords.remover_serie(limpos).tolist()
+
+    def lote():
+        for inicio in range(0, n_inferencia, args.batch_size):
+            prever(processados[inicio:inicio + args.batch_size])
+
+    etapas = {
+        "limpeza": (lambda: [limpar_texto_completo(t) for t in textos], len(textos)),
+        "limpeza_serie": (lambda: NORMALIZADOR.normalizar_serie(serie), len(textos)),
+        "stopwords": (lambda: stopwords.remover_serie(limpos), len(textos)),
+        "inferencia_individual": (lambda: [prever([t]) for t in processados[:n_individual]], n_individual),
+        "inferencia_lote": (lote, n_inferencia),
+        "processar_dataframe": (
+            lambda: pontuar_textos(textos_inferencia, prever, args.threshold).para_dataframe(),
+            n_inferencia,
+        ),
+    }
+
+    df_resultados = pontuar_textos(textos_inferencia, prever, args.threshold).para_dataframe()
+    from sentimento import graficos
+
+    # Cada etapa de renderização depende só da sua biblioteca
+    resultados_render = {}
+    for etapa, modulo in (("graficos", "plotly.express"), ("wordcloud", "wordcloud")):
+        try:
+            importlib.import_module(modulo)
+        except ImportError as e:
+            resultados_render[etapa] = {"indisponivel": str(e)}
+
+    # Índice de termos + renderização de cada nuvem, sem o cache de PNGs
+    def nuvens():
+        indice = IndiceTermos().atualizar(df_resultados)
+        for sentimento in CATEGORIAS:
+            frequencias = indice.frequencias(sentimento)
+            if frequencias:
+                graficos.renderizar_wordcloud(frequencias)
+
+    if "graficos" not in resultados_render:
+        etapas["graficos"] = (
+            lambda: (graficos.criar_grafico_sentimentos(df_resultados),
+                     graficos.criar_grafico_confianca(df_resultados)),
+            len(df_resultados),
+        )
+    if "wordcloud" not in resultados_render:
+        etapas["wordcloud"] = (nuvens, len(df_resultados))
+
+    resultados = {}
+    for nome, (funcao, itens) in etapas.items():
+        if args.etapas and nome not in args.etapas:
+            continue
+        tempos = cronometrar(funcao, args.repeticoes)
+        mediana = statistics.median(tempos)
+        resultados[nome] = {
+            "itens": itens,
+            "mediana_s": mediana,
+            "min_s": min(tempos),
+            "max_s": max(tempos),
+            "itens_por_s": itens / mediana if mediana else None,
+        }
+    resultados.update({k: v for k, v in resultados_render.items() if not args.etapas or k in args.etapas})
+    return resultados
+
+
+def ambiente():
+    versoes = {}
+    for pacote in PACOTES:
+        try:
+            versoes[pacote] = getattr(importlib.import_module(pacote), "__version__", "?")
+        except ImportError:
+            versoes[pacote] = None
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+        "pacotes": versoes,
+    }
+
+
+def comparar(base, atual, tolerancia):
+    """Retorna a lista de linhas (conjunto, etapa, base, atual, razão, regrediu)."""
+    linhas = []
+    for conjunto, etapas in atual["conjuntos"].items():
+        for etapa, medicao in etapas.items():
+            anterior = base["conjuntos"].get(conjunto, {}).get(etapa)
+            if not anterior or "mediana_s" not in anterior or "mediana_s" not in medicao:
+                continue
+            razao = medicao["mediana_s"] / anterior["mediana_s"] if anterior["mediana_s"] else float("inf")
+            linhas.append((conjunto, etapa, anterior["mediana_s"], medicao["mediana_s"], razao, razao > 1 + tolerancia))
+    return linhas
+
+
+def imprimir_resultados(resultado):
+    print(f"modelo: {resultado['modelo']}")
+    print(f"{'conjunto':>10} {'etapa':>22} {'itens':>8} {'mediana (s)':>12} {'itens/s':>12}")
+    for conjunto, etapas in resultado["conjuntos"].items():
+        for etapa, medicao in etapas.items():
+            if "indisponivel" in medicao:
+                print(f"{conjunto:>10} {etapa:>22} {'indisponível: ' + medicao['indisponivel']}")
+                continue
+            print(f"{conjunto:>10} {etapa:>22} {medicao['itens']:>8} {medicao['mediana_s']:>12.4f} "
+                  f"{medicao['itens_por_s']:>12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="comments_amazon.csv")
+    parser.add_argument("--coluna", default="Comentario")
+    parser.add_argument("--sinteticos", type=int, nargs="*", default=[10_000, 100_000],
+                        help="tamanhos dos conjuntos sintéticos")
+    parser.add_argument("--modelo", default="stub", help="stub, pysentimiento ou diretório de um modelo local")
+    parser.add_argument("--etapas", nargs="+", help="mede só estas etapas")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threshold", type=float, default=0.55)
+    parser.add_argument("--max-inferencia", type=int, default=2000, help="textos por conjunto nas etapas com modelo")
+    parser.add_argument("--max-individual", type=int, default=200, help="textos na inferência individual")
+    parser.add_argument("--saida", help="grava o resultado em JSON")
+    parser.add_argument("--resultado", help="não mede: usa este JSON como resultado atual")
+    parser.add_argument("--comparar", help="JSON de linha de base para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="aumento tolerado da mediana (fração)")
+    args = parser.parse_args(argv)
+
+    if args.resultado:
+        with open(args.resultado, encoding="utf-8") as f:
+            resultado = json.load(f)
+    else:
+        textos_base = pd.read_csv(args.csv)[args.coluna].dropna().astype(str).tolist()
+        conjuntos = {"csv": textos_base}
+        for quantidade in args.sinteticos:
+            conjuntos[f"sint_{quantidade // 1000}k" if quantidade >= 1000 else f"sint_{quantidade}"] = \
+                gerar_textos_sinteticos(textos_base, quantidade)
+
+        inicio = time.perf_counter()
+        prever, descricao_modelo = criar_previsor(args.modelo, args.batch_size)
+        resultado = {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "modelo": descricao_modelo,
+            "carregamento_modelo_s": time.perf_counter() - inicio,
+            "parametros": {k: getattr(args, k) for k in ("repeticoes", "batch_size", "threshold",
+                                                          "max_inferencia", "max_individual")},
+            "ambiente": ambiente(),
+            "conjuntos": {},
+        }
+        for nome, textos in conjuntos.items():
+            print(f"medindo {nome} ({len(textos)} textos)...", file=sys.stderr)
+            resultado["conjuntos"][nome] = medir_conjunto(textos, prever, args)
+
+    imprimir_resultados(resultado)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"\nresultado gravado em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        if base.get("modelo") != resultado.get("modelo"):
+            print(f"\naviso: modelos diferentes ({base.get('modelo')} × {resultado.get('modelo')})")
+        linhas = comparar(base, resultado, args.tolerancia)
+        print(f"\n{'conjunto':>10} {'etapa':>22} {'base (s)':>10} {'atual (s)':>10} {'razão':>7}")
+        for conjunto, etapa, anterior, atual, razao, regrediu in linhas:
+            marca = "  REGRESSÃO" if regrediu else ""
+            print(f"{conjunto:>10} {etapa:>22} {anterior:>10.4f} {atual:>10.4f} {razao:>7.2f}{marca}")
+        regressoes = sum(1 for *_, regrediu in linhas if regrediu)
+        print(f"\n{regressoes} regressão(ões) acima de {args.tolerancia:.0%}")
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Componentes reutilizáveis do pipeline de análise de sentimento.
+"""
+from sentimento.texto import (
+    NormalizadorTexto,
+    NORMALIZADOR,
+    limpar_texto_completo,
+    IndiceStopwords,
+    obter_stopwords,
+    remover_stop_words,
+)
+from sentimento.resultados import COLUNAS_RESULTADO, BufferResultados, resultado_texto
+from sentimento.modelo import carregar_pipeline, obter_analyzer
+from sentimento.pipeline import SentimentPipeline, pontuar_textos, preprocessar_textos
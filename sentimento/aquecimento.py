@@ -0,0 +1,155 @@
+"""
+Aquecimento do modelo e estado de prontidão do processo.
+
+O primeiro usuário depois de um deploy pagava o carregamento do modelo e a
+primeira passagem (lenta) pelo modelo. iniciar_aquecimento() carrega o
+analyzer numa thread assim que o processo sobe e passa lotes
+representativos de alguns tamanhos pelo mesmo caminho de inferência do app,
+até o tempo estabilizar. ESTADO_MODELO expõe a prontidão (para a interface
+e para health checks) e os tempos medidos.
+
+    python -m sentimento.aquecimento     # carrega, aquece e mostra os tempos
+"""
+import threading
+import time
+
+from sentimento.modelo import obter_analyzer
+
+INICIANDO = "iniciando"
+CARREGANDO = "carregando"
+AQUECENDO = "aquecendo"
+PRONTO = "pronto"
+ERRO = "erro"
+
+# Tamanhos de lote aquecidos: texto único (Individual/micro-lote) e lotes
+TAMANHOS_AQUECIMENTO = (1, 8, 32)
+
+# Passagens por tamanho; a primeira é a lenta, as seguintes mostram o regime
+REPETICOES_AQUECIMENTO = 3
+
+# Textos já processados (sem acentos, pontuação e stop words), de tamanhos variados
+TEXTOS_AQUECIMENTO = (
+    "otimo",
+    "produto chegou rapido bem embalado",
+    "nao gostei qualidade pessima devolvi",
+    "celular bom bateria dura dia inteiro camera poderia melhor preco justo",
+    "entrega atrasou duas semanas atendimento nao resolveu nada produto veio riscado "
+    "caixa amassada nao recomendo loja",
+    "comprei presente minha mae ela adorou tela grande facil usar letras grandes "
+    "som alto recomendo quem procura aparelho simples funcional",
+)
+
+
+class EstadoModelo:
+    """Estado de prontidão do modelo no processo, seguro entre threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.estado = INICIANDO
+            self.mensagem = "Aguardando o carregamento do modelo"
+            self.erro = None
+            self.carregamento_s = None
+            self.aquecimento_ms = {}
+            self.iniciado_em = None
+            self.pronto_em = None
+
+    def atualizar(self, estado, mensagem, **campos):
+        with self._lock:
+            self.estado = estado
+            self.mensagem = mensagem
+            for campo, valor in campos.items():
+                setattr(self, campo, valor)
+
+    @property
+    def pronto(self):
+        return self.estado == PRONTO
+
+    def como_dict(self):
+        with self._lock:
+            return {
+                "estado": self.estado,
+                "pronto": self.estado == PRONTO,
+                "mensagem": self.mensagem,
+                "erro": self.erro,
+                "carregamento_s": self.carregamento_s,
+                "aquecimento_ms": {str(k): list(v) for k, v in self.aquecimento_ms.items()},
+                "iniciado_em": self.iniciado_em,
+                "pronto_em": self.pronto_em,
+            }
+
+
+ESTADO_MODELO = EstadoModelo()
+
+
+def aquecer(analyzer, tamanhos=TAMANHOS_AQUECIMENTO, repeticoes=REPETICOES_AQUECIMENTO,
+            max_tokens=128, truncamento="inicio", estado=None):
+    """
+    Passa `repeticoes` lotes de cada tamanho pelo modelo. Retorna
+    {tamanho: [ms de cada passagem]}.
+    """
+    from sentimento.inferencia import prever_probas_lote
+
+    tempos = {}
+    for tamanho in tamanhos:
+        textos = [TEXTOS_AQUECIMENTO[i % len(TEXTOS_AQUECIMENTO)] for i in range(tamanho)]
+        tempos[tamanho] = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            prever_probas_lote(analyzer, textos, tamanho, max_tokens, truncamento)
+            tempos[tamanho].append((time.perf_counter() - inicio) * 1000)
+        if estado is not None:
+            estado.atualizar(AQUECENDO, f"Aquecendo o modelo (lote de {tamanho})",
+                             aquecimento_ms=dict(tempos))
+    return tempos
+
+
+def _carregar_e_aquecer(estado, modelo, backend, max_tokens, truncamento, ao_carregar):
+    try:
+        estado.atualizar(CARREGANDO, "Carregando o modelo", iniciado_em=time.time())
+        inicio = time.perf_counter()
+        analyzer = obter_analyzer(modelo, backend)
+        if ao_carregar is not None:
+            ao_carregar(analyzer)
+        estado.atualizar(AQUECENDO, "Aquecendo o modelo", carregamento_s=time.perf_counter() - inicio)
+        aquecer(analyzer, max_tokens=max_tokens, truncamento=truncamento, estado=estado)
+        estado.atualizar(PRONTO, "Modelo pronto", pronto_em=time.time())
+    except Exception as e:
+        estado.atualizar(ERRO, "Falha ao carregar o modelo", erro=f"{type(e).__name__}: {e}")
+
+
+def iniciar_aquecimento(modelo=None, backend=None, max_tokens=128, truncamento="inicio", estado=ESTADO_MODELO,
+                        em_segundo_plano=True, ao_carregar=None):
+    """
+    Inicia o carregamento + aquecimento uma única vez por processo (chamadas
+    seguintes não fazem nada, exceto depois de reiniciar() o estado). Em
+    segundo plano por padrão; acompanhe por `estado`. `ao_carregar(analyzer)`
+    é chamado antes do aquecimento, para quem precisa do analyzer pronto.
+    """
+    with estado._lock:
+        if estado._thread is not None and estado.estado != INICIANDO:
+            return estado
+        estado._thread = threading.Thread(
+            target=_carregar_e_aquecer, args=(estado, modelo, backend, max_tokens, truncamento, ao_carregar),
+            name="aquecimento-modelo", daemon=True
+        )
+        estado.estado = CARREGANDO
+    if em_segundo_plano:
+        estado._thread.start()
+    else:
+        estado._thread.run()
+    return estado
+
+
+if __name__ == "__main__":
+    iniciar_aquecimento(em_segundo_plano=False)
+    situacao = ESTADO_MODELO.como_dict()
+    if situacao["erro"]:
+        raise SystemExit(f"Erro: {situacao['erro']}")
+    print(f"Modelo carregado em {situacao['carregamento_s']:.2f}s")
+    for tamanho, tempos in situacao["aquecimento_ms"].items():
+        print(f"  lote {tamanho:>3}: " + " → ".join(f"{t:.1f} ms" for t in tempos))
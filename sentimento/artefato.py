@@ -0,0 +1,225 @@
+"""
+Artefato versionado do modelo: um diretório com os pesos em safetensors,
+o tokenizer e um manifesto.
+
+    python -m sentimento.artefato exportar modelo_sentimento --versao 1.0.0
+    python -m sentimento.artefato verificar modelo_sentimento
+
+O manifesto (manifesto.json) guarda o identificador e a versão do modelo,
+o threshold, a configuração de pré-processamento e o tamanho + SHA-256 de
+cada arquivo. Carregar o artefato não acessa a rede; os pesos em
+safetensors são lidos por mmap, e processos que carregam o mesmo arquivo
+compartilham as páginas do cache do sistema. Qualquer divergência entre o
+manifesto e os arquivos interrompe o carregamento com ArtefatoInvalido.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+from datetime import datetime
+
+NOME_MANIFESTO = "manifesto.json"
+FORMATO = 1
+PESOS = "model.safetensors"
+
+# Arquivos até este tamanho têm o SHA-256 conferido também na verificação rápida
+LIMITE_HASH_RAPIDO = 16 * 1024 * 1024
+
+
+class ArtefatoInvalido(Exception):
+    """Artefato ausente, incompleto ou diferente do manifesto."""
+
+
+def eh_artefato(diretorio):
+    return bool(diretorio) and os.path.isfile(os.path.join(diretorio, NOME_MANIFESTO))
+
+
+def _sha256(caminho):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def ler_manifesto(diretorio):
+    """Lê o manifesto sem carregar o modelo."""
+    caminho = os.path.join(diretorio, NOME_MANIFESTO)
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            manifesto = json.load(f)
+    except FileNotFoundError:
+        raise ArtefatoInvalido(f"{caminho} não encontrado: {diretorio} não é um artefato de modelo") from None
+    except ValueError as e:
+        raise ArtefatoInvalido(f"{caminho} não é um JSON válido: {e}") from None
+    if manifesto.get("formato") != FORMATO:
+        raise ArtefatoInvalido(f"{caminho}: formato {manifesto.get('formato')!r} não suportado (esperado {FORMATO})")
+    return manifesto
+
+
+def _verificar_safetensors(caminho):
+    # Cabeçalho: 8 bytes (tamanho do JSON) + JSON com os offsets de cada tensor
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, "rb") as f:
+        bruto = f.read(8)
+        if len(bruto) < 8:
+            raise ArtefatoInvalido(f"{caminho}: arquivo safetensors truncado")
+        tamanho_cabecalho = struct.unpack("<Q", bruto)[0]
+        if 8 + tamanho_cabecalho > tamanho:
+            raise ArtefatoInvalido(f"{caminho}: cabeçalho safetensors corrompido")
+        try:
+            cabecalho = json.loads(f.read(tamanho_cabecalho))
+        except ValueError:
+            raise ArtefatoInvalido(f"{caminho}: cabeçalho safetensors corrompido") from None
+    fim_dados = max((v["data_offsets"][1] for k, v in cabecalho.items() if k != "__metadata__"), default=0)
+    if 8 + tamanho_cabecalho + fim_dados != tamanho:
+        raise ArtefatoInvalido(f"{caminho}: tamanho não corresponde ao cabeçalho safetensors (arquivo truncado?)")
+
+
+def verificar_artefato(diretorio, completa=False):
+    """
+    Confere o artefato contra o manifesto e retorna o manifesto. A
+    verificação rápida checa a presença e o tamanho de todos os arquivos, o
+    SHA-256 dos pequenos e a consistência do cabeçalho dos pesos; a
+    completa calcula o SHA-256 de todos.
+    """
+    manifesto = ler_manifesto(diretorio)
+    arquivos = manifesto.get("arquivos", {})
+    if PESOS not in arquivos:
+        raise ArtefatoInvalido(f"{diretorio}: o manifesto não lista os pesos ({PESOS})")
+    for nome, info in arquivos.items():
+        caminho = os.path.join(diretorio, nome)
+        if not os.path.isfile(caminho):
+            raise ArtefatoInvalido(f"{caminho} listado no manifesto não existe")
+        tamanho = os.path.getsize(caminho)
+        if tamanho != info["bytes"]:
+            raise ArtefatoInvalido(f"{caminho}: {tamanho} bytes, o manifesto indica {info['bytes']}")
+        if completa or tamanho <= LIMITE_HASH_RAPIDO:
+            if _sha256(caminho) != info["sha256"]:
+                raise ArtefatoInvalido(f"{caminho}: SHA-256 diferente do manifesto")
+    _verificar_safetensors(os.path.join(diretorio, PESOS))
+    return manifesto
+
+
+class Predicao:
+    """Mesma interface do resultado de analyzer.predict do pysentimiento."""
+
+    def __init__(self, probas):
+        self.probas = probas
+        self.output = max(probas, key=probas.get)
+
+
+class AnalyzerLocal:
+    """
+    Analyzer montado a partir do artefato, com os atributos usados por
+    sentimento.inferencia (model, tokenizer, lang, preprocessing_args).
+    """
+
+    def __init__(self, model, tokenizer, manifesto, diretorio=None):
+        preprocessamento = manifesto["preprocessamento"]
+        self.model = model
+        self.tokenizer = tokenizer
+        self.manifesto = manifesto
+        self.diretorio = diretorio
+        self.lang = preprocessamento.get("lang", "pt")
+        self.preprocessing_args = preprocessamento.get("preprocessing_args", {})
+        self.identificador = f"{manifesto['modelo_id']}@{manifesto['versao']}"
+
+    def predict(self, texto):
+        from sentimento.inferencia import prever_probas_lote
+
+        preprocessamento = self.manifesto["preprocessamento"]
+        probas = prever_probas_lote(
+            self, [texto], 1, preprocessamento["max_tokens"], preprocessamento["truncamento"]
+        )[0]
+        return Predicao(probas)
+
+
+def carregar_artefato(diretorio, completa=False):
+    """Verifica e carrega o artefato, sem acesso à rede. Retorna um AnalyzerLocal."""
+    manifesto = verificar_artefato(diretorio, completa)
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    model = AutoModelForSequenceClassification.from_pretrained(
+        diretorio, local_files_only=True, use_safetensors=True
+    )
+    model.eval()
+    tokenizer = AutoTokenizer.from_pretrained(diretorio, local_files_only=True)
+    return AnalyzerLocal(model, tokenizer, manifesto, diretorio)
+
+
+def exportar_artefato(destino, versao, modelo=None, threshold=0.55, max_tokens=128, truncamento="inicio"):
+    """
+    Salva o modelo do pysentimiento (ou `modelo`) como artefato em
+    `destino`. Esta etapa precisa do modelo original (rede ou cache do
+    Hugging Face); o carregamento do artefato, não.
+    """
+    from sentimento.inferencia import criar_analyzer
+    from sentimento.texto import IndiceStopwords
+
+    analyzer = criar_analyzer(modelo)
+    os.makedirs(destino, exist_ok=True)
+    analyzer.model.save_pretrained(destino, safe_serialization=True)
+    analyzer.tokenizer.save_pretrained(destino)
+
+    arquivos = {}
+    for nome in sorted(os.listdir(destino)):
+        caminho = os.path.join(destino, nome)
+        if nome != NOME_MANIFESTO and os.path.isfile(caminho):
+            arquivos[nome] = {"bytes": os.path.getsize(caminho), "sha256": _sha256(caminho)}
+    if PESOS not in arquivos:
+        raise ArtefatoInvalido(f"{destino}: os pesos não foram salvos em {PESOS}")
+
+    manifesto = {
+        "formato": FORMATO,
+        "modelo_id": analyzer.model.config._name_or_path,
+        "versao": versao,
+        "threshold": threshold,
+        "classes": analyzer.model.config.id2label,
+        "preprocessamento": {
+            "lang": getattr(analyzer, "lang", "pt"),
+            "preprocessing_args": getattr(analyzer, "preprocessing_args", {}) or {},
+            "max_tokens": max_tokens,
+            "truncamento": truncamento,
+            "stopwords": "nltk:portuguese",
+            "stopwords_mantidas": sorted(IndiceStopwords.MANTER),
+        },
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "arquivos": arquivos,
+    }
+    with open(os.path.join(destino, NOME_MANIFESTO), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    return manifesto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    exportar = comandos.add_parser("exportar", help="cria o artefato a partir do modelo do pysentimiento")
+    exportar.add_argument("destino")
+    exportar.add_argument("--versao", required=True)
+    exportar.add_argument("--modelo", help="outro modelo do Hugging Face ou diretório local")
+    exportar.add_argument("--threshold", type=float, default=0.55)
+    exportar.add_argument("--max-tokens", type=int, default=128)
+    exportar.add_argument("--truncamento", choices=["inicio", "fim"], default="inicio")
+    verificar = comandos.add_parser("verificar", help="confere o SHA-256 de todos os arquivos")
+    verificar.add_argument("diretorio")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comando == "exportar":
+            manifesto = exportar_artefato(args.destino, args.versao, args.modelo, args.threshold,
+                                          args.max_tokens, args.truncamento)
+            print(f"{manifesto['modelo_id']} {manifesto['versao']} exportado para {args.destino}")
+        else:
+            manifesto = verificar_artefato(args.diretorio, completa=True)
+            print(f"OK: {manifesto['modelo_id']} {manifesto['versao']} ({len(manifesto['arquivos'])} arquivos)")
+    except ArtefatoInvalido as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Backends de inferência em CPU para o mesmo modelo.
+
+    fp32  modelo original do torch (padrão)
+    int8  quantização dinâmica do torch: pesos das camadas Linear em int8,
+          ativações quantizadas durante a execução; nenhum arquivo extra
+    onnx  ONNX Runtime sobre o modelo exportado para ONNX a partir do
+          artefato local (sentimento.artefato); a exportação é feita na
+          primeira carga ou com:
+
+    python -m sentimento.backends exportar-onnx modelo_sentimento
+
+aplicar_backend() recebe o analyzer fp32 e devolve outro com o mesmo
+tokenizer e pré-processamento e apenas o `model` trocado, então
+prever_probas_lote, o cache e o pool funcionam sem mudanças. O
+identificador inclui o backend, e o cache de predições não mistura os
+resultados. O ONNX é conferido contra o fp32 em alguns textos a cada
+carga (verificar_onnx). Acurácia e latência contra o fp32 no CSV inteiro:
+python -m benchmarks.backends.
+"""
+import argparse
+import os
+import sys
+import types
+
+BACKENDS = ("fp32", "int8", "onnx")
+
+# Opset do torch.onnx.export; 14+ cobre as operações dos modelos BERT/RoBERTa
+OPSET_ONNX = 17
+
+# Conferência do ONNX contra o fp32: textos de tamanhos diferentes (lote com
+# padding) e maior diferença de probabilidade aceita
+TEXTOS_VERIFICACAO = (
+    "muito bom",
+    "nao gostei do produto chegou quebrado",
+    "entrega rapida produto bem embalado funcionando perfeitamente recomendo a todos",
+    "ok",
+)
+TOLERANCIA_ONNX = 1e-3
+
+
+class BackendIndisponivel(Exception):
+    """Backend sem suporte para este modelo ou sem a dependência instalada."""
+
+
+class AnalyzerBackend:
+    """Analyzer fp32 com o `model` trocado pelo do backend."""
+
+    def __init__(self, base, model, backend):
+        self.model = model
+        self.tokenizer = base.tokenizer
+        self.lang = getattr(base, "lang", "pt")
+        self.preprocessing_args = getattr(base, "preprocessing_args", {}) or {}
+        self.manifesto = getattr(base, "manifesto", None)
+        self.diretorio = getattr(base, "diretorio", None)
+        self.backend = backend
+        nome = getattr(base, "identificador", None) or base.model.config._name_or_path
+        self.identificador = f"{nome}+{backend}"
+
+    def predict(self, texto):
+        from sentimento.artefato import Predicao
+        from sentimento.inferencia import prever_probas_lote
+
+        preprocessamento = (self.manifesto or {}).get("preprocessamento", {})
+        probas = prever_probas_lote(
+            self, [texto], 1, preprocessamento.get("max_tokens", 128),
+            preprocessamento.get("truncamento", "inicio")
+        )[0]
+        return Predicao(probas)
+
+
+class ModeloOnnx:
+    """Sessão do ONNX Runtime com a interface do modelo usada por prever_probas_lote."""
+
+    def __init__(self, caminho, config, threads=None):
+        import onnxruntime as ort
+        import torch
+
+        opcoes = ort.SessionOptions()
+        opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opcoes.intra_op_num_threads = threads
+        self.sessao = ort.InferenceSession(caminho, opcoes, providers=["CPUExecutionProvider"])
+        self.entradas = {e.name for e in self.sessao.get_inputs()}
+        self.config = config
+        self.device = torch.device("cpu")
+
+    def __call__(self, **entradas):
+        import torch
+
+        feed = {nome: tensor.numpy() for nome, tensor in entradas.items() if nome in self.entradas}
+        logits = self.sessao.run(["logits"], feed)[0]
+        return types.SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def quantizar_int8(model):
+    """Cópia do modelo com as camadas Linear quantizadas dinamicamente em int8."""
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def caminho_onnx(analyzer):
+    """
+    Arquivo ONNX do artefato do analyzer. O nome leva o início do SHA-256
+    dos pesos, então uma nova versão do artefato não reaproveita um ONNX antigo.
+    """
+    from sentimento.artefato import PESOS
+
+    diretorio = getattr(analyzer, "diretorio", None)
+    if not diretorio:
+        raise BackendIndisponivel(
+            "o backend onnx precisa de um artefato local do modelo "
+            "(python -m sentimento.artefato exportar modelo_sentimento --versao ...)"
+        )
+    sha = analyzer.manifesto["arquivos"][PESOS]["sha256"]
+    return os.path.join(diretorio, f"model.{sha[:12]}.onnx")
+
+
+def exportar_onnx(analyzer, caminho):
+    """Exporta o modelo fp32 do analyzer para ONNX, com lote e tokens dinâmicos."""
+    import torch
+
+    exemplo = analyzer.tokenizer(["texto de exemplo"], return_tensors="pt")
+    eixos = {0: "lote", 1: "tokens"}
+    temporario = caminho + ".tmp"
+    # no_grad, não inference_mode: o exportador rejeita os tensores de inferência
+    with torch.no_grad():
+        torch.onnx.export(
+            analyzer.model,
+            (exemplo["input_ids"], exemplo["attention_mask"]),
+            temporario,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={"input_ids": eixos, "attention_mask": eixos, "logits": {0: "lote"}},
+            opset_version=OPSET_ONNX,
+        )
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def verificar_onnx(analyzer, modelo_onnx, textos=TEXTOS_VERIFICACAO, tolerancia=TOLERANCIA_ONNX):
+    """
+    Maior diferença absoluta entre as probabilidades do fp32 e do ONNX em
+    `textos`, num único lote com padding. Levanta BackendIndisponivel se
+    passar de `tolerancia`.
+    """
+    import torch
+
+    entradas = analyzer.tokenizer(list(textos), padding=True, return_tensors="pt")
+    entradas = {k: v for k, v in entradas.items() if k in ("input_ids", "attention_mask")}
+    with torch.no_grad():
+        fp32 = torch.softmax(analyzer.model(**entradas).logits, dim=-1)
+    onnx = torch.softmax(modelo_onnx(**entradas).logits, dim=-1)
+    delta = float((fp32 - onnx).abs().max())
+    if delta > tolerancia:
+        raise BackendIndisponivel(
+            f"o modelo ONNX diverge do fp32 (máx |Δp| = {delta:.2e} > {tolerancia:.0e})"
+        )
+    return delta
+
+
+def aplicar_backend(analyzer, backend):
+    """Analyzer equivalente a `analyzer` (fp32) executado pelo `backend`."""
+    if backend == "fp32":
+        return analyzer
+    if backend == "int8":
+        return AnalyzerBackend(analyzer, quantizar_int8(analyzer.model), backend)
+    if backend == "onnx":
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            raise BackendIndisponivel("o backend onnx requer `pip install onnx onnxruntime`") from None
+        caminho = caminho_onnx(analyzer)
+        if not os.path.isfile(caminho):
+            exportar_onnx(analyzer, caminho)
+        modelo = ModeloOnnx(caminho, analyzer.model.config)
+        try:
+            verificar_onnx(analyzer, modelo)
+        except BackendIndisponivel:
+            # Na próxima carga o ONNX é exportado de novo
+            os.remove(caminho)
+            raise
+        return AnalyzerBackend(analyzer, modelo, backend)
+    raise ValueError(f"backend desconhecido: {backend!r} (opções: {', '.join(BACKENDS)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    exportar = comandos.add_parser("exportar-onnx", help="exporta o artefato para ONNX")
+    exportar.add_argument("diretorio")
+    args = parser.parse_args(argv)
+
+    from sentimento.artefato import ArtefatoInvalido, carregar_artefato
+
+    try:
+        analyzer = carregar_artefato(args.diretorio)
+        caminho = exportar_onnx(analyzer, caminho_onnx(analyzer))
+        delta = verificar_onnx(analyzer, ModeloOnnx(caminho, analyzer.model.config))
+        print(f"ONNX exportado para {caminho} (máx |Δp| contra o fp32: {delta:.2e})")
+    except (ArtefatoInvalido, BackendIndisponivel) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Cache de predições endereçado por conteúdo.
+
+A chave é um hash do texto já processado junto com o identificador do
+modelo, então textos repetidos ("Muito bom", "Excelente", só emojis) são
+classificados uma única vez. Há um nível em memória (LRU limitado) e um
+nível opcional em SQLite, que sobrevive a reinícios do Streamlit.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def chave_predicao(texto, modelo_id):
+    """Hash (hex) do texto processado + identificador do modelo."""
+    dados = f"{modelo_id}\0{texto}".encode("utf-8")
+    return hashlib.blake2b(dados, digest_size=16).hexdigest()
+
+
+class CachePredicoes:
+    """
+    Guarda as probabilidades por classe ({"POS": ..., "NEG": ..., "NEU": ...})
+    de cada texto. É seguro para uso entre threads (sessões do Streamlit
+    compartilham a mesma instância via st.cache_resource).
+    """
+
+    def __init__(self, max_itens=50_000, caminho_sqlite=None):
+        self.max_itens = max_itens
+        self.caminho_sqlite = caminho_sqlite
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.faltas = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self._conexao = None
+        if caminho_sqlite:
+            self._conexao = sqlite3.connect(caminho_sqlite, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS predicoes (chave TEXT PRIMARY KEY, probas TEXT NOT NULL)"
+            )
+            self._conexao.commit()
+
+    @property
+    def acertos(self):
+        return self.acertos_memoria + self.acertos_disco
+
+    def obter_muitos(self, chaves):
+        """
+        Retorna {chave: probas} para as chaves encontradas. Busca primeiro
+        na memória e, para o que faltar, no SQLite (promovendo para a memória).
+        """
+        encontrados = {}
+        with self._lock:
+            for chave in chaves:
+                probas = self._itens.get(chave)
+                if probas is not None:
+                    self._itens.move_to_end(chave)
+                    encontrados[chave] = probas
+            self.acertos_memoria += len(encontrados)
+
+            faltando = [c for c in chaves if c not in encontrados]
+            if faltando and self._conexao is not None:
+                do_disco = {}
+                # Consulta em blocos para respeitar o limite de parâmetros do SQLite
+                for inicio in range(0, len(faltando), 500):
+                    bloco = faltando[inicio:inicio + 500]
+                    marcadores = ",".join("?" * len(bloco))
+                    cursor = self._conexao.execute(
+                        f"SELECT chave, probas FROM predicoes WHERE chave IN ({marcadores})", bloco
+                    )
+                    do_disco.update((c, json.loads(p)) for c, p in cursor)
+                self.acertos_disco += len(do_disco)
+                encontrados.update(do_disco)
+                self._guardar_memoria(do_disco)
+
+            self.faltas += len(chaves) - len(encontrados)
+        return encontrados
+
+    def guardar_muitos(self, itens):
+        """Guarda {chave: probas} na memória e, se configurado, no SQLite."""
+        with self._lock:
+            self._guardar_memoria(itens)
+            if self._conexao is not None and itens:
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO predicoes (chave, probas) VALUES (?, ?)",
+                    ((c, json.dumps(p)) for c, p in itens.items())
+                )
+                self._conexao.commit()
+
+    def _guardar_memoria(self, itens):
+        for chave, probas in itens.items():
+            self._itens[chave] = probas
+            self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos_memoria + self.acertos_disco + self.faltas
+            return {
+                "itens_memoria": len(self._itens),
+                "acertos_memoria": self.acertos_memoria,
+                "acertos_disco": self.acertos_disco,
+                "faltas": self.faltas,
+                "taxa_acerto": (self.acertos_memoria + self.acertos_disco) / consultas if consultas else 0.0,
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.acertos_memoria = self.acertos_disco = self.faltas = 0
+            if self._conexao is not None:
+                self._conexao.execute("DELETE FROM predicoes")
+                self._conexao.commit()
+
+
+def prever_com_cache(textos, prever, cache, modelo_id):
+    """
+    Deduplica `textos`, consulta o cache e chama `prever(lista_de_textos)`
+    apenas para os textos distintos ainda não vistos. Retorna a lista de
+    probas na ordem de entrada, com o resultado repetido para cada linha
+    de textos iguais.
+    """
+    chaves = {}
+    for texto in textos:
+        if texto not in chaves:
+            chaves[texto] = chave_predicao(texto, modelo_id)
+
+    encontrados = cache.obter_muitos(list(chaves.values())) if cache is not None else {}
+    faltando = [t for t, c in chaves.items() if c not in encontrados]
+    if faltando:
+        novos = dict(zip((chaves[t] for t in faltando), prever(faltando)))
+        if cache is not None:
+            cache.guardar_muitos(novos)
+        encontrados.update(novos)
+    return [encontrados[chaves[t]] for t in textos]
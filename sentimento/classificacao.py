@@ -0,0 +1,89 @@
+"""
+Regras de decisão do sentimento a partir das probabilidades do modelo.
+
+As probabilidades POS/NEG/NEU ficam guardadas junto com os resultados
+(colunas prob_pos, prob_neg, prob_neu em float32), então uma mudança de
+threshold reclassifica tudo numa única operação vetorizada, sem rodar o
+modelo de novo.
+"""
+import numpy as np
+import pandas as pd
+
+# Mesma ordem do id2label do modelo: em empates, vence a primeira classe,
+# como no argmax do pysentimiento
+CLASSES = ("NEG", "NEU", "POS")
+COLUNAS_PROBAS = {"POS": "prob_pos", "NEG": "prob_neg", "NEU": "prob_neu"}
+
+# Sentimentos finais, guardados como códigos int8 nos resultados em lote
+CATEGORIAS = ("positivo", "negativo", "incerto")
+POSITIVO, NEGATIVO, INCERTO = range(len(CATEGORIAS))
+
+
+def decidir_sentimento(probas, threshold=0.55):
+    """
+    Converte as probabilidades POS/NEG/NEU em (sentimento, probabilidade).
+    """
+    saida = max(CLASSES, key=probas.__getitem__)
+    if saida == "POS":
+        return "positivo", round(probas["POS"], 3)
+    elif saida == "NEG":
+        return "negativo", round(probas["NEG"], 3)
+    else:
+        # Se for neutro, compara POS e NEG e decide pela maior, se confiável
+        if probas["POS"] >= threshold:
+            return "positivo", round(probas["POS"], 3)
+        elif probas["NEG"] >= threshold:
+            return "negativo", round(probas["NEG"], 3)
+        else:
+            return "incerto", max(round(probas["POS"], 3), round(probas["NEG"], 3))
+
+
+def matriz_probas(probas):
+    """
+    Converte uma lista de dicts {classe: prob} numa matriz float32 (n, 3)
+    com as colunas na ordem POS, NEG, NEU.
+    """
+    return np.array(
+        [(p["POS"], p["NEG"], p["NEU"]) for p in probas], dtype=np.float32
+    ).reshape(-1, 3)
+
+
+def decidir_codigos(prob_pos, prob_neg, prob_neu, threshold=0.55):
+    """
+    Versão vetorizada de decidir_sentimento para arrays de probabilidades.
+    Retorna (códigos int8 em CATEGORIAS, probabilidades float32).
+    """
+    pos = np.asarray(prob_pos)
+    neg = np.asarray(prob_neg)
+    saida = np.stack([neg, np.asarray(prob_neu), pos], axis=1).argmax(axis=1)
+    pos_arred = np.round(pos.astype(np.float64), 3)
+    neg_arred = np.round(neg.astype(np.float64), 3)
+
+    condicoes = [saida == 2, saida == 0, pos >= threshold, neg >= threshold]
+    codigos = np.select(condicoes, [POSITIVO, NEGATIVO, POSITIVO, NEGATIVO], INCERTO).astype(np.int8)
+    probabilidades = np.select(
+        condicoes, [pos_arred, neg_arred, pos_arred, neg_arred], np.maximum(pos_arred, neg_arred)
+    ).astype(np.float32)
+    return codigos, probabilidades
+
+
+def decidir_sentimentos(prob_pos, prob_neg, prob_neu, threshold=0.55):
+    """
+    Como decidir_codigos, mas com os sentimentos como texto.
+    """
+    codigos, probabilidades = decidir_codigos(prob_pos, prob_neg, prob_neu, threshold)
+    return np.array(CATEGORIAS, dtype=object)[codigos], probabilidades
+
+
+def reclassificar(df, threshold=0.55):
+    """
+    Recalcula as colunas sentimento/probabilidade de um DataFrame de
+    resultados a partir das colunas prob_pos/prob_neg/prob_neu.
+    """
+    codigos, probabilidades = decidir_codigos(
+        df["prob_pos"].to_numpy(), df["prob_neg"].to_numpy(), df["prob_neu"].to_numpy(), threshold
+    )
+    return df.assign(
+        sentimento=pd.Categorical.from_codes(codigos, CATEGORIAS),
+        probabilidade=probabilidades
+    )
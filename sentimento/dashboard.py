@@ -0,0 +1,179 @@
+"""
+Resultados memorizados do Dashboard Completo.
+
+A análise de um arquivo é guardada sob uma impressão digital do conteúdo
+do arquivo e da configuração do modelo (identificador/versão, backend,
+truncamento, stop words). Reruns e novas sessões com a mesma impressão
+reaproveitam os resultados sem passar pelo modelo. O threshold não entra
+na impressão: a análise guarda as probabilidades por classe e quem a
+exibe aplica reclassificar(resultados, threshold).
+
+Quando a impressão muda (o arquivo cresceu, algumas linhas mudaram), as
+linhas são casadas pelo hash do texto com a análise mais recente da mesma
+configuração do modelo, e só os textos novos ou alterados são pontuados. As entradas ficam em disco (como os
+resultados dos jobs), então sobrevivem a reinícios do app.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from sentimento.resultados import COLUNAS_RESULTADO
+
+_impressoes_arquivo = {}
+
+
+def impressao(*partes):
+    """Hash curto e estável das partes (convertidas em texto)."""
+    return hashlib.blake2b("\x1f".join(map(str, partes)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def impressao_arquivo(caminho):
+    """
+    Hash do conteúdo do arquivo. Recalculado só quando o tamanho ou a data
+    de modificação mudam, então pode ser chamado a cada rerun.
+    """
+    info = os.stat(caminho)
+    chave = (os.path.abspath(caminho), info.st_size, info.st_mtime_ns)
+    if chave not in _impressoes_arquivo:
+        h = hashlib.blake2b(digest_size=16)
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloco)
+        _impressoes_arquivo[chave] = h.hexdigest()
+    return _impressoes_arquivo[chave]
+
+
+def hash_textos(textos):
+    """Hash de 64 bits de cada texto, usado para casar linhas entre versões do arquivo."""
+    return pd.util.hash_pandas_object(pd.Series(textos, dtype=object), index=False).to_numpy()
+
+
+class MemoriaDashboard:
+    """
+    Análises completas por impressão digital, em memória e em `diretorio`.
+    Mantém as `max_entradas` mais recentes.
+    """
+
+    def __init__(self, diretorio=".dashboard", max_entradas=8):
+        self.diretorio = diretorio
+        self.max_entradas = max_entradas
+        os.makedirs(diretorio, exist_ok=True)
+        self._caminho_indice = os.path.join(diretorio, "indice.json")
+        self._memoria = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self._caminho_indice, encoding="utf-8") as f:
+                self._indice = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._indice = {}
+
+    def obter(self, chave):
+        """
+        Análise guardada sob `chave`: dict com resultados (DataFrame, com
+        prob_pos/prob_neg/prob_neu para reclassificar), relatorio_padding,
+        novas e reaproveitadas; ou None.
+        """
+        with self._lock:
+            if chave in self._memoria:
+                return self._memoria[chave]
+            if chave not in self._indice:
+                return None
+        try:
+            with open(self._caminho(chave), "rb") as f:
+                entrada = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._memoria[chave] = entrada
+        return entrada
+
+    def pendentes(self, textos, config_modelo):
+        """Quantos textos distintos de `textos` ainda precisam passar pelo modelo."""
+        base = self._linhas_anteriores(config_modelo)
+        hashes = pd.unique(hash_textos(textos))
+        return len(hashes) if base is None else int((~pd.Index(hashes).isin(base.index)).sum())
+
+    def tarefa(self, chave, textos, config_modelo, processar_bloco, tamanho_bloco=1000, relatorio_padding=None):
+        """
+        Cria uma tarefa da FilaJobs (ou para chamar direto com job=None)
+        que pontua só os textos sem resultado na análise anterior da mesma
+        configuração, monta a análise completa na ordem de `textos` e a
+        guarda sob `chave`. Os blocos novos são publicados como parciais.
+        """
+        textos = list(textos)
+
+        def tarefa(job):
+            hashes = hash_textos(textos)
+            base = self._linhas_anteriores(config_modelo)
+            conhecidas = pd.Index(hashes).isin(base.index) if base is not None else np.zeros(len(hashes), bool)
+            novos = list(dict.fromkeys(t for t, c in zip(textos, conhecidas) if not c))
+
+            partes = [] if base is None else [base]
+            for inicio in range(0, len(novos), tamanho_bloco):
+                parcial = processar_bloco(novos[inicio:inicio + tamanho_bloco])
+                parcial.index = hash_textos(parcial["texto_original"].tolist())
+                partes.append(parcial)
+                if job is not None:
+                    feitos = min(inicio + tamanho_bloco, len(novos))
+                    job.reportar(feitos / len(novos), f"{feitos}/{len(novos)} textos novos", parcial)
+
+            if partes:
+                tabela = pd.concat(partes)
+                tabela = tabela[~tabela.index.duplicated(keep="last")]
+                resultados = tabela.loc[hashes].reset_index(drop=True)
+            else:
+                resultados = pd.DataFrame(columns=COLUNAS_RESULTADO)
+            entrada = {
+                "resultados": resultados,
+                "relatorio_padding": dict(relatorio_padding or {}),
+                "novas": len(novos),
+                "reaproveitadas": int(conhecidas.sum()),
+            }
+            self._guardar(chave, config_modelo, entrada)
+            return resultados
+
+        return tarefa
+
+    def _linhas_anteriores(self, config_modelo):
+        # Resultados da análise mais recente da mesma configuração, indexados pelo hash do texto
+        with self._lock:
+            candidatas = [c for c, info in self._indice.items() if info["config_modelo"] == config_modelo]
+        if not candidatas:
+            return None
+        chave = max(candidatas, key=lambda c: self._indice[c]["criado_em"])
+        entrada = self.obter(chave)
+        if entrada is None:
+            return None
+        linhas = entrada["resultados"].copy()
+        linhas.index = hash_textos(linhas["texto_original"].tolist())
+        return linhas[~linhas.index.duplicated()]
+
+    def _guardar(self, chave, config_modelo, entrada):
+        with open(self._caminho(chave), "wb") as f:
+            pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._memoria[chave] = entrada
+            self._indice[chave] = {
+                "config_modelo": config_modelo,
+                "linhas": len(entrada["resultados"]),
+                "criado_em": time.time(),
+            }
+            antigas = sorted(self._indice, key=lambda c: self._indice[c]["criado_em"])[:-self.max_entradas]
+            for antiga in antigas:
+                del self._indice[antiga]
+                self._memoria.pop(antiga, None)
+                try:
+                    os.remove(self._caminho(antiga))
+                except FileNotFoundError:
+                    pass
+            with open(self._caminho_indice, "w", encoding="utf-8") as f:
+                json.dump(self._indice, f)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.pkl")
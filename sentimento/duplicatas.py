@@ -0,0 +1,178 @@
+"""
+Detecção de quase-duplicatas por MinHash + LSH.
+
+Cada texto processado vira um conjunto de shingles de caracteres (n-gramas
+de TAMANHO_SHINGLE letras); a assinatura MinHash de NUM_PERMUTACOES valores
+estima a similaridade de Jaccard entre dois textos. As assinaturas são
+divididas em bandas (LSH): textos que coincidem em alguma banda são
+candidatos, e o candidato mais parecido vira o representante do texto se a
+similaridade de Jaccard dos shingles (exata, não a estimada) atingir o
+limiar. Os representantes são os primeiros textos de cada grupo; só eles
+entram nas bandas, então os grupos não se encadeiam ("a" ~ "b" ~ "c" sem
+"a" ~ "c").
+
+Um índice guarda todos os textos que viu (shingles, grupos e
+representantes) e não descarta nada: deve valer para uma análise (um
+arquivo, um job) e ser liberado com ela, não ser compartilhado por tempo
+indeterminado. Assim os grupos também dependem só dos textos da análise,
+e não de quem pontuou primeiro.
+
+Com prever_com_duplicatas, só os representantes passam pelo modelo e os
+demais textos do grupo recebem as mesmas probabilidades. Textos com
+quantidades diferentes de negações ("gostei" x "nao gostei") nunca são
+agrupados, mesmo que quase todos os shingles coincidam.
+"""
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from sentimento.texto import IndiceStopwords
+
+TAMANHO_SHINGLE = 4
+NUM_PERMUTACOES = 64
+BANDAS = 16
+LIMIAR_PADRAO = 0.8
+
+# Textos calculados por vez (a matriz de hashes tem NUM_PERMUTACOES x shingles)
+TEXTOS_POR_BLOCO = 500
+
+_PRIMO = (1 << 31) - 1
+_NEGACOES = IndiceStopwords.MANTER
+
+
+def shingles(texto, tamanho=TAMANHO_SHINGLE):
+    """N-gramas de caracteres do texto (com um espaço em cada ponta)."""
+    texto = f" {texto} "
+    if len(texto) <= tamanho:
+        return {texto}
+    return {texto[i:i + tamanho] for i in range(len(texto) - tamanho + 1)}
+
+
+def identificador_duplicatas(limiar):
+    """Identificador da configuração de quase-duplicatas com `limiar` (ver IndiceDuplicatas.identificador)."""
+    return f"quase_duplicatas={limiar}"
+
+
+def _negacoes(texto):
+    return sum(palavra in _NEGACOES for palavra in texto.split())
+
+
+class IndiceDuplicatas:
+    """
+    Agrupa textos processados por similaridade de Jaccard dos shingles
+    ≥ `limiar`. Os grupos são numerados na ordem em que aparecem e valem
+    para todos os textos vistos pela instância, que cresce com eles; não
+    depende do modelo.
+    """
+
+    def __init__(self, limiar=LIMIAR_PADRAO, num_permutacoes=NUM_PERMUTACOES, bandas=BANDAS, semente=1):
+        if num_permutacoes % bandas:
+            raise ValueError("num_permutacoes deve ser múltiplo de bandas")
+        self.limiar = limiar
+        self.bandas = bandas
+        self.linhas_banda = num_permutacoes // bandas
+        rng = np.random.default_rng(semente)
+        self._a = rng.integers(1, _PRIMO, num_permutacoes, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, _PRIMO, num_permutacoes, dtype=np.uint64)[:, None]
+        self.representantes = []
+        self.tamanhos = []
+        self._shingles = []
+        self._baldes = [{} for _ in range(bandas)]
+        self._grupo_texto = {}
+        self._lock = threading.Lock()
+
+    @property
+    def identificador(self):
+        """Entra na impressão da configuração (Dashboard, Tendências): os resultados mudam com o limiar."""
+        return identificador_duplicatas(self.limiar)
+
+    def assinaturas(self, conjuntos):
+        """Matriz (conjuntos x permutações) das assinaturas MinHash dos conjuntos de shingles."""
+        partes = []
+        for inicio in range(0, len(conjuntos), TEXTOS_POR_BLOCO):
+            bloco = conjuntos[inicio:inicio + TEXTOS_POR_BLOCO]
+            hashes = np.fromiter(
+                (zlib.crc32(s.encode("utf-8")) % _PRIMO for conjunto in bloco for s in conjunto),
+                dtype=np.uint64,
+            )
+            permutados = (self._a * hashes + self._b) % _PRIMO
+            offsets = np.cumsum([0] + [len(c) for c in bloco[:-1]])
+            partes.append(np.minimum.reduceat(permutados, offsets, axis=1).T.astype(np.uint32))
+        if not partes:
+            return np.empty((0, len(self._a)), dtype=np.uint32)
+        return np.vstack(partes)
+
+    def agrupar(self, textos):
+        """
+        Número do grupo de cada texto, na ordem de entrada. Textos sem grupo
+        parecido abrem um novo, do qual passam a ser o representante.
+        """
+        textos = list(textos)
+        with self._lock:
+            novos = [t for t in dict.fromkeys(textos) if t not in self._grupo_texto]
+        conjuntos = [shingles(t) for t in novos]
+        assinaturas = self.assinaturas(conjuntos)
+        with self._lock:
+            for texto, conjunto, assinatura in zip(novos, conjuntos, assinaturas):
+                if texto not in self._grupo_texto:
+                    self._grupo_texto[texto] = self._inserir(texto, conjunto, assinatura)
+            return np.array([self._grupo_texto[t] for t in textos], dtype=np.int64)
+
+    def _inserir(self, texto, conjunto, assinatura):
+        negacoes = _negacoes(texto)
+        chaves = [
+            (negacoes, assinatura[i * self.linhas_banda:(i + 1) * self.linhas_banda].tobytes())
+            for i in range(self.bandas)
+        ]
+        candidatos = {g for balde, chave in zip(self._baldes, chaves) for g in balde.get(chave, ())}
+        melhor, similaridade = None, self.limiar
+        for grupo in candidatos:
+            representante = self._shingles[grupo]
+            jaccard = len(conjunto & representante) / len(conjunto | representante)
+            if jaccard >= similaridade:
+                melhor, similaridade = grupo, jaccard
+        if melhor is not None:
+            self.tamanhos[melhor] += 1
+            return melhor
+        grupo = len(self.representantes)
+        self.representantes.append(texto)
+        self.tamanhos.append(1)
+        self._shingles.append(conjunto)
+        for balde, chave in zip(self._baldes, chaves):
+            balde.setdefault(chave, []).append(grupo)
+        return grupo
+
+    def grupos(self):
+        """Tabela dos grupos: representante e quantidade de textos distintos de cada um."""
+        with self._lock:
+            return pd.DataFrame({"representante": self.representantes, "textos_distintos": self.tamanhos})
+
+
+def prever_com_duplicatas(textos, prever, indice):
+    """
+    Como prever_com_cache: chama `prever` só para o representante de cada
+    grupo de `textos` e repete as probabilidades dele para os demais.
+    """
+    grupos = indice.agrupar(textos)
+    representantes = list(dict.fromkeys(indice.representantes[g] for g in grupos))
+    probas = dict(zip(representantes, prever(representantes)))
+    return [probas[indice.representantes[g]] for g in grupos]
+
+
+def colapsar_duplicatas(df_resultados, grupos):
+    """
+    Uma linha por grupo de quase-duplicatas dos resultados: primeiro texto
+    do grupo, ocorrências, sentimento mais frequente e confiança média.
+    """
+    df = df_resultados.assign(grupo=grupos)
+    colapsado = df.groupby("grupo", sort=False).agg(
+        texto_original=("texto_original", "first"),
+        texto_processado=("texto_processado", "first"),
+        ocorrencias=("texto_original", "size"),
+        variacoes=("texto_processado", "nunique"),
+        sentimento=("sentimento", lambda s: s.mode().iat[0]),
+        probabilidade=("probabilidade", "mean"),
+    )
+    return colapsado.sort_values("ocorrencias", ascending=False).reset_index()
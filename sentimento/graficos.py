@@ -0,0 +1,92 @@
+"""
+Figuras do app (Plotly e nuvem de palavras), fora do script do Streamlit
+para poderem ser usadas e medidas (benchmarks) isoladamente.
+
+A nuvem de palavras é gerada das frequências de sentimento.termos e
+devolvida como PNG, sem figura do matplotlib; as imagens ficam em cache
+pela impressão das frequências e pelo tamanho. Plotly e WordCloud só são
+importados no primeiro gráfico/nuvem, então as nuvens não dependem do
+Plotly (nem os gráficos do WordCloud).
+"""
+import io
+import threading
+from collections import OrderedDict
+
+from sentimento.metricas import METRICAS
+from sentimento.termos import impressao_frequencias
+
+CORES_SENTIMENTO = {'positivo': '#28a745', 'negativo': '#dc3545', 'incerto': '#ffc107'}
+
+# Nuvens renderizadas mantidas em memória (PNG de algumas dezenas de KB cada)
+MAX_NUVENS_CACHE = 32
+
+_nuvens = OrderedDict()
+_lock_nuvens = threading.Lock()
+
+
+@METRICAS.cronometrar("graficos")
+def criar_grafico_sentimentos(df):
+    """Cria gráfico de pizza com distribuição de sentimentos"""
+    import plotly.express as px
+
+    fig = px.pie(
+        df, 
+        names='sentimento', 
+        title='Distribuição de Sentimentos',
+        color_discrete_map=CORES_SENTIMENTO
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+@METRICAS.cronometrar("graficos")
+def criar_grafico_confianca(df):
+    """Cria histograma de confiança"""
+    import plotly.express as px
+
+    fig = px.histogram(
+        df, 
+        x='probabilidade', 
+        color='sentimento',
+        title='Distribuição de Confiança por Sentimento',
+        nbins=20
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+@METRICAS.cronometrar("wordcloud")
+def renderizar_wordcloud(frequencias, largura=800, altura=400):
+    """Renderiza a nuvem de {termo: ocorrências} e retorna os bytes do PNG."""
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(
+        width=largura,
+        height=altura,
+        background_color='white',
+        colormap='viridis'
+    ).generate_from_frequencies(frequencias)
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def criar_wordcloud(frequencias, largura=800, altura=400):
+    """
+    PNG da nuvem de palavras de {termo: ocorrências} (ver
+    IndiceTermos.frequencias), ou None sem termos. Reaproveita a imagem já
+    renderizada para as mesmas frequências e tamanho.
+    """
+    if not frequencias:
+        return None
+    chave = (impressao_frequencias(frequencias), largura, altura)
+    with _lock_nuvens:
+        if chave in _nuvens:
+            _nuvens.move_to_end(chave)
+            return _nuvens[chave]
+    png = renderizar_wordcloud(frequencias, largura, altura)
+    with _lock_nuvens:
+        _nuvens[chave] = png
+        while len(_nuvens) > MAX_NUVENS_CACHE:
+            _nuvens.popitem(last=False)
+    return png
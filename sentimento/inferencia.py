@@ -0,0 +1,121 @@
+"""
+Inferência em lote com o modelo do pysentimiento.
+
+As funções recebem o analyzer explicitamente para poderem rodar tanto no
+app (analyzer do st.cache_resource) quanto em processos auxiliares, que
+carregam o seu próprio analyzer (ver sentimento.paralelo).
+"""
+import torch
+from pysentimiento import create_analyzer
+from pysentimiento.preprocessing import preprocess_tweet
+
+
+def criar_analyzer(modelo=None):
+    """
+    Analyzer de sentimento em português usado pelo app. `modelo` troca o
+    modelo padrão por outro nome do Hugging Face ou um diretório local.
+    """
+    return create_analyzer(task="sentiment", lang="pt", model_name=modelo)
+
+
+def identificador_modelo(analyzer, max_tokens=128, truncamento="inicio"):
+    """Identifica o modelo e a política de truncamento nas chaves do cache."""
+    # Modelos carregados de um artefato (sentimento.artefato) incluem a versão
+    nome = getattr(analyzer, "identificador", None) or analyzer.model.config._name_or_path
+    return f"{nome}|max_tokens={max_tokens}|truncamento={truncamento}"
+
+
+def tokenizar_com_truncamento(analyzer, textos, max_tokens=128, truncamento="inicio"):
+    """
+    Tokeniza os textos (já pré-processados) sem padding, limitando cada um a
+    `max_tokens` tokens incluindo os especiais. `truncamento` define o que é
+    mantido quando o texto excede o limite: "inicio" ou "fim".
+    Retorna (lista de input_ids, quantidade de textos truncados).
+    """
+    tokenizer = analyzer.tokenizer
+    limite = min(max_tokens, tokenizer.model_max_length)
+    espaco = limite - tokenizer.num_special_tokens_to_add()
+
+    input_ids = []
+    truncados = 0
+    for ids in tokenizer(textos, add_special_tokens=False)["input_ids"]:
+        if len(ids) > espaco:
+            truncados += 1
+            ids = ids[:espaco] if truncamento == "inicio" else ids[len(ids) - espaco:]
+        input_ids.append(tokenizer.build_inputs_with_special_tokens(ids))
+    return input_ids, truncados
+
+
+def prever_probas_lote(analyzer, textos, batch_size=32, max_tokens=128, truncamento="inicio",
+                       agrupar_por_tamanho=True, callback_progresso=None, relatorio=None):
+    """
+    Executa o modelo do pysentimiento em lotes com padding, uma única
+    passagem (forward) por lote. Retorna uma lista de dicts {classe: prob}
+    na ordem de entrada.
+
+    Com `agrupar_por_tamanho`, os textos são ordenados pelo número de tokens
+    antes de formar os lotes, para que cada lote seja preenchido só até o seu
+    maior texto. Se `relatorio` for um dict, ele recebe a eficiência de
+    padding (tokens reais ÷ tokens com padding) do lote executado e da
+    ordem original, para comparação.
+    """
+    args_preprocessamento = getattr(analyzer, "preprocessing_args", {}) or {}
+    idioma = getattr(analyzer, "lang", "pt")
+    id2label = analyzer.model.config.id2label
+    device = analyzer.model.device
+
+    preprocessados = [preprocess_tweet(t, lang=idioma, **args_preprocessamento) for t in textos]
+    input_ids, truncados = tokenizar_com_truncamento(analyzer, preprocessados, max_tokens, truncamento)
+    tamanhos = [len(ids) for ids in input_ids]
+
+    ordem = list(range(len(input_ids)))
+    if agrupar_por_tamanho:
+        ordem.sort(key=tamanhos.__getitem__)
+
+    probas = [None] * len(input_ids)
+    tokens_com_padding = 0
+    with torch.inference_mode():
+        for inicio in range(0, len(ordem), batch_size):
+            indices = ordem[inicio:inicio + batch_size]
+            entradas = analyzer.tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in indices]},
+                padding=True,
+                return_tensors="pt"
+            ).to(device)
+            tokens_com_padding += entradas["input_ids"].numel()
+            logits = analyzer.model(**entradas).logits
+            for i, linha in zip(indices, torch.softmax(logits, dim=-1).tolist()):
+                probas[i] = {id2label[j]: p for j, p in enumerate(linha)}
+            if callback_progresso is not None:
+                callback_progresso(min(inicio + batch_size, len(ordem)), len(ordem))
+
+    if relatorio is not None:
+        tokens_ordem_original = sum(
+            max(tamanhos[inicio:inicio + batch_size]) * len(tamanhos[inicio:inicio + batch_size])
+            for inicio in range(0, len(tamanhos), batch_size)
+        )
+        somar_relatorio_padding(relatorio, {
+            "textos": len(tamanhos),
+            "textos_truncados": truncados,
+            "tokens_reais": sum(tamanhos),
+            "tokens_com_padding": tokens_com_padding,
+            "tokens_com_padding_ordem_original": tokens_ordem_original,
+        })
+    return probas
+
+
+def somar_relatorio_padding(relatorio, parcial):
+    """
+    Acumula as contagens de `parcial` em `relatorio` e recalcula as
+    eficiências (usado também para juntar os relatórios de vários processos).
+    """
+    for chave in ("textos", "textos_truncados", "tokens_reais",
+                  "tokens_com_padding", "tokens_com_padding_ordem_original"):
+        relatorio[chave] = relatorio.get(chave, 0) + parcial[chave]
+    reais = relatorio["tokens_reais"]
+    relatorio["eficiencia"] = reais / relatorio["tokens_com_padding"] if relatorio["tokens_com_padding"] else 1.0
+    relatorio["eficiencia_ordem_original"] = (
+        reais / relatorio["tokens_com_padding_ordem_original"]
+        if relatorio["tokens_com_padding_ordem_original"] else 1.0
+    )
+    return relatorio
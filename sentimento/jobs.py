@@ -0,0 +1,293 @@
+"""
+Fila de jobs em segundo plano para as análises em lote.
+
+Um rerun do Streamlit interrompe o script, mas não as threads da fila: o
+job continua, guarda resultados parciais e, ao terminar, persiste o
+resultado em disco. A interface só consulta o estado pelo ID do job.
+"""
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+NA_FILA = "na_fila"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+CANCELADO = "cancelado"
+ERRO = "erro"
+INTERROMPIDO = "interrompido"
+
+
+class JobCancelado(Exception):
+    """Levantada dentro da tarefa quando o job foi cancelado."""
+
+
+class Job:
+    """
+    Estado de uma tarefa submetida à FilaJobs. A tarefa recebe o próprio
+    job e chama reportar() para atualizar o progresso, publicar resultados
+    parciais e verificar o cancelamento.
+    """
+
+    def __init__(self, id, descricao, estado=NA_FILA, criado_em=None, diretorio=None, sessao=None):
+        self.id = id
+        self.descricao = descricao
+        self.sessao = sessao
+        self.diretorio = diretorio
+        self.estado = estado
+        self.progresso = 0.0
+        self.mensagem = ""
+        self.info = {}
+        self.erro = None
+        self.criado_em = criado_em or time.time()
+        self.iniciado_em = None
+        self.finalizado_em = None
+        self._parciais = []
+        self._cancelar = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self):
+        return self.estado in (NA_FILA, EXECUTANDO)
+
+    @property
+    def cancelamento_pedido(self):
+        return self._cancelar.is_set()
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    def arquivo(self, sufixo):
+        """
+        Caminho de um arquivo do job (ex.: a saída de uma análise em
+        streaming), removido junto com o job por FilaJobs.descartar.
+        """
+        return os.path.join(self.diretorio or tempfile.gettempdir(), f"{self.id}.{sufixo}")
+
+    def reportar(self, progresso=None, mensagem=None, parcial=None, **info):
+        """
+        Atualiza o progresso (0 a 1), a mensagem e informações livres do job;
+        `parcial` (DataFrame) é acrescentado aos resultados parciais.
+        Levanta JobCancelado se o cancelamento foi pedido.
+        """
+        with self._lock:
+            if progresso is not None:
+                self.progresso = min(max(progresso, 0.0), 1.0)
+            if mensagem is not None:
+                self.mensagem = mensagem
+            if parcial is not None:
+                self._parciais.append(parcial)
+            self.info.update(info)
+        if self._cancelar.is_set():
+            raise JobCancelado()
+
+    def parciais(self):
+        """Resultados parciais publicados até agora, num único DataFrame."""
+        with self._lock:
+            parciais = list(self._parciais)
+        return pd.concat(parciais, ignore_index=True) if parciais else pd.DataFrame()
+
+    def como_dict(self):
+        return {
+            "id": self.id,
+            "descricao": self.descricao,
+            "sessao": self.sessao,
+            "estado": self.estado,
+            "progresso": self.progresso,
+            "mensagem": self.mensagem,
+            "erro": self.erro,
+            "criado_em": self.criado_em,
+            "iniciado_em": self.iniciado_em,
+            "finalizado_em": self.finalizado_em,
+        }
+
+
+class FilaJobs:
+    """
+    Executa jobs em `max_simultaneos` threads (1 = um job por vez, os demais
+    aguardam na fila). Resultados e metadados de cada job são gravados em
+    `diretorio`, então jobs concluídos continuam acessíveis após reinícios.
+    De cada sessão (o `sessao` de submeter), só os `max_finalizados` jobs
+    finalizados mais recentes são mantidos, para que os jobs de um usuário
+    não descartem os resultados de outro; jobs finalizados há mais de
+    `max_idade` segundos são descartados, de qualquer sessão. Os arquivos
+    vão junto com o job.
+    """
+
+    def __init__(self, diretorio=".jobs", max_simultaneos=1, max_finalizados=20, max_idade=24 * 3600):
+        self.diretorio = diretorio
+        self.max_finalizados = max_finalizados
+        self.max_idade = max_idade
+        os.makedirs(diretorio, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_simultaneos, thread_name_prefix="job")
+        self._jobs = {}
+        self._resultados = {}
+        self._descartados = set()
+        self._lock = threading.Lock()
+        self._carregar_jobs_anteriores()
+        self._podar()
+
+    def submeter(self, descricao, tarefa, guardar_resultado=True, sessao=None):
+        """
+        Agenda `tarefa(job)` e retorna o Job. O valor retornado pela tarefa é
+        o resultado do job; se ela não retornar nada, o resultado são os
+        parciais publicados. Com `guardar_resultado=False` (a tarefa guarda
+        o resultado por conta própria), resultado() retorna None. `sessao`
+        identifica quem submeteu, para o limite de jobs finalizados.
+        """
+        job = Job(uuid.uuid4().hex[:12], descricao, diretorio=self.diretorio, sessao=sessao)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._salvar_metadados(job)
+        self._executor.submit(self._executar, job, tarefa, guardar_resultado)
+        return job
+
+    def obter(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def listar(self, ids=None):
+        with self._lock:
+            jobs = list(self._jobs.values()) if ids is None else [self._jobs[i] for i in ids if i in self._jobs]
+        return sorted(jobs, key=lambda j: j.criado_em, reverse=True)
+
+    def cancelar(self, job_id):
+        job = self.obter(job_id)
+        if job is not None:
+            job.cancelar()
+
+    def descartar(self, job_id):
+        """
+        Cancela o job e remove o job, o resultado e os arquivos dele
+        (Job.arquivo). Se o job ainda estiver rodando, os arquivos são
+        removidos de novo quando ele terminar.
+        """
+        with self._lock:
+            self._descartados.add(job_id)
+            job = self._jobs.pop(job_id, None)
+            self._resultados.pop(job_id, None)
+        if job is not None:
+            job.cancelar()
+        self._remover_arquivos(job_id)
+
+    def resultado(self, job_id):
+        """Resultado de um job concluído, da memória ou do disco."""
+        with self._lock:
+            if job_id in self._resultados:
+                return self._resultados[job_id]
+        caminho = self._caminho(job_id, "pkl")
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, "rb") as f:
+            resultado = pickle.load(f)
+        with self._lock:
+            self._resultados[job_id] = resultado
+        return resultado
+
+    def _executar(self, job, tarefa, guardar_resultado=True):
+        if job.cancelamento_pedido:
+            job.estado = CANCELADO
+            job.finalizado_em = time.time()
+            self._salvar_metadados(job)
+            return
+
+        job.estado = EXECUTANDO
+        job.iniciado_em = time.time()
+        self._salvar_metadados(job)
+        try:
+            resultado = tarefa(job)
+            if guardar_resultado:
+                if resultado is None:
+                    resultado = job.parciais()
+                with open(self._caminho(job.id, "pkl"), "wb") as f:
+                    pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+                with self._lock:
+                    if job.id not in self._descartados:
+                        self._resultados[job.id] = resultado
+            job.progresso = 1.0
+            job.estado = CONCLUIDO
+        except JobCancelado:
+            job.estado = CANCELADO
+        except Exception as e:
+            job.erro = str(e)
+            job.estado = ERRO
+        job.finalizado_em = time.time()
+        self._salvar_metadados(job)
+        if job.id in self._descartados:
+            self._remover_arquivos(job.id)
+        self._podar()
+
+    def _podar(self):
+        # Descarta os jobs finalizados há mais de max_idade e, de cada sessão,
+        # os que passam dos max_finalizados mais recentes
+        limite = time.time() - self.max_idade
+        with self._lock:
+            finalizados = sorted((j for j in self._jobs.values() if not j.ativo),
+                                 key=lambda j: j.criado_em, reverse=True)
+        por_sessao = {}
+        for job in finalizados:
+            mantidos = por_sessao.setdefault(job.sessao, [])
+            if (job.finalizado_em or job.criado_em) < limite or len(mantidos) >= self.max_finalizados:
+                self.descartar(job.id)
+            else:
+                mantidos.append(job)
+
+    def _caminho(self, job_id, extensao):
+        return os.path.join(self.diretorio, f"{job_id}.{extensao}")
+
+    def _remover_arquivos(self, job_id):
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith(f"{job_id}."):
+                try:
+                    os.remove(os.path.join(self.diretorio, nome))
+                except FileNotFoundError:
+                    pass
+
+    def _salvar_metadados(self, job):
+        if job.id in self._descartados:
+            return
+        with open(self._caminho(job.id, "json"), "w", encoding="utf-8") as f:
+            json.dump(job.como_dict(), f)
+
+    def _carregar_jobs_anteriores(self):
+        for nome in os.listdir(self.diretorio):
+            if not nome.endswith(".json"):
+                continue
+            with open(os.path.join(self.diretorio, nome), encoding="utf-8") as f:
+                dados = json.load(f)
+            job = Job(dados["id"], dados["descricao"], dados["estado"], dados["criado_em"], self.diretorio,
+                      dados.get("sessao"))
+            job.progresso = dados["progresso"]
+            job.mensagem = dados["mensagem"]
+            job.erro = dados["erro"]
+            job.iniciado_em = dados["iniciado_em"]
+            job.finalizado_em = dados["finalizado_em"]
+            # O processo anterior terminou com o job ainda em andamento
+            if job.ativo:
+                job.estado = INTERROMPIDO
+            self._jobs[job.id] = job
+
+
+def tarefa_em_blocos(textos, processar_bloco, tamanho_bloco=1000):
+    """
+    Cria uma tarefa que processa `textos` em blocos, publicando o DataFrame
+    de cada bloco como resultado parcial. O cancelamento é verificado entre
+    os blocos.
+    """
+    textos = list(textos)
+
+    def tarefa(job):
+        total = len(textos)
+        for inicio in range(0, total, tamanho_bloco):
+            parcial = processar_bloco(textos[inicio:inicio + tamanho_bloco])
+            feitos = min(inicio + tamanho_bloco, total)
+            job.reportar(feitos / total, f"{feitos}/{total} textos", parcial)
+        return None
+
+    return tarefa
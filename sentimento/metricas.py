@@ -0,0 +1,158 @@
+"""
+Medição de latência por etapa (limpeza, stop words, inferência, gráficos,
+nuvem de palavras).
+
+Cada etapa tem contadores (chamadas, itens, tempo total) e uma janela das
+últimas medições, de onde saem p50/p95/p99. Desligada, a medição custa
+uma checagem de atributo por chamada. O registro é por processo e
+compartilhado entre as sessões do Streamlit; ligar a medição, não: além
+de `ativo` (o processo todo, ex.: o servidor com --metricas), ela pode ser
+ligada só no contexto atual (a execução do script de uma sessão, um job)
+com ativar_local()/ativado().
+"""
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+QUANTIS = (0.5, 0.95, 0.99)
+
+_NULO = nullcontext()
+
+
+class _Etapa:
+    def __init__(self, max_amostras):
+        self.chamadas = 0
+        self.itens = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.amostras = deque(maxlen=max_amostras)
+
+
+class Metricas:
+    """Registro de latências por etapa. Use medir() ou cronometrar()."""
+
+    def __init__(self, ativo=False, max_amostras=2048):
+        self.ativo = ativo
+        self.max_amostras = max_amostras
+        self._etapas = {}
+        self._lock = threading.Lock()
+        self._ativo_local = contextvars.ContextVar(f"metricas_ativo_{id(self)}", default=False)
+
+    @property
+    def ligado(self):
+        """Se a medição vale aqui: ligada no processo ou no contexto atual."""
+        return self.ativo or self._ativo_local.get()
+
+    def ativar_local(self, ativo=True):
+        """
+        Liga/desliga a medição só no contexto atual (cada thread começa com
+        o seu): no Streamlit, vale para a execução do script da sessão.
+        """
+        self._ativo_local.set(ativo)
+
+    @contextmanager
+    def ativado(self, ativo=True):
+        """Liga/desliga a medição no contexto atual só dentro do bloco (ex.: num job)."""
+        token = self._ativo_local.set(ativo)
+        try:
+            yield
+        finally:
+            self._ativo_local.reset(token)
+
+    def medir(self, etapa, itens=1, ativo=None):
+        """
+        Context manager que mede o bloco como uma chamada de `etapa`. Sem
+        `ativo`, mede se a medição estiver ligada (ver `ligado`).
+        """
+        if not (self.ligado if ativo is None else ativo):
+            return _NULO
+        return self._medir(etapa, itens)
+
+    @contextmanager
+    def _medir(self, etapa, itens):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio, itens)
+
+    def cronometrar(self, etapa):
+        """Decorador: mede cada chamada da função como `etapa`."""
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                if not self.ligado:
+                    return funcao(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    return funcao(*args, **kwargs)
+                finally:
+                    self.registrar(etapa, time.perf_counter() - inicio)
+            return medida
+        return decorador
+
+    def registrar(self, etapa, segundos, itens=1):
+        with self._lock:
+            dados = self._etapas.get(etapa)
+            if dados is None:
+                dados = self._etapas[etapa] = _Etapa(self.max_amostras)
+            dados.chamadas += 1
+            dados.itens += itens
+            dados.total += segundos
+            dados.maximo = max(dados.maximo, segundos)
+            dados.amostras.append(segundos)
+
+    def resumo(self):
+        """{etapa: {chamadas, itens, total_s, media_ms, p50_ms, p95_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            copias = {
+                etapa: (d.chamadas, d.itens, d.total, d.maximo, np.fromiter(d.amostras, float))
+                for etapa, d in self._etapas.items()
+            }
+        resumo = {}
+        for etapa, (chamadas, itens, total, maximo, amostras) in copias.items():
+            quantis = np.quantile(amostras, QUANTIS) * 1000
+            resumo[etapa] = {
+                "chamadas": chamadas,
+                "itens": itens,
+                "total_s": total,
+                "media_ms": total / chamadas * 1000,
+                **{f"p{round(q * 100)}_ms": float(v) for q, v in zip(QUANTIS, quantis)},
+                "max_ms": maximo * 1000,
+            }
+        return resumo
+
+    def como_json(self):
+        return json.dumps(self.resumo(), ensure_ascii=False, indent=2)
+
+    def como_prometheus(self, prefixo="sentimento_etapa"):
+        """Exposição em texto no formato do Prometheus (summary em segundos)."""
+        linhas = [
+            f"# HELP {prefixo}_segundos Latência por etapa do pipeline.",
+            f"# TYPE {prefixo}_segundos summary",
+        ]
+        resumo = self.resumo()
+        for etapa, dados in resumo.items():
+            for q in QUANTIS:
+                valor = dados[f"p{round(q * 100)}_ms"] / 1000
+                linhas.append(f'{prefixo}_segundos{{etapa="{etapa}",quantile="{q}"}} {valor:.9g}')
+            linhas.append(f'{prefixo}_segundos_sum{{etapa="{etapa}"}} {dados["total_s"]:.9g}')
+            linhas.append(f'{prefixo}_segundos_count{{etapa="{etapa}"}} {dados["chamadas"]}')
+        linhas.append(f"# HELP {prefixo}_itens_total Itens (textos) processados por etapa.")
+        linhas.append(f"# TYPE {prefixo}_itens_total counter")
+        for etapa, dados in resumo.items():
+            linhas.append(f'{prefixo}_itens_total{{etapa="{etapa}"}} {dados["itens"]}')
+        return "\n".join(linhas) + "\n"
+
+    def limpar(self):
+        with self._lock:
+            self._etapas.clear()
+
+
+METRICAS = Metricas()
@@ -0,0 +1,95 @@
+"""
+Micro-batching de requisições individuais.
+
+O analyzer é um singleton compartilhado por todas as sessões do Streamlit.
+Em vez de cada clique em "Analisar Sentimento" fazer a sua própria
+passagem pelo modelo, as requisições que chegam dentro de uma janela de
+poucos milissegundos (até `max_lote`) são agrupadas numa única inferência
+em lote, e cada chamador recebe o seu resultado.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_PARAR = object()
+
+
+class MicroBatcher:
+    """
+    Agrupa chamadas concorrentes a `prever_lote(lista_de_textos)`, que deve
+    retornar um resultado por texto, na mesma ordem. Seguro para uso entre
+    threads; a inferência roda numa thread própria.
+    """
+
+    def __init__(self, prever_lote, janela_ms=5.0, max_lote=32):
+        self.janela = janela_ms / 1000
+        self.max_lote = max_lote
+        self.lotes = 0
+        self.itens = 0
+        self._prever_lote = prever_lote
+        self._fila = queue.Queue()
+        self._thread = threading.Thread(target=self._executar, name="microbatcher", daemon=True)
+        self._thread.start()
+
+    def submeter(self, texto):
+        """Enfileira um texto e retorna um Future com o seu resultado."""
+        futuro = Future()
+        self._fila.put((texto, futuro))
+        return futuro
+
+    def prever(self, texto, timeout=None):
+        return self.submeter(texto).result(timeout)
+
+    def prever_muitos(self, textos, timeout=None):
+        futuros = [self.submeter(t) for t in textos]
+        return [f.result(timeout) for f in futuros]
+
+    def estatisticas(self):
+        return {
+            "lotes": self.lotes,
+            "itens": self.itens,
+            "media_por_lote": self.itens / self.lotes if self.lotes else 0.0,
+        }
+
+    def fechar(self):
+        self._fila.put(_PARAR)
+        self._thread.join()
+
+    def _coletar(self, primeiro):
+        # Junta o que chegar até o fim da janela aberta pelo primeiro item
+        lote = [primeiro]
+        limite = time.monotonic() + self.janela
+        while len(lote) < self.max_lote:
+            restante = limite - time.monotonic()
+            try:
+                item = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is _PARAR:
+                self._fila.put(_PARAR)
+                break
+            lote.append(item)
+        return lote
+
+    def _executar(self):
+        while True:
+            item = self._fila.get()
+            if item is _PARAR:
+                return
+            lote = self._coletar(item)
+            lote = [(t, f) for t, f in lote if f.set_running_or_notify_cancel()]
+            if not lote:
+                continue
+            textos = [t for t, _ in lote]
+            futuros = [f for _, f in lote]
+            try:
+                resultados = self._prever_lote(textos)
+            except Exception as e:
+                for futuro in futuros:
+                    futuro.set_exception(e)
+                continue
+            self.lotes += 1
+            self.itens += len(textos)
+            for futuro, resultado in zip(futuros, resultados):
+                futuro.set_result(resultado)
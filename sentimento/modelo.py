@@ -0,0 +1,80 @@
+"""
+Carregamento do modelo, uma única vez por processo.
+
+Os dois front ends (app.py e app_simples.py), a linha de comando e o
+servidor obtêm o analyzer por obter_analyzer(): rodando no mesmo processo,
+compartilham a mesma instância em memória. O torch e o pysentimiento só
+são importados na primeira chamada.
+
+Se existir um artefato de modelo (sentimento.artefato) em
+SENTIMENTO_MODELO_DIR (padrão: modelo_sentimento/), ele é usado sem acesso
+à rede; um artefato inválido interrompe o carregamento em vez de cair no
+download do modelo.
+
+O backend de inferência (fp32, int8 ou onnx; ver sentimento.backends) é
+escolhido por chamada ou pela variável SENTIMENTO_BACKEND; cada backend é
+derivado do analyzer fp32 do mesmo modelo e também criado uma única vez.
+"""
+import os
+import threading
+
+from sentimento.artefato import carregar_artefato, eh_artefato, ler_manifesto
+
+DIRETORIO_ARTEFATO = os.environ.get("SENTIMENTO_MODELO_DIR", "modelo_sentimento")
+BACKEND_PADRAO = os.environ.get("SENTIMENTO_BACKEND", "fp32")
+
+_analyzers = {}
+_lock = threading.Lock()
+
+
+def _resolver(modelo):
+    if modelo is None and eh_artefato(DIRETORIO_ARTEFATO):
+        return DIRETORIO_ARTEFATO
+    return modelo
+
+
+def _carregar(modelo, backend):
+    # Chamado com _lock adquirido
+    analyzer = _analyzers.get((modelo, backend))
+    if analyzer is None:
+        if backend != "fp32":
+            from sentimento.backends import aplicar_backend
+            analyzer = aplicar_backend(_carregar(modelo, "fp32"), backend)
+        elif eh_artefato(modelo):
+            analyzer = carregar_artefato(modelo)
+        else:
+            from sentimento.inferencia import criar_analyzer
+            analyzer = criar_analyzer(modelo)
+        _analyzers[(modelo, backend)] = analyzer
+    return analyzer
+
+
+def obter_analyzer(modelo=None, backend=None):
+    """
+    Analyzer de sentimento do processo para `modelo`: diretório de um
+    artefato, nome do Hugging Face ou None (artefato padrão, se existir;
+    senão o modelo do pysentimiento), executado pelo `backend` (padrão:
+    BACKEND_PADRAO). Criado na primeira chamada e reutilizado depois.
+    """
+    modelo = _resolver(modelo)
+    with _lock:
+        return _carregar(modelo, backend or BACKEND_PADRAO)
+
+
+def obter_manifesto(modelo=None):
+    """Manifesto do artefato que obter_analyzer(modelo) usaria, ou None."""
+    modelo = _resolver(modelo)
+    return ler_manifesto(modelo) if eh_artefato(modelo) else None
+
+
+def carregar_pipeline(modelo=None, backend=None):
+    """
+    SentimentPipeline com os padrões do artefato (threshold do manifesto),
+    ou os padrões do notebook quando não há artefato.
+    """
+    from sentimento.pipeline import SentimentPipeline
+
+    manifesto = obter_manifesto(modelo)
+    if manifesto:
+        return SentimentPipeline(threshold=manifesto["threshold"], backend=backend)
+    return SentimentPipeline(backend=backend)
@@ -0,0 +1,134 @@
+"""
+Pool de processos para inferência em CPU.
+
+Cada processo carrega o seu próprio analyzer uma única vez (no
+initializer) e recebe blocos de textos já limpos. O número de processos e
+o de threads do torch por processo são configuráveis para evitar
+oversubscription: processos × threads não deve passar do número de núcleos.
+A ordem dos resultados é a mesma da entrada.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import torch
+
+from sentimento.inferencia import criar_analyzer, prever_probas_lote, somar_relatorio_padding
+
+# Analyzer do processo auxiliar, criado em _inicializar_processo
+_analyzer = None
+
+
+def _inicializar_processo(threads, fabrica_analyzer):
+    global _analyzer
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    _analyzer = fabrica_analyzer()
+
+
+def _pronto():
+    return os.getpid()
+
+
+def _prever_bloco(textos, batch_size, max_tokens, truncamento, agrupar_por_tamanho):
+    relatorio = {}
+    probas = prever_probas_lote(
+        _analyzer, textos, batch_size, max_tokens, truncamento, agrupar_por_tamanho, relatorio=relatorio
+    )
+    return probas, relatorio
+
+
+# Serializa as trocas do __main__ entre pools criados ao mesmo tempo
+_LOCK_PRINCIPAL = threading.Lock()
+
+
+@contextmanager
+def _sem_script_principal():
+    # Com "spawn", cada processo novo reexecuta o __main__ do pai quando ele
+    # é um script (sob o Streamlit, o próprio app.py). O multiprocessing não
+    # permite escolher o __main__ dos filhos por contexto, então, só enquanto
+    # os processos são criados, o __main__ vira um módulo vazio. Limitação:
+    # a troca vale para o interpretador todo; outra thread que consulte
+    # sys.modules["__main__"] nessa janela (alguns ms por processo) vê o
+    # módulo vazio. Um __main__ instalado por outra thread nesse meio tempo
+    # (o Streamlit troca a cada rerun) não é sobrescrito na restauração.
+    principal = sys.modules["__main__"]
+    if getattr(principal, "__spec__", None) is not None or not getattr(principal, "__file__", None):
+        # Executado com -m ou interativo: os filhos não rodam script nenhum
+        yield
+        return
+    with _LOCK_PRINCIPAL:
+        vazio = types.ModuleType("__main__")
+        sys.modules["__main__"] = vazio
+        try:
+            yield
+        finally:
+            if sys.modules.get("__main__") is vazio:
+                sys.modules["__main__"] = principal
+
+
+class PoolInferencia:
+    """
+    Executor de inferência com `num_processos` processos, cada um com
+    `threads_por_processo` threads do torch. Os textos são divididos em
+    blocos de `tamanho_bloco`; cada bloco é agrupado por tamanho e
+    inferido em lotes dentro do processo.
+    """
+
+    def __init__(self, num_processos=None, threads_por_processo=1, tamanho_bloco=256,
+                 fabrica_analyzer=criar_analyzer):
+        self.threads_por_processo = threads_por_processo
+        self.num_processos = num_processos or max(1, (os.cpu_count() or 1) // threads_por_processo)
+        self.tamanho_bloco = tamanho_bloco
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_processos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_inicializar_processo,
+            initargs=(threads_por_processo, fabrica_analyzer)
+        )
+        # Os processos são criados sob demanda a cada submit; submeter uma
+        # tarefa por processo de uma vez cria todos agora (e já carrega o
+        # modelo em cada um).
+        with _sem_script_principal():
+            futuros = [self._executor.submit(_pronto) for _ in range(self.num_processos)]
+        self.pids = sorted({f.result() for f in futuros})
+
+    def prever_probas(self, textos, batch_size=32, max_tokens=128, truncamento="inicio",
+                      agrupar_por_tamanho=True, callback_progresso=None, relatorio=None):
+        """
+        Mesmo contrato de inferencia.prever_probas_lote, com os blocos
+        distribuídos entre os processos.
+        """
+        textos = list(textos)
+        futuros = [
+            self._executor.submit(
+                _prever_bloco, textos[inicio:inicio + self.tamanho_bloco],
+                batch_size, max_tokens, truncamento, agrupar_por_tamanho
+            )
+            for inicio in range(0, len(textos), self.tamanho_bloco)
+        ]
+        probas = []
+        for futuro in futuros:
+            probas_bloco, parcial = futuro.result()
+            probas.extend(probas_bloco)
+            if relatorio is not None:
+                somar_relatorio_padding(relatorio, parcial)
+            if callback_progresso is not None:
+                callback_progresso(len(probas), len(textos))
+        return probas
+
+    def fechar(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
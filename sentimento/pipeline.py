@@ -0,0 +1,124 @@
+"""
+Pipeline de análise de sentimento compartilhado pelos front ends.
+
+limpeza (NORMALIZADOR) → stop words → classificador, com as etapas de texto
+aplicadas por coluna no lote. Usado pelo app.py, pelo app_simples.py, pela
+linha de comando (sentimento.pontuar) e pelo servidor.
+"""
+import pandas as pd
+
+from sentimento.cache import prever_com_cache
+from sentimento.classificacao import matriz_probas
+from sentimento.duplicatas import prever_com_duplicatas
+from sentimento.metricas import METRICAS
+from sentimento.modelo import obter_analyzer
+from sentimento.resultados import BufferResultados, resultado_texto
+from sentimento.texto import NORMALIZADOR, limpar_texto_completo, obter_stopwords
+
+
+def preprocessar_textos(textos, indice_stopwords=None):
+    """
+    Limpeza + remoção de stop words; retorna a lista de textos processados.
+    Sem `indice_stopwords`, usa as stop words padrão (obter_stopwords).
+    """
+    if indice_stopwords is None:
+        indice_stopwords = obter_stopwords()
+    with METRICAS.medir("limpeza", len(textos)):
+        limpos = NORMALIZADOR.normalizar_serie(pd.Series(textos, dtype=object))
+    with METRICAS.medir("stopwords", len(textos)):
+        return indice_stopwords.remover_serie(limpos).tolist()
+
+
+def pontuar_textos(textos, prever, threshold=0.55, indice_stopwords=None):
+    """
+    Pontua `textos` e retorna um BufferResultados. `prever(processados)`
+    recebe a lista de textos processados e retorna as probabilidades
+    ({classe: prob}) de cada um, na mesma ordem.
+    """
+    textos = list(textos)
+    processados = preprocessar_textos(textos, indice_stopwords)
+    with METRICAS.medir("inferencia", len(textos)):
+        probas = matriz_probas(prever(processados))
+    resultados = BufferResultados(len(textos))
+    resultados.adicionar(textos, processados, probas, threshold)
+    return resultados
+
+
+def prever_probas(textos, batch_size=32, cache=None, max_tokens=128, truncamento="inicio",
+                  pool=None, microbatcher=None, backend=None, duplicatas=None, **kwargs):
+    """
+    Probabilidades por classe de cada texto (já processado), na ordem de
+    entrada. Textos repetidos são inferidos uma única vez; com `cache`,
+    textos já vistos não passam pelo modelo. Com `pool` (PoolInferencia), os
+    textos restantes são divididos entre os processos auxiliares; com
+    `microbatcher`, são agrupados com os de outras requisições (o pool e o
+    micro-batcher devem ter sido criados com o mesmo `backend`). Com
+    `duplicatas` (IndiceDuplicatas), quase-duplicatas reaproveitam a
+    predição do representante do grupo (sem guardá-la no cache). Argumentos extras são repassados
+    para prever_probas_lote.
+    """
+    from sentimento.inferencia import identificador_modelo, prever_probas_lote
+
+    analyzer = obter_analyzer(backend=backend)
+    if microbatcher is not None:
+        prever = microbatcher.prever_muitos
+    elif pool is not None:
+        prever = lambda unicos: pool.prever_probas(unicos, batch_size, max_tokens, truncamento, **kwargs)
+    else:
+        prever = lambda unicos: prever_probas_lote(analyzer, unicos, batch_size, max_tokens, truncamento, **kwargs)
+    modelo_id = identificador_modelo(analyzer, max_tokens, truncamento)
+    prever_exatas = lambda unicos: prever_com_cache(unicos, prever, cache, modelo_id)
+    if duplicatas is None:
+        return prever_exatas(textos)
+    # Só os representantes passam pelo cache (predições exatas); as cópias
+    # para os demais textos do grupo são refeitas a cada análise, porque o
+    # representante depende do índice dela
+    return prever_com_duplicatas(textos, prever_exatas, duplicatas)
+
+
+# Classe SentimentPipeline do notebook
+class SentimentPipeline:
+    def __init__(self, threshold=0.55, backend=None):
+        # Threshold usado quando a chamada não informa um
+        self.threshold = threshold
+        # Backend de inferência (sentimento.backends); None = BACKEND_PADRAO
+        self.backend = backend
+
+    def processar_texto(self, texto, indice_stopwords=None, cache=None, threshold=None, **kwargs):
+        """
+        Processa um único texto; retorna um dict com as chaves de
+        COLUNAS_RESULTADO. Argumentos extras (microbatcher, max_tokens,
+        truncamento) vão para prever_probas.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if indice_stopwords is None:
+            indice_stopwords = obter_stopwords()
+        with METRICAS.medir("limpeza"):
+            texto_limpo = limpar_texto_completo(texto)
+        with METRICAS.medir("stopwords"):
+            texto_sem_stop = indice_stopwords.remover(texto_limpo)
+        with METRICAS.medir("inferencia"):
+            # Mesmo caminho do lote: a política de max_tokens/truncamento vale para todos os front ends
+            probas = prever_probas([texto_sem_stop], 1, cache=cache, backend=self.backend, **kwargs)[0]
+        return resultado_texto(texto, texto_sem_stop, probas, threshold)
+
+    def processar_lote(self, textos, batch_size=32, threshold=None, callback_progresso=None,
+                       indice_stopwords=None, **kwargs):
+        """
+        Processa vários textos de uma vez: limpeza e stop words por coluna,
+        inferência em lotes de `batch_size`. Retorna um BufferResultados
+        (use .para_dataframe()). Argumentos extras (cache, pool, max_tokens,
+        truncamento, agrupar_por_tamanho, relatorio) vão para prever_probas.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        return pontuar_textos(
+            textos,
+            lambda processados: prever_probas(
+                processados, batch_size, callback_progresso=callback_progresso, backend=self.backend, **kwargs
+            ),
+            threshold,
+            indice_stopwords,
+        )
+
+    def processar_dataframe(self, df, coluna="comentario_limpo", batch_size=32, **kwargs):
+        return self.processar_lote(df[coluna].tolist(), batch_size=batch_size, **kwargs).para_dataframe()
@@ -0,0 +1,291 @@
+"""
+Pontuação de arquivos pela linha de comando, sem o Streamlit.
+
+    python -m sentimento.pontuar comments_amazon.csv resultados.parquet --coluna Comentario
+
+A entrada (CSV ou Parquet) é lida em blocos e cada bloco passa pelo mesmo
+pipeline do app (limpeza → stop words → classificador). A saída é CSV ou
+Parquet, conforme a extensão. Após cada bloco um checkpoint é gravado ao
+lado da saída (<saida>.checkpoint.json); rodando o mesmo comando de novo,
+a pontuação continua de onde parou. Parquet exige o pacote pyarrow.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import pandas as pd
+
+from sentimento.artefato import ArtefatoInvalido
+from sentimento.backends import BACKENDS, BackendIndisponivel
+from sentimento.cache import CachePredicoes, prever_com_cache
+from sentimento.modelo import BACKEND_PADRAO, obter_analyzer
+from sentimento.pipeline import pontuar_textos
+from sentimento.streaming import AgregadosLote
+from sentimento.texto import obter_stopwords
+
+EXTENSOES_PARQUET = (".parquet", ".pq")
+
+
+class CheckpointInvalido(Exception):
+    """O checkpoint existente não corresponde à entrada ou à configuração atual."""
+
+
+def eh_parquet(caminho):
+    return str(caminho).lower().endswith(EXTENSOES_PARQUET)
+
+
+def _pyarrow_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Arquivos Parquet exigem o pacote pyarrow (pip install pyarrow)") from None
+    return pq
+
+
+def ler_blocos(caminho, tamanho_bloco=5000, pular=0):
+    """
+    Gera DataFrames de até `tamanho_bloco` linhas do CSV/Parquet em
+    `caminho`, descartando as `pular` primeiras linhas.
+    """
+    if eh_parquet(caminho):
+        arquivo = _pyarrow_parquet().ParquetFile(caminho)
+        blocos = (lote.to_pandas() for lote in arquivo.iter_batches(batch_size=tamanho_bloco))
+    else:
+        blocos = pd.read_csv(caminho, chunksize=tamanho_bloco)
+    for bloco in blocos:
+        if pular >= len(bloco):
+            pular -= len(bloco)
+            continue
+        if pular:
+            bloco = bloco.iloc[pular:]
+            pular = 0
+        yield bloco.reset_index(drop=True)
+
+
+def contar_linhas(caminho):
+    """Total de linhas da entrada, quando conhecido sem ler o arquivo (Parquet)."""
+    if eh_parquet(caminho):
+        return _pyarrow_parquet().ParquetFile(caminho).metadata.num_rows
+    return None
+
+
+class _SaidaCSV:
+    def __init__(self, caminho, bytes_validos):
+        # Descarta o que um bloco interrompido possa ter escrito depois do checkpoint
+        modo = "r+" if bytes_validos else "w"
+        self._arquivo = open(caminho, modo, encoding="utf-8", newline="")
+        self._arquivo.truncate(bytes_validos)
+        self._arquivo.seek(bytes_validos)
+
+    def escrever(self, df, numero):
+        df.to_csv(self._arquivo, header=numero == 0, index=False)
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        return self._arquivo.tell()
+
+    def finalizar(self):
+        self._arquivo.close()
+
+
+class _SaidaParquet:
+    # Um Parquet não aceita anexar depois de fechado: cada bloco vira uma
+    # parte em <saida>.partes/ e as partes são juntadas no final
+    def __init__(self, caminho, blocos_validos):
+        self.caminho = caminho
+        self.diretorio = f"{caminho}.partes"
+        os.makedirs(self.diretorio, exist_ok=True)
+        for nome in os.listdir(self.diretorio):
+            if int(nome.split(".")[0]) >= blocos_validos:
+                os.remove(os.path.join(self.diretorio, nome))
+
+    def _parte(self, numero):
+        return os.path.join(self.diretorio, f"{numero:06d}.parquet")
+
+    def escrever(self, df, numero):
+        df.to_parquet(self._parte(numero), index=False)
+        return None
+
+    def finalizar(self):
+        pq = _pyarrow_parquet()
+        partes = sorted(os.listdir(self.diretorio))
+        escritor = None
+        try:
+            for nome in partes:
+                tabela = pq.read_table(os.path.join(self.diretorio, nome))
+                if escritor is None:
+                    escritor = pq.ParquetWriter(self.caminho, tabela.schema)
+                else:
+                    # Colunas inferidas bloco a bloco (ex.: só nulos num bloco)
+                    tabela = tabela.cast(escritor.schema, safe=False)
+                escritor.write_table(tabela)
+        finally:
+            if escritor is not None:
+                escritor.close()
+        shutil.rmtree(self.diretorio)
+
+
+def _assinatura(entrada, coluna, threshold, modelo_id, indice_stopwords, configuracao):
+    estado = os.stat(entrada)
+    return {
+        "entrada": os.path.abspath(entrada),
+        "tamanho_entrada": estado.st_size,
+        "modificacao_entrada": estado.st_mtime_ns,
+        "coluna": coluna,
+        "threshold": threshold,
+        "modelo": modelo_id,
+        "stopwords": indice_stopwords.impressao,
+        **{f"config_{chave}": valor for chave, valor in sorted((configuracao or {}).items())},
+    }
+
+
+def _gravar_checkpoint(caminho, dados):
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def pontuar_arquivo(entrada, saida, coluna, prever, modelo_id, threshold=0.55, indice_stopwords=None,
+                    tamanho_bloco=5000, retomar=True, log=print, configuracao=None):
+    """
+    Pontua a coluna `coluna` de `entrada` e grava colunas originais +
+    resultados em `saida`. `prever(processados)` retorna as probabilidades
+    de cada texto processado. Com `retomar`, continua a partir do
+    checkpoint de uma execução interrompida; ele só é aceito se a entrada,
+    a coluna, o threshold, `modelo_id`, as stop words efetivas e
+    `configuracao` (dict com as demais opções que mudam a saída, como
+    max_tokens e truncamento) forem os mesmos.
+
+    Retorna um dict com os agregados e as estatísticas de vazão.
+    """
+    if indice_stopwords is None:
+        indice_stopwords = obter_stopwords()
+    caminho_checkpoint = f"{saida}.checkpoint.json"
+    assinatura = _assinatura(entrada, coluna, threshold, modelo_id, indice_stopwords, configuracao)
+    checkpoint = {**assinatura, "linhas": 0, "blocos": 0, "bytes_saida": 0,
+                  "agregados": AgregadosLote().como_dict()}
+    if retomar and os.path.exists(caminho_checkpoint):
+        with open(caminho_checkpoint, encoding="utf-8") as f:
+            anterior = json.load(f)
+        divergentes = [k for k, v in assinatura.items() if anterior.get(k) != v]
+        if divergentes:
+            raise CheckpointInvalido(
+                f"{caminho_checkpoint} não corresponde a esta execução ({', '.join(divergentes)}); "
+                "use --reiniciar para descartá-lo"
+            )
+        checkpoint = anterior
+        log(f"Retomando após {checkpoint['linhas']:,} linhas ({checkpoint['blocos']} blocos)")
+
+    agregados = AgregadosLote.de_dict(checkpoint["agregados"])
+    linhas_retomadas = checkpoint["linhas"]
+    total = contar_linhas(entrada)
+    if eh_parquet(saida):
+        escritor = _SaidaParquet(saida, checkpoint["blocos"])
+    else:
+        escritor = _SaidaCSV(saida, checkpoint["bytes_saida"])
+
+    inicio = time.perf_counter()
+    segundos_pipeline = 0.0
+    for bloco in ler_blocos(entrada, tamanho_bloco, pular=linhas_retomadas):
+        if coluna not in bloco:
+            raise ValueError(f"coluna {coluna!r} não encontrada em {entrada}")
+        inicio_bloco = time.perf_counter()
+        df_resultados = pontuar_textos(bloco[coluna].tolist(), prever, threshold, indice_stopwords).para_dataframe()
+        segundos_pipeline += time.perf_counter() - inicio_bloco
+
+        bytes_saida = escritor.escrever(pd.concat([bloco, df_resultados], axis=1), checkpoint["blocos"])
+        agregados.atualizar(df_resultados)
+        checkpoint["linhas"] += len(bloco)
+        checkpoint["blocos"] += 1
+        checkpoint["bytes_saida"] = bytes_saida
+        checkpoint["agregados"] = agregados.como_dict()
+        _gravar_checkpoint(caminho_checkpoint, checkpoint)
+
+        decorrido = time.perf_counter() - inicio
+        processadas = checkpoint["linhas"] - linhas_retomadas
+        progresso = f" ({checkpoint['linhas'] / total:.1%})" if total else ""
+        log(f"{checkpoint['linhas']:,} linhas{progresso} | {processadas / decorrido:,.1f} textos/s")
+
+    escritor.finalizar()
+    if os.path.exists(caminho_checkpoint):
+        os.remove(caminho_checkpoint)
+
+    segundos = time.perf_counter() - inicio
+    processadas = checkpoint["linhas"] - linhas_retomadas
+    return {
+        "agregados": agregados.como_dict(),
+        "linhas": checkpoint["linhas"],
+        "linhas_nesta_execucao": processadas,
+        "segundos": segundos,
+        "segundos_pipeline": segundos_pipeline,
+        "textos_por_segundo": processadas / segundos if segundos else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entrada", help="CSV ou Parquet de entrada")
+    parser.add_argument("saida", help="arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--coluna", default="Comentario", help="coluna com os textos")
+    parser.add_argument("--threshold", type=float, default=0.55)
+    parser.add_argument("--tamanho-bloco", type=int, default=5000, help="linhas lidas por vez")
+    parser.add_argument("--batch-size", type=int, default=32, help="textos por lote de inferência")
+    parser.add_argument("--max-tokens", type=int, default=128)
+    parser.add_argument("--truncamento", choices=["inicio", "fim"], default="inicio")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_PADRAO, help="backend de inferência")
+    parser.add_argument("--stopwords-extras", default="", help="stop words do domínio, separadas por vírgula")
+    parser.add_argument("--cache-sqlite", help="cache de predições persistente (o mesmo arquivo do app)")
+    parser.add_argument("--reiniciar", action="store_true", help="ignora um checkpoint existente")
+    args = parser.parse_args(argv)
+
+    # Importado aqui para que --help não precise carregar o torch
+    from sentimento.inferencia import identificador_modelo, prever_probas_lote
+
+    extras = [p.strip() for p in args.stopwords_extras.split(",") if p.strip()]
+    indice_stopwords = obter_stopwords().com_palavras(extras) if extras else obter_stopwords()
+    cache = CachePredicoes(caminho_sqlite=args.cache_sqlite) if args.cache_sqlite else None
+
+    inicio = time.perf_counter()
+    try:
+        analyzer = obter_analyzer(backend=args.backend)
+    except (ArtefatoInvalido, BackendIndisponivel) as e:
+        parser.exit(1, f"Erro: {e}\n")
+    print(f"Modelo ({args.backend}) carregado em {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+
+    modelo_id = identificador_modelo(analyzer, args.max_tokens, args.truncamento)
+
+    def prever(processados):
+        return prever_com_cache(
+            processados,
+            lambda unicos: prever_probas_lote(analyzer, unicos, args.batch_size, args.max_tokens, args.truncamento),
+            cache,
+            modelo_id,
+        )
+
+    try:
+        resumo = pontuar_arquivo(
+            args.entrada, args.saida, args.coluna, prever, modelo_id, args.threshold, indice_stopwords,
+            args.tamanho_bloco, retomar=not args.reiniciar,
+            log=lambda mensagem: print(mensagem, file=sys.stderr),
+            configuracao={"max_tokens": args.max_tokens, "truncamento": args.truncamento, "backend": args.backend}
+        )
+    except (CheckpointInvalido, ImportError, ValueError) as e:
+        parser.exit(1, f"Erro: {e}\n")
+
+    agregados = resumo["agregados"]
+    print(f"\n{resumo['linhas']:,} linhas em {args.saida}")
+    print(f"Nesta execução: {resumo['linhas_nesta_execucao']:,} linhas em {resumo['segundos']:.1f}s "
+          f"({resumo['textos_por_segundo']:,.1f} textos/s; pipeline {resumo['segundos_pipeline']:.1f}s)")
+    for sentimento, quantidade in agregados["contagem"].items():
+        print(f"  {sentimento}: {quantidade:,}")
+    print(f"  confiança média: {agregados['media_probabilidade']:.1%}")
+    if cache is not None:
+        estatisticas = cache.estatisticas()
+        print(f"  cache: {estatisticas['taxa_acerto']:.1%} de acerto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Índice dos resultados por produto (Titulo) e por termo de pesquisa
+(Pesquisa).
+
+Para cada valor das colunas indexadas, guarda a contagem por sentimento,
+soma, soma dos quadrados, mínimo e máximo da probabilidade e as posições
+(offsets) das linhas nos resultados. O ranking por negatividade e o
+detalhe de um produto saem do índice e das posições, sem filtrar o
+DataFrame inteiro. Como IndiceTermos, atualizar() indexa só as linhas
+acrescentadas desde a última chamada.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from sentimento.classificacao import CATEGORIAS
+
+COLUNAS_PRODUTO = ("Titulo", "Pesquisa")
+
+# Chave das linhas sem valor na coluna indexada
+SEM_VALOR = "(sem valor)"
+
+_AGREGACOES = {
+    **{sentimento: "sum" for sentimento in CATEGORIAS},
+    "soma_prob": "sum",
+    "soma_quad": "sum",
+    "min_prob": "min",
+    "max_prob": "max",
+}
+
+
+class IndiceProdutos:
+    """
+    Estatísticas e posições das linhas por valor de cada coluna em
+    `colunas` (as que existirem nos dados).
+    """
+
+    def __init__(self, colunas=COLUNAS_PRODUTO):
+        self.colunas = colunas
+        self.linhas = 0
+        self._tabelas = {}
+        self._posicoes = {}
+        self._lock = threading.Lock()
+
+    def atualizar(self, df_origem, df_resultados):
+        """
+        Indexa as linhas novas de `df_resultados`; `df_origem` traz as
+        colunas de produto/pesquisa, alinhado linha a linha com os resultados.
+        """
+        with self._lock:
+            if len(df_resultados) < self.linhas:
+                # Não é continuação do que foi indexado: recomeça
+                self.linhas, self._tabelas, self._posicoes = 0, {}, {}
+            inicio, fim = self.linhas, len(df_resultados)
+            if fim == inicio:
+                return self
+            codigos = pd.Categorical(df_resultados["sentimento"].iloc[inicio:fim], categories=CATEGORIAS).codes
+            prob = df_resultados["probabilidade"].iloc[inicio:fim].to_numpy(dtype=np.float64)
+            bloco = pd.DataFrame({
+                **{sentimento: codigos == i for i, sentimento in enumerate(CATEGORIAS)},
+                "soma_prob": prob,
+                "soma_quad": prob * prob,
+                "min_prob": prob,
+                "max_prob": prob,
+            })
+            for coluna in self.colunas:
+                if coluna not in df_origem.columns:
+                    continue
+                chaves = df_origem[coluna].iloc[inicio:fim].fillna(SEM_VALOR).astype(str).to_numpy()
+                grupos = bloco.groupby(chaves, sort=False)
+                parcial = grupos.agg(_AGREGACOES)
+                atual = self._tabelas.get(coluna)
+                self._tabelas[coluna] = (
+                    parcial if atual is None else pd.concat([atual, parcial]).groupby(level=0).agg(_AGREGACOES)
+                )
+                posicoes = self._posicoes.setdefault(coluna, {})
+                for chave, indices in grupos.indices.items():
+                    posicoes.setdefault(chave, []).append(indices + inicio)
+            self.linhas = fim
+        return self
+
+    @property
+    def dimensoes(self):
+        return [c for c in self.colunas if c in self._tabelas]
+
+    def tabela(self, coluna):
+        """
+        Uma linha por valor de `coluna`: total, contagem e participação de
+        cada sentimento, confiança média, desvio-padrão, mínima e máxima.
+        """
+        with self._lock:
+            base = self._tabelas[coluna]
+        total = base[list(CATEGORIAS)].sum(axis=1)
+        media = base["soma_prob"] / total
+        tabela = pd.DataFrame({"total": total})
+        for sentimento in CATEGORIAS:
+            tabela[sentimento] = base[sentimento]
+            tabela[f"pct_{sentimento}"] = base[sentimento] / total
+        tabela["confianca_media"] = media
+        tabela["confianca_desvio"] = np.sqrt((base["soma_quad"] / total - media ** 2).clip(lower=0))
+        tabela["confianca_min"] = base["min_prob"]
+        tabela["confianca_max"] = base["max_prob"]
+        return tabela
+
+    def ranking_negatividade(self, coluna, minimo_textos=1):
+        """tabela() dos valores com ao menos `minimo_textos` textos, do mais negativo ao menos."""
+        tabela = self.tabela(coluna)
+        tabela = tabela[tabela["total"] >= minimo_textos]
+        return tabela.sort_values(["pct_negativo", "negativo"], ascending=False)
+
+    def posicoes(self, coluna, chave):
+        """Posições (iloc) das linhas de `chave` nos resultados."""
+        with self._lock:
+            partes = self._posicoes.get(coluna, {}).get(chave, [])
+            return np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
@@ -0,0 +1,109 @@
+"""
+Buffer colunar para os resultados da análise em lote.
+
+Em vez de um dict (com datetime.now()) por texto acumulado numa lista, os
+resultados ficam em arrays NumPy pré-alocados: probabilidades em float32,
+sentimento como código int8 e um timestamp int64 (epoch em ns) por lote.
+para_dataframe monta o DataFrame sobre esses mesmos arrays, sem copiar os
+textos nem as probabilidades.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from sentimento.classificacao import CATEGORIAS, COLUNAS_PROBAS, decidir_codigos, decidir_sentimento
+
+# Esquema dos resultados: chaves do dict de um texto (resultado_texto) e
+# colunas do DataFrame em lote (BufferResultados.para_dataframe), na ordem
+COLUNAS_RESULTADO = (
+    "texto_original",
+    "texto_processado",
+    "sentimento",
+    "probabilidade",
+    "prob_pos",
+    "prob_neg",
+    "prob_neu",
+    "timestamp",
+)
+
+
+def resultado_texto(texto_original, texto_processado, probas, threshold=0.55, timestamp=None):
+    """Resultado de um único texto a partir das probabilidades {classe: prob}."""
+    sentimento, probabilidade = decidir_sentimento(probas, threshold)
+    resultado = {
+        "texto_original": texto_original,
+        "texto_processado": texto_processado,
+        "sentimento": sentimento,
+        "probabilidade": probabilidade,
+    }
+    for classe, coluna in COLUNAS_PROBAS.items():
+        resultado[coluna] = probas[classe]
+    resultado["timestamp"] = timestamp if timestamp is not None else datetime.now()
+    return resultado
+
+
+class BufferResultados:
+    """
+    Resultados de até `capacidade` textos, preenchidos em blocos com
+    adicionar(). As colunas do DataFrame final seguem COLUNAS_RESULTADO.
+    """
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.tamanho = 0
+        self.texto_original = np.empty(capacidade, dtype=object)
+        self.texto_processado = np.empty(capacidade, dtype=object)
+        self.prob_pos = np.empty(capacidade, dtype=np.float32)
+        self.prob_neg = np.empty(capacidade, dtype=np.float32)
+        self.prob_neu = np.empty(capacidade, dtype=np.float32)
+        self.codigo_sentimento = np.empty(capacidade, dtype=np.int8)
+        self.probabilidade = np.empty(capacidade, dtype=np.float32)
+        self.timestamp = np.empty(capacidade, dtype=np.int64)
+
+    def __len__(self):
+        return self.tamanho
+
+    def adicionar(self, textos_originais, textos_processados, probas, threshold=0.55, timestamp=None):
+        """
+        Acrescenta um bloco de resultados. `probas` é uma matriz (n, 3) com
+        as colunas POS, NEG, NEU. Todo o bloco recebe o mesmo timestamp
+        (hora local, como o datetime.now() do processar_texto).
+        """
+        n = len(probas)
+        inicio, fim = self.tamanho, self.tamanho + n
+        if fim > self.capacidade:
+            raise ValueError(f"Buffer cheio: capacidade {self.capacidade}, necessário {fim}")
+
+        self.texto_original[inicio:fim] = textos_originais
+        self.texto_processado[inicio:fim] = textos_processados
+        self.prob_pos[inicio:fim] = probas[:, 0]
+        self.prob_neg[inicio:fim] = probas[:, 1]
+        self.prob_neu[inicio:fim] = probas[:, 2]
+        self.codigo_sentimento[inicio:fim], self.probabilidade[inicio:fim] = decidir_codigos(
+            probas[:, 0], probas[:, 1], probas[:, 2], threshold
+        )
+        if timestamp is None:
+            timestamp = np.datetime64(datetime.now(), "ns").astype(np.int64)
+        self.timestamp[inicio:fim] = timestamp
+        self.tamanho = fim
+
+    def para_dataframe(self):
+        """
+        DataFrame com visões (sem cópia) dos arrays do buffer. Só os códigos
+        int8 do sentimento são copiados pelo Categorical.
+        """
+        n = self.tamanho
+        return pd.DataFrame(
+            {
+                "texto_original": self.texto_original[:n],
+                "texto_processado": self.texto_processado[:n],
+                "sentimento": pd.Categorical.from_codes(self.codigo_sentimento[:n], CATEGORIAS),
+                "probabilidade": self.probabilidade[:n],
+                "prob_pos": self.prob_pos[:n],
+                "prob_neg": self.prob_neg[:n],
+                "prob_neu": self.prob_neu[:n],
+                "timestamp": self.timestamp[:n].view("datetime64[ns]"),
+            },
+            copy=False
+        )
@@ -0,0 +1,262 @@
+"""
+Servidor HTTP local de análise de sentimento.
+
+    python -m sentimento.servidor --porta 8000
+
+Um único modelo por processo; todas as requisições passam pelo mesmo
+MicroBatcher, então textos de conexões diferentes que chegam juntos são
+inferidos no mesmo lote. Conexões HTTP/1.1 são mantidas abertas
+(keep-alive) entre requisições.
+
+    POST /analisar        {"texto": "...", "threshold": 0.55}
+    POST /analisar/lote   {"textos": ["...", ...], "threshold": 0.55}
+    GET  /saude           (processo no ar + estado do modelo e tempos de aquecimento)
+    GET  /pronto          (200 com o modelo aquecido, 503 antes disso)
+    GET  /metricas        (latência por etapa, formato Prometheus; requer --metricas)
+
+A porta é aberta logo na subida; o modelo carrega e é aquecido em segundo
+plano (sentimento.aquecimento) e, até ficar pronto, as rotas de análise
+respondem 503. Use /pronto como readiness check do balanceador.
+
+Cada resultado traz o sentimento, a probabilidade de decisão, as
+probabilidades de todas as classes e os tempos da requisição em ms
+(também no cabeçalho Server-Timing).
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sentimento.aquecimento import ESTADO_MODELO, iniciar_aquecimento
+from sentimento.artefato import ArtefatoInvalido
+from sentimento.cache import CachePredicoes, prever_com_cache
+from sentimento.backends import BACKENDS
+from sentimento.modelo import BACKEND_PADRAO, obter_analyzer, obter_manifesto
+from sentimento.classificacao import COLUNAS_PROBAS, decidir_sentimento
+from sentimento.metricas import METRICAS
+from sentimento.microbatch import MicroBatcher
+from sentimento.pipeline import preprocessar_textos
+
+# Limite de textos por requisição em /analisar/lote
+MAX_TEXTOS_LOTE = 10_000
+
+
+class RequisicaoInvalida(Exception):
+    """Corpo da requisição ausente ou mal formado (resposta 400)."""
+
+
+class ModeloIndisponivel(Exception):
+    """Modelo ainda carregando/aquecendo ou com falha (resposta 503)."""
+
+
+class ServicoSentimento:
+    """
+    Pré-processamento + micro-batching + decisão, independente do HTTP.
+    `prever_lote(processados)` retorna as probabilidades de cada texto.
+    Com `estado` (EstadoModelo), analisar() recusa textos até o modelo
+    ficar pronto.
+    """
+
+    def __init__(self, prever_lote, modelo_id, threshold=0.55, indice_stopwords=None,
+                 janela_ms=5.0, max_lote=32, cache=None, estado=None):
+        self.modelo_id = modelo_id
+        self.estado = estado
+        self.threshold = threshold
+        self.indice_stopwords = indice_stopwords
+        self.cache = cache
+        self.microbatcher = MicroBatcher(prever_lote, janela_ms, max_lote)
+        self.requisicoes = 0
+        self.textos = 0
+        self._lock = threading.Lock()
+
+    def analisar(self, textos, threshold=None):
+        """Retorna (resultados, tempos_ms) para a lista de textos."""
+        if not self.pronto:
+            raise ModeloIndisponivel(self.estado.erro or self.estado.mensagem)
+        threshold = self.threshold if threshold is None else threshold
+        inicio = time.perf_counter()
+        processados = preprocessar_textos(textos, self.indice_stopwords)
+        pre = time.perf_counter()
+        with METRICAS.medir("inferencia", len(processados)):
+            probas = prever_com_cache(processados, self.microbatcher.prever_muitos, self.cache, self.modelo_id)
+        inferencia = time.perf_counter()
+
+        resultados = []
+        for texto_processado, p in zip(processados, probas):
+            sentimento, probabilidade = decidir_sentimento(p, threshold)
+            resultados.append({
+                "sentimento": sentimento,
+                "probabilidade": probabilidade,
+                "probas": {coluna: p[classe] for classe, coluna in COLUNAS_PROBAS.items()},
+                "texto_processado": texto_processado,
+            })
+        fim = time.perf_counter()
+
+        with self._lock:
+            self.requisicoes += 1
+            self.textos += len(textos)
+        tempos = {
+            "preprocessamento": (pre - inicio) * 1000,
+            "inferencia": (inferencia - pre) * 1000,
+            "decisao": (fim - inferencia) * 1000,
+            "total": (fim - inicio) * 1000,
+        }
+        return resultados, tempos
+
+    @property
+    def pronto(self):
+        return self.estado is None or self.estado.pronto
+
+    def estatisticas(self):
+        return {
+            "modelo": self.estado.como_dict() if self.estado is not None else None,
+            "requisicoes": self.requisicoes,
+            "textos": self.textos,
+            "microlotes": self.microbatcher.estatisticas(),
+            "cache": self.cache.estatisticas() if self.cache is not None else None,
+        }
+
+    def fechar(self):
+        self.microbatcher.fechar()
+
+
+class ManipuladorSentimento(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo saem em escritas separadas; com o Nagle ligado a
+    # segunda espera o ACK atrasado do cliente (~40 ms por resposta)
+    disable_nagle_algorithm = True
+    servico = None  # definido por criar_servidor
+
+    def do_GET(self):
+        if self.path == "/saude":
+            self._responder(200, {"status": "ok", **self.servico.estatisticas()})
+        elif self.path == "/pronto":
+            modelo = self.servico.estado.como_dict() if self.servico.estado is not None else None
+            self._responder(200 if self.servico.pronto else 503, {"pronto": self.servico.pronto, "modelo": modelo})
+        elif self.path == "/metricas":
+            self._enviar(200, METRICAS.como_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._responder(404, {"erro": f"rota não encontrada: {self.path}"})
+
+    def do_POST(self):
+        try:
+            corpo = self._ler_json()
+            threshold = corpo.get("threshold")
+            # bool é subclasse de int: true/false não são thresholds
+            if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, (int, float))):
+                raise RequisicaoInvalida("'threshold' deve ser um número")
+            if self.path == "/analisar":
+                texto = corpo.get("texto")
+                if not isinstance(texto, str):
+                    raise RequisicaoInvalida("campo 'texto' (string) obrigatório")
+                resultados, tempos = self.servico.analisar([texto], threshold)
+                resposta = {**resultados[0], "tempo_ms": tempos}
+            elif self.path == "/analisar/lote":
+                textos = corpo.get("textos")
+                if not isinstance(textos, list) or not all(isinstance(t, str) for t in textos):
+                    raise RequisicaoInvalida("campo 'textos' (lista de strings) obrigatório")
+                if len(textos) > MAX_TEXTOS_LOTE:
+                    raise RequisicaoInvalida(f"no máximo {MAX_TEXTOS_LOTE} textos por requisição")
+                resultados, tempos = self.servico.analisar(textos, threshold)
+                resposta = {"resultados": resultados, "tempo_ms": tempos}
+            else:
+                self._responder(404, {"erro": f"rota não encontrada: {self.path}"})
+                return
+        except RequisicaoInvalida as e:
+            self._responder(400, {"erro": str(e)})
+            return
+        except ModeloIndisponivel as e:
+            self._responder(503, {"erro": f"modelo indisponível: {e}"})
+            return
+        except Exception as e:
+            self._responder(500, {"erro": f"{type(e).__name__}: {e}"})
+            return
+        self._responder(200, resposta, tempos)
+
+    def _ler_json(self):
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        try:
+            corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+        except ValueError:
+            raise RequisicaoInvalida("corpo não é um JSON válido") from None
+        if not isinstance(corpo, dict):
+            raise RequisicaoInvalida("o corpo deve ser um objeto JSON")
+        return corpo
+
+    def _responder(self, status, dados, tempos=None):
+        self._enviar(status, json.dumps(dados, ensure_ascii=False).encode("utf-8"),
+                     "application/json; charset=utf-8", tempos)
+
+    def _enviar(self, status, corpo, tipo, tempos=None):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        if tempos:
+            self.send_header("Server-Timing", ", ".join(f"{k};dur={v:.2f}" for k, v in tempos.items()))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        # Sem log por requisição: atrapalha os testes de carga
+        pass
+
+
+def criar_servidor(servico, endereco="127.0.0.1", porta=8000):
+    """ThreadingHTTPServer (uma thread por conexão) servindo `servico`."""
+    manipulador = type("Manipulador", (ManipuladorSentimento,), {"servico": servico})
+    servidor = ThreadingHTTPServer((endereco, porta), manipulador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endereco", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--threshold", type=float, help="padrão: o do manifesto do artefato, ou 0.55")
+    parser.add_argument("--janela-ms", type=float, default=5.0, help="janela do micro-lote")
+    parser.add_argument("--max-lote", type=int, default=32, help="máximo de textos por micro-lote")
+    parser.add_argument("--max-tokens", type=int, default=128)
+    parser.add_argument("--truncamento", choices=["inicio", "fim"], default="inicio")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_PADRAO, help="backend de inferência")
+    parser.add_argument("--cache-sqlite", help="cache de predições persistente (o mesmo arquivo do app)")
+    parser.add_argument("--metricas", action="store_true", help="mede a latência por etapa (GET /metricas)")
+    args = parser.parse_args(argv)
+    METRICAS.ativo = args.metricas
+    if args.threshold is None:
+        try:
+            manifesto = obter_manifesto()
+        except ArtefatoInvalido as e:
+            parser.exit(1, f"Erro: {e}\n")
+        args.threshold = manifesto["threshold"] if manifesto else 0.55
+
+    from sentimento.inferencia import identificador_modelo, prever_probas_lote
+
+    servico = ServicoSentimento(
+        lambda textos: prever_probas_lote(obter_analyzer(backend=args.backend), textos, args.max_lote, args.max_tokens, args.truncamento),
+        None,
+        args.threshold,
+        janela_ms=args.janela_ms,
+        max_lote=args.max_lote,
+        cache=CachePredicoes(caminho_sqlite=args.cache_sqlite),
+        estado=ESTADO_MODELO,
+    )
+
+    def ao_carregar(analyzer):
+        servico.modelo_id = identificador_modelo(analyzer, args.max_tokens, args.truncamento)
+
+    servidor = criar_servidor(servico, args.endereco, args.porta)
+    iniciar_aquecimento(backend=args.backend, max_tokens=args.max_tokens, truncamento=args.truncamento, ao_carregar=ao_carregar)
+    print(f"Servindo em http://{args.endereco}:{args.porta} (modelo carregando; veja GET /pronto)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servico.fechar()
+
+
+if __name__ == "__main__":
+    main()
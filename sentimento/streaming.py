@@ -0,0 +1,169 @@
+"""
+Pontuação de CSVs grandes em blocos.
+
+O arquivo é lido com pd.read_csv(chunksize=...), cada bloco passa pelo
+pipeline e o resultado é anexado a um CSV temporário em disco. Em memória
+ficam apenas o bloco atual e os agregados acumulados, então o pico de
+memória não depende do tamanho do arquivo. Como job, um upload em memória
+é copiado para o disco e lido de lá, em vez de duplicado em memória.
+"""
+import math
+import os
+import tempfile
+
+import pandas as pd
+
+from sentimento.classificacao import CATEGORIAS
+
+
+class AgregadosLote:
+    """Contagem por sentimento e estatísticas de confiança acumuladas bloco a bloco."""
+
+    def __init__(self):
+        self.total = 0
+        self.contagem = dict.fromkeys(CATEGORIAS, 0)
+        self.soma_probabilidade = 0.0
+        self.min_probabilidade = math.inf
+        self.max_probabilidade = -math.inf
+
+    def atualizar(self, df_resultados):
+        if df_resultados.empty:
+            return
+        self.total += len(df_resultados)
+        for sentimento, quantidade in df_resultados["sentimento"].value_counts().items():
+            self.contagem[sentimento] = self.contagem.get(sentimento, 0) + int(quantidade)
+        probabilidade = df_resultados["probabilidade"]
+        self.soma_probabilidade += float(probabilidade.sum())
+        self.min_probabilidade = min(self.min_probabilidade, float(probabilidade.min()))
+        self.max_probabilidade = max(self.max_probabilidade, float(probabilidade.max()))
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Reconstrói os agregados a partir de como_dict() (ex.: de um checkpoint)."""
+        agregados = cls()
+        agregados.total = dados["total"]
+        agregados.contagem.update(dados["contagem"])
+        agregados.soma_probabilidade = dados["media_probabilidade"] * dados["total"]
+        if dados["total"]:
+            agregados.min_probabilidade = dados["min_probabilidade"]
+            agregados.max_probabilidade = dados["max_probabilidade"]
+        return agregados
+
+    @property
+    def media_probabilidade(self):
+        return self.soma_probabilidade / self.total if self.total else 0.0
+
+    def como_dict(self):
+        return {
+            "total": self.total,
+            "contagem": dict(self.contagem),
+            "media_probabilidade": self.media_probabilidade,
+            "min_probabilidade": self.min_probabilidade if self.total else 0.0,
+            "max_probabilidade": self.max_probabilidade if self.total else 0.0,
+        }
+
+
+def pontuar_csv_em_blocos(arquivo, coluna, processar_bloco, tamanho_bloco=5000, limite_linhas=None,
+                          caminho_saida=None, callback_progresso=None, linhas_amostra=100):
+    """
+    Lê `arquivo` (caminho ou objeto de arquivo) em blocos de `tamanho_bloco`
+    linhas e chama `processar_bloco(lista_de_textos)` para cada um; a função
+    deve retornar o DataFrame de resultados do bloco. Colunas originais +
+    resultados são anexadas a `caminho_saida` (por padrão um arquivo
+    temporário).
+
+    `callback_progresso(fracao, agregados)` é chamado após cada bloco, com a
+    fração do arquivo já lida (estimada pela posição em bytes) quando o
+    arquivo permite, ou None.
+
+    Retorna (caminho_saida, agregados, amostra), onde amostra são as
+    primeiras `linhas_amostra` linhas da saída.
+    """
+    temporario = caminho_saida is None
+    if temporario:
+        descritor, caminho_saida = tempfile.mkstemp(prefix="analise_sentimento_", suffix=".csv")
+        os.close(descritor)
+
+    tamanho_total = _tamanho_em_bytes(arquivo)
+    agregados = AgregadosLote()
+    amostra = []
+    linhas_na_amostra = 0
+
+    leitor = pd.read_csv(arquivo, chunksize=tamanho_bloco, nrows=limite_linhas)
+    try:
+        with open(caminho_saida, "w", encoding="utf-8", newline="") as saida:
+            for numero, bloco in enumerate(leitor):
+                df_resultados = processar_bloco(bloco[coluna].tolist())
+                df_bloco = pd.concat([bloco.reset_index(drop=True), df_resultados], axis=1)
+                df_bloco.to_csv(saida, header=numero == 0, index=False)
+
+                agregados.atualizar(df_resultados)
+                if linhas_na_amostra < linhas_amostra:
+                    amostra.append(df_bloco.head(linhas_amostra - linhas_na_amostra))
+                    linhas_na_amostra += len(amostra[-1])
+
+                if callback_progresso is not None:
+                    fracao = None
+                    if tamanho_total and hasattr(arquivo, "tell"):
+                        fracao = min(arquivo.tell() / tamanho_total, 1.0)
+                    callback_progresso(fracao, agregados)
+    except BaseException:
+        # Interrompido (erro ou cancelamento): não deixa o temporário para trás
+        if temporario and os.path.exists(caminho_saida):
+            os.remove(caminho_saida)
+        raise
+
+    amostra = pd.concat(amostra, ignore_index=True) if amostra else pd.DataFrame()
+    return caminho_saida, agregados, amostra
+
+
+def _tamanho_em_bytes(arquivo):
+    if isinstance(arquivo, (str, os.PathLike)):
+        return os.path.getsize(arquivo)
+    tamanho = getattr(arquivo, "size", None)
+    if tamanho is None and hasattr(arquivo, "seek"):
+        posicao = arquivo.tell()
+        tamanho = arquivo.seek(0, os.SEEK_END)
+        arquivo.seek(posicao)
+    return tamanho
+
+
+def tarefa_pontuar_csv(arquivo, coluna, processar_bloco, **kwargs):
+    """
+    Tarefa para a FilaJobs (sentimento.jobs) que executa
+    pontuar_csv_em_blocos, publicando o progresso e os agregados parciais
+    em job.info["agregados"]. O resultado do job é um dict com caminho,
+    agregados e amostra; a saída é um arquivo do job (Job.arquivo),
+    removido com FilaJobs.descartar.
+
+    Um `arquivo` em memória (o UploadedFile do Streamlit, BytesIO) é
+    gravado no disco do job e lido de lá: não é copiado em memória e a
+    leitura não disputa a posição do arquivo com os reruns da página.
+    """
+    def tarefa(job):
+        def reportar(fracao, agregados):
+            job.reportar(fracao, f"{agregados.total} textos", agregados=agregados.como_dict())
+
+        leitura = arquivo
+        if hasattr(arquivo, "getbuffer"):
+            entrada = job.arquivo("entrada.csv")
+            with open(entrada, "wb") as f, arquivo.getbuffer() as dados:
+                f.write(dados)
+            leitura = open(entrada, "rb")
+        opcoes = {"caminho_saida": job.arquivo("resultado.csv"), **kwargs}
+        try:
+            caminho, agregados, amostra = pontuar_csv_em_blocos(
+                leitura, coluna, processar_bloco, callback_progresso=reportar, **opcoes
+            )
+        except BaseException:
+            # Cancelado ou com erro: a saída incompleta não serve para download
+            if os.path.exists(opcoes["caminho_saida"]):
+                os.remove(opcoes["caminho_saida"])
+            raise
+        finally:
+            if leitura is not arquivo:
+                leitura.close()
+                os.remove(entrada)
+        return {"caminho": caminho, "agregados": agregados.como_dict(), "amostra": amostra}
+
+    return tarefa
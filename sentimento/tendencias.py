@@ -0,0 +1,211 @@
+"""
+Agregados temporais dos sentimentos para o modo Tendências.
+
+ArmazemTendencias guarda, por dia, semana e mês, a contagem de textos e a
+soma das probabilidades de cada sentimento. Cada lote pontuado é agregado
+com np.bincount e somado aos períodos existentes; as consultas (série por
+período, janela móvel, comparação com o período anterior) trabalham só
+sobre essas tabelas de períodos, então o custo não depende do número de
+textos já registrados. O agregado diário é persistido em CSV e os
+semanais/mensais são refeitos a partir dele ao carregar.
+
+As datas são as da análise (quando cada texto foi pontuado), não as dos
+comentários. Um lote registrado com `chave` (impressão do conteúdo e da
+configuração do modelo) só é somado uma vez: reanalisar o mesmo arquivo,
+ou o mesmo lote com outro threshold, não conta os textos de novo. As
+MAX_LOTES chaves mais recentes ficam num arquivo ao lado do CSV; um lote
+mais antigo que isso volta a ser contado se for registrado de novo.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from sentimento.classificacao import CATEGORIAS
+
+# Granularidade → frequência dos períodos (início de cada período)
+GRANULARIDADES = {"D": "D", "W": "W-MON", "M": "MS"}
+
+COLUNAS_CONTAGEM = [f"n_{s}" for s in CATEGORIAS]
+COLUNAS_SOMA = [f"soma_prob_{s}" for s in CATEGORIAS]
+
+# Chaves de lotes lembradas para não registrar o mesmo lote duas vezes
+MAX_LOTES = 10_000
+
+
+def _vazio():
+    return pd.DataFrame(columns=COLUNAS_CONTAGEM + COLUNAS_SOMA, index=pd.DatetimeIndex([]), dtype=float)
+
+
+def _inicio_periodo(indice, granularidade):
+    if granularidade == "D":
+        return indice
+    return indice.to_period("W" if granularidade == "W" else "M").start_time
+
+
+def _metricas(base):
+    """Contagens e somas por período → contagem, participação e confiança média por sentimento."""
+    contagens = base[COLUNAS_CONTAGEM].to_numpy()
+    somas = base[COLUNAS_SOMA].to_numpy()
+    total = contagens.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dados = {"total": total, "confianca_media": somas.sum(axis=1) / total}
+        for i, sentimento in enumerate(CATEGORIAS):
+            dados[sentimento] = contagens[:, i]
+            dados[f"pct_{sentimento}"] = contagens[:, i] / total
+            dados[f"confianca_{sentimento}"] = somas[:, i] / contagens[:, i]
+    return pd.DataFrame(dados, index=base.index)
+
+
+class ArmazemTendencias:
+    """
+    Agregados diários/semanais/mensais por sentimento, atualizados a cada
+    registrar(). Com `caminho`, o agregado diário é lido e gravado em CSV
+    e as chaves dos `max_lotes` lotes registrados mais recentes, em
+    `caminho` + ".lotes".
+    """
+
+    def __init__(self, caminho=None, max_lotes=MAX_LOTES):
+        self.caminho = caminho
+        self.max_lotes = max_lotes
+        self.registros = 0
+        self._lock = threading.Lock()
+        self._agregados = {g: _vazio() for g in GRANULARIDADES}
+        # Chaves em ordem de registro (dict ordenado), e linhas no arquivo
+        self._lotes = {}
+        self._linhas_lotes = 0
+        if caminho and os.path.exists(caminho):
+            diario = pd.read_csv(caminho, index_col=0, parse_dates=True)
+            self._somar(diario)
+            self.registros = int(diario[COLUNAS_CONTAGEM].to_numpy().sum())
+        if caminho and os.path.exists(caminho + ".lotes"):
+            with open(caminho + ".lotes", encoding="utf-8") as f:
+                chaves = f.read().split()
+            self._lotes = dict.fromkeys(chaves[-max_lotes:])
+            self._linhas_lotes = len(chaves)
+
+    def registrar(self, datas, sentimentos, probabilidades, chave=None):
+        """
+        Soma um lote de resultados (data/hora, sentimento e probabilidade de
+        cada texto). Um lote com `chave` já registrada é ignorado.
+        """
+        if chave is not None and chave in self._lotes:
+            return self
+        dias = np.asarray(pd.to_datetime(datas), dtype="datetime64[D]")
+        codigos = pd.Categorical(sentimentos, categories=CATEGORIAS).codes.astype(np.int64)
+        probabilidades = np.asarray(probabilidades, dtype=np.float64)
+        validos = codigos >= 0
+        if not validos.any():
+            return self
+        dias, codigos, probabilidades = dias[validos], codigos[validos], probabilidades[validos]
+
+        primeiro = dias.min()
+        deslocamento = (dias - primeiro).astype(np.int64)
+        n_dias, k = int(deslocamento.max()) + 1, len(CATEGORIAS)
+        posicao = deslocamento * k + codigos
+        contagens = np.bincount(posicao, minlength=n_dias * k).reshape(n_dias, k)
+        somas = np.bincount(posicao, weights=probabilidades, minlength=n_dias * k).reshape(n_dias, k)
+        diario = pd.DataFrame(
+            np.hstack([contagens, somas]),
+            index=pd.date_range(primeiro, periods=n_dias, freq="D"),
+            columns=COLUNAS_CONTAGEM + COLUNAS_SOMA,
+        )
+        diario = diario[contagens.sum(axis=1) > 0]
+
+        with self._lock:
+            if chave is not None:
+                if chave in self._lotes:
+                    return self
+                self._lotes[chave] = None
+                if len(self._lotes) > self.max_lotes:
+                    del self._lotes[next(iter(self._lotes))]
+            self._somar(diario)
+            self.registros += int(validos.sum())
+            if self.caminho:
+                self._salvar(chave)
+        return self
+
+    def registrar_resultados(self, df_resultados, chave=None):
+        """registrar() com as colunas timestamp/sentimento/probabilidade de um DataFrame de resultados."""
+        return self.registrar(df_resultados["timestamp"], df_resultados["sentimento"], df_resultados["probabilidade"],
+                              chave)
+
+    def serie(self, granularidade="D", inicio=None, fim=None):
+        """
+        Uma linha por período (inclusive os sem textos) entre `inicio` e
+        `fim`: total, confiança média e, por sentimento, contagem,
+        participação (pct_) e confiança média (confianca_).
+        """
+        return _metricas(self._periodos(granularidade, inicio, fim))
+
+    def janela_movel(self, dias=7, inicio=None, fim=None):
+        """Métricas de serie() sobre a janela dos últimos `dias` dias, para cada dia."""
+        diario = self._periodos("D", None, fim)
+        acumulado = diario.rolling(dias, min_periods=1).sum()
+        return _metricas(acumulado.loc[inicio:] if inicio is not None else acumulado)
+
+    def comparar_periodos(self, granularidade="M", inicio=None, fim=None):
+        """
+        serie() com a variação em relação ao período anterior: total em %
+        (variacao_total) e participação e confiança em pontos (delta_).
+        """
+        serie = self.serie(granularidade, None, fim)
+        colunas = ["confianca_media"] + [f"pct_{s}" for s in CATEGORIAS]
+        comparacao = serie[["total"] + colunas].copy()
+        comparacao["variacao_total"] = serie["total"].pct_change().replace([np.inf, -np.inf], np.nan)
+        for coluna in colunas:
+            comparacao[f"delta_{coluna}"] = serie[coluna].diff()
+        return comparacao.loc[inicio:] if inicio is not None else comparacao
+
+    def _periodos(self, granularidade, inicio, fim):
+        with self._lock:
+            agregado = self._agregados[granularidade]
+        if agregado.empty:
+            return agregado
+        indice = pd.date_range(agregado.index.min(), agregado.index.max(), freq=GRANULARIDADES[granularidade])
+        return agregado.reindex(indice, fill_value=0.0).loc[inicio:fim]
+
+    def _somar(self, diario):
+        for granularidade in GRANULARIDADES:
+            parcial = diario.groupby(_inicio_periodo(diario.index, granularidade)).sum()
+            self._agregados[granularidade] = self._agregados[granularidade].add(parcial, fill_value=0.0).sort_index()
+
+    def _salvar(self, chave=None):
+        temporario = self.caminho + ".tmp"
+        self._agregados["D"].to_csv(temporario)
+        os.replace(temporario, self.caminho)
+        if chave is None:
+            return
+        # O arquivo só recebe chaves novas; é reescrito com as atuais quando dobra de tamanho
+        if self._linhas_lotes >= 2 * self.max_lotes:
+            temporario = self.caminho + ".lotes.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                f.writelines(c + "\n" for c in self._lotes)
+            os.replace(temporario, self.caminho + ".lotes")
+            self._linhas_lotes = len(self._lotes)
+        else:
+            with open(self.caminho + ".lotes", "a", encoding="utf-8") as f:
+                f.write(chave + "\n")
+            self._linhas_lotes += 1
+
+
+def gerar_dados_sinteticos(linhas=1_000_000, inicio="2024-01-01", fim="2024-12-31", semente=42):
+    """
+    Resultados sintéticos (timestamp, sentimento, probabilidade) para
+    demonstração, gerados de uma vez com NumPy: mais positivos na primeira
+    metade do período e mais negativos na segunda.
+    """
+    rng = np.random.default_rng(semente)
+    dias = pd.date_range(inicio, fim, freq="D")
+    dia = rng.integers(0, len(dias), linhas)
+    segunda_metade = dia >= len(dias) // 2
+    p_positivo = np.where(segunda_metade, 0.3, 0.6)
+    p_negativo = np.where(segunda_metade, 0.6, 0.3)
+    sorteio = rng.random(linhas)
+    codigos = np.where(sorteio < p_positivo, 0, np.where(sorteio < p_positivo + p_negativo, 1, 2))
+    return pd.DataFrame({
+        "timestamp": dias.to_numpy()[dia] + rng.integers(0, 86_400, linhas).astype("timedelta64[s]"),
+        "sentimento": pd.Categorical.from_codes(codigos, CATEGORIAS),
+        "probabilidade": rng.uniform(0.5, 0.95, linhas),
+    })
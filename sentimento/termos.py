@@ -0,0 +1,70 @@
+"""
+Frequência de termos por sentimento, atualizada à medida que os textos são
+pontuados.
+
+Os textos processados já chegam limpos e sem stop words, então os termos
+são as palavras separadas por espaço; cada sentimento tem o seu Counter.
+As nuvens de palavras (sentimento.graficos.criar_wordcloud) e as tabelas
+de termos mais frequentes saem daqui, sem juntar e retokenizar os textos.
+"""
+import hashlib
+import threading
+from collections import Counter
+from itertools import chain
+
+import pandas as pd
+
+# Termos considerados na nuvem de palavras (o padrão do WordCloud)
+MAX_TERMOS_NUVEM = 200
+
+
+class IndiceTermos:
+    """
+    Counter de termos por sentimento. atualizar() recebe o DataFrame de
+    resultados inteiro a cada chamada e indexa só as linhas novas (os
+    resultados crescem por acréscimo: blocos de um job, parciais).
+    """
+
+    def __init__(self):
+        self.contagens = {}
+        self.total_termos = Counter()
+        self.linhas = 0
+        self._lock = threading.Lock()
+
+    def atualizar(self, df_resultados):
+        with self._lock:
+            if len(df_resultados) < self.linhas:
+                # Não é continuação do que foi indexado: recomeça
+                self.contagens, self.total_termos, self.linhas = {}, Counter(), 0
+            novas = df_resultados.iloc[self.linhas:]
+            if novas.empty:
+                return self
+            for sentimento, textos in novas.groupby("sentimento", observed=True)["texto_processado"]:
+                termos = list(chain.from_iterable(t.split() for t in textos if isinstance(t, str)))
+                self.contagens.setdefault(sentimento, Counter()).update(termos)
+                self.total_termos[sentimento] += len(termos)
+            self.linhas = len(df_resultados)
+        return self
+
+    def frequencias(self, sentimento, n=MAX_TERMOS_NUVEM):
+        """Os `n` termos mais frequentes do sentimento, como dict {termo: ocorrências}."""
+        with self._lock:
+            return dict(self.contagens.get(sentimento, Counter()).most_common(n))
+
+    def top(self, sentimento, n=20):
+        """Tabela dos `n` termos mais frequentes, com a participação no total de termos do sentimento."""
+        frequencias = self.frequencias(sentimento, n)
+        total = self.total_termos.get(sentimento, 0)
+        return pd.DataFrame({
+            "termo": list(frequencias),
+            "ocorrencias": list(frequencias.values()),
+            "participacao": [o / total for o in frequencias.values()],
+        })
+
+
+def impressao_frequencias(frequencias):
+    """Hash estável de um dict {termo: ocorrências}, usado como chave das nuvens renderizadas."""
+    h = hashlib.blake2b(digest_size=16)
+    for termo, ocorrencias in sorted(frequencias.items()):
+        h.update(f"{termo}\x1f{ocorrencias}\x1e".encode("utf-8"))
+    return h.hexdigest()
@@ -0,0 +1,208 @@
+"""
+Limpeza de texto do pipeline de sentimento.
+
+O NormalizadorTexto faz em uma única passada de regex o que a versão
+original do notebook fazia em cinco, e remove acentos com uma tabela de
+tradução em vez de percorrer caractere a caractere após a normalização NFD.
+A saída é idêntica à da função original (ver verificar_paridade).
+
+O IndiceStopwords guarda as stop words já normalizadas (sem acento, em
+lowercase). O índice padrão (obter_stopwords) é construído no primeiro uso,
+não na importação: sem o corpus do NLTK, só o que remove stop words falha.
+"""
+import functools
+import hashlib
+import re
+import sys
+import unicodedata
+
+import nltk
+import numpy as np
+import pandas as pd
+from nltk.corpus import stopwords
+
+
+def _sem_marcas(caractere):
+    return ''.join(c for c in unicodedata.normalize('NFD', caractere) if unicodedata.category(c) != 'Mn')
+
+
+class _TabelaAcentos(dict):
+    """
+    Tabela para str.translate preenchida sob demanda: cada caractere é
+    decomposto (NFD) e tem suas marcas (Mn) removidas uma única vez.
+    """
+
+    def __missing__(self, codigo):
+        traduzido = _sem_marcas(chr(codigo))
+        valor = codigo if traduzido == chr(codigo) else traduzido
+        self[codigo] = valor
+        return valor
+
+
+class NormalizadorTexto:
+    """
+    Remove URLs, menções, hashtags, caracteres especiais, pontuações,
+    números, acentos e espaços extras, convertendo para lowercase.
+    """
+
+    # URLs, menções/hashtags, pontuação e números em uma única alternância.
+    # A ordem das alternativas e o lookahead reproduzem a aplicação
+    # sequencial dos cinco re.sub originais: a URL tem prioridade mesmo
+    # quando aparece colada numa menção ("@fulanohttp://...").
+    PADRAO = re.compile(
+        r'http\S+|www\S+'
+        r'|[@#](?:(?!http\S|www\S)\w)+'
+        r'|[^\w\s]'
+        r'|\d+'
+    )
+
+    def __init__(self):
+        self._sub = self.PADRAO.sub
+        self._tabela = _TabelaAcentos()
+
+    def normalizar(self, texto):
+        if isinstance(texto, str):
+            texto = self._sub('', texto).translate(self._tabela)
+            return ' '.join(texto.split()).lower()
+        return ''
+
+    __call__ = normalizar
+
+    def normalizar_serie(self, serie):
+        """
+        Normaliza uma coluna inteira. Cada valor distinto é limpo uma única
+        vez e o resultado é redistribuído para as linhas repetidas.
+        Valores que não são texto viram ''.
+        """
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        normalizados = np.array([self.normalizar(t) for t in unicos] + [''], dtype=object)
+        # O sentinel -1 (valores ausentes) aponta para o '' final
+        return pd.Series(normalizados[codigos], index=serie.index, name=serie.name, dtype=object)
+
+
+NORMALIZADOR = NormalizadorTexto()
+
+
+def limpar_texto_completo(texto):
+    """
+    Limpa o texto, removendo URLs, menções, hashtags, caracteres especiais,
+    pontuações, números, espaços extras e acentos, convertendo para lowercase.
+    """
+    return NORMALIZADOR.normalizar(texto)
+
+
+class IndiceStopwords:
+    """
+    Conjunto imutável de stop words no mesmo formato da saída de
+    limpar_texto_completo. Listas de domínio ("produto", "celular") são
+    somadas com com_palavras/com_arquivo, gerando um novo índice uma vez.
+    """
+
+    # O notebook mantém a negação, essencial para o sentimento
+    MANTER = frozenset({'nao'})
+
+    def __init__(self, palavras, manter=MANTER):
+        normalizadas = (NORMALIZADOR.normalizar(p) for p in palavras)
+        self.palavras = frozenset(p for p in normalizadas if p) - frozenset(manter)
+
+    @classmethod
+    def portugues(cls):
+        try:
+            palavras = stopwords.words('portuguese')
+        except LookupError:
+            nltk.download('stopwords', quiet=True)
+            palavras = stopwords.words('portuguese')
+        return cls(palavras)
+
+    @functools.cached_property
+    def impressao(self):
+        """Hash curto do conjunto de palavras, para comparar configurações de stop words."""
+        return hashlib.blake2b('\n'.join(sorted(self.palavras)).encode('utf-8'), digest_size=8).hexdigest()
+
+    def com_palavras(self, extras):
+        return IndiceStopwords(self.palavras.union(extras), manter=())
+
+    def com_arquivo(self, caminho):
+        """Soma as palavras de um arquivo texto (uma por linha, # para comentários)."""
+        with open(caminho, encoding='utf-8') as f:
+            extras = [linha.strip() for linha in f if linha.strip() and not linha.startswith('#')]
+        return self.com_palavras(extras)
+
+    def __contains__(self, palavra):
+        return palavra in self.palavras
+
+    def __len__(self):
+        return len(self.palavras)
+
+    def remover(self, texto):
+        """
+        Remove stop words de um texto.
+        """
+        if isinstance(texto, str):
+            palavras = self.palavras
+            return ' '.join([p for p in texto.split() if p not in palavras])
+        return ''
+
+    def remover_serie(self, serie):
+        """
+        Remove stop words de uma coluna inteira; cada valor distinto é
+        processado uma única vez.
+        """
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        resultados = np.array([self.remover(t) for t in unicos] + [''], dtype=object)
+        return pd.Series(resultados[codigos], index=serie.index, name=serie.name, dtype=object)
+
+
+@functools.lru_cache(maxsize=None)
+def obter_stopwords():
+    """Índice das stop words em português do NLTK, construído uma única vez no primeiro uso."""
+    return IndiceStopwords.portugues()
+
+
+def remover_stop_words(texto):
+    """
+    Remove stop words de um texto.
+    """
+    return obter_stopwords().remover(texto)
+
+
+def _limpar_texto_original(texto):
+    # Implementação original do notebook, mantida apenas como referência
+    # para verificar_paridade.
+    if isinstance(texto, str):
+        texto = re.sub(r'http\S+|www\S+|https\S+', '', texto, flags=re.MULTILINE)
+        texto = re.sub(r'@\w+', '', texto)
+        texto = re.sub(r'#\w+', '', texto)
+        texto = re.sub(r'[^\w\s]', '', texto)
+        texto = re.sub(r'\d+', '', texto)
+        texto = ''.join((c for c in unicodedata.normalize('NFD', texto) if unicodedata.category(c) != 'Mn'))
+        texto = ' '.join(texto.split())
+        return texto.lower()
+    return ''
+
+
+def verificar_paridade(caminho_csv='comments_amazon.csv', coluna='Comentario'):
+    """
+    Compara, texto a texto, a saída do NormalizadorTexto (individual e por
+    série) com a implementação original. Retorna a lista de divergências
+    como tuplas (índice, original, esperado, obtido).
+    """
+    serie = pd.read_csv(caminho_csv)[coluna]
+    por_serie = NORMALIZADOR.normalizar_serie(serie)
+    divergencias = []
+    for indice, texto in serie.items():
+        esperado = _limpar_texto_original(texto)
+        for obtido in (NORMALIZADOR.normalizar(texto), por_serie[indice]):
+            if obtido != esperado:
+                divergencias.append((indice, texto, esperado, obtido))
+                break
+    return divergencias
+
+
+if __name__ == '__main__':
+    caminho = sys.argv[1] if len(sys.argv) > 1 else 'comments_amazon.csv'
+    divergencias = verificar_paridade(caminho)
+    for indice, texto, esperado, obtido in divergencias[:20]:
+        print(f"[{indice}] {texto!r}\n  esperado: {esperado!r}\n  obtido:   {obtido!r}")
+    print(f"{len(divergencias)} divergência(s) em {caminho}")
+    sys.exit(1 if divergencias else 0)
@@ -0,0 +1,21 @@
+import sys
+import types
+
+import pytest
+
+from sentimento import pipeline
+
+
+@pytest.fixture
+def inferencia_falsa(monkeypatch):
+    """
+    Substitui sentimento.inferencia por um modelo falso (sem torch): a
+    probabilidade de cada texto é {"POS": len(texto)}. Troque
+    prever_probas_lote no módulo retornado para outro comportamento.
+    """
+    inferencia = types.ModuleType("sentimento.inferencia")
+    inferencia.identificador_modelo = lambda analyzer, max_tokens, truncamento: "falso"
+    inferencia.prever_probas_lote = lambda analyzer, textos, *args, **kwargs: [{"POS": len(t)} for t in textos]
+    monkeypatch.setitem(sys.modules, "sentimento.inferencia", inferencia)
+    monkeypatch.setattr(pipeline, "obter_analyzer", lambda backend=None: None)
+    return inferencia
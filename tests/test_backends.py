@@ -0,0 +1,39 @@
+import types
+
+import pytest
+
+from sentimento.backends import TEXTOS_VERIFICACAO, BackendIndisponivel, ModeloOnnx, exportar_onnx, verificar_onnx
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    # BERT minúsculo e aleatório, sem rede: só a paridade fp32 x ONNX importa
+    palavras = sorted({p for t in TEXTOS_VERIFICACAO + ("texto de exemplo",) for p in t.split()})
+    vocabulario = tmp_path / "vocab.txt"
+    vocabulario.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + palavras))
+    tokenizer = transformers.BertTokenizerFast(str(vocabulario))
+    config = transformers.BertConfig(
+        vocab_size=len(palavras) + 5, hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, num_labels=3,
+    )
+    torch.manual_seed(0)
+    model = transformers.BertForSequenceClassification(config).eval()
+    return types.SimpleNamespace(model=model, tokenizer=tokenizer)
+
+
+def test_onnx_exportado_confere_com_fp32(analyzer, tmp_path):
+    caminho = exportar_onnx(analyzer, str(tmp_path / "model.onnx"))
+    assert verificar_onnx(analyzer, ModeloOnnx(caminho, analyzer.model.config)) < 1e-4
+
+
+def test_divergencia_do_onnx_e_recusada(analyzer, tmp_path):
+    caminho = exportar_onnx(analyzer, str(tmp_path / "model.onnx"))
+    with torch.no_grad():
+        analyzer.model.classifier.bias += 5.0 * torch.tensor([1.0, -1.0, 0.0])
+    with pytest.raises(BackendIndisponivel):
+        verificar_onnx(analyzer, ModeloOnnx(caminho, analyzer.model.config))
@@ -0,0 +1,46 @@
+from sentimento.cache import CachePredicoes, chave_predicao, prever_com_cache
+
+
+def _previsor():
+    chamadas = []
+
+    def prever(textos):
+        chamadas.append(list(textos))
+        return [{"POS": len(t) / 100, "NEG": 0.0, "NEU": 0.0} for t in textos]
+
+    return prever, chamadas
+
+
+def test_textos_repetidos_e_vistos_nao_passam_pelo_modelo():
+    prever, chamadas = _previsor()
+    cache = CachePredicoes()
+    probas = prever_com_cache(["bom", "ruim", "bom"], prever, cache, "m")
+    assert chamadas == [["bom", "ruim"]]
+    assert probas[0] == probas[2]
+
+    prever_com_cache(["ruim", "otimo"], prever, cache, "m")
+    assert chamadas[-1] == ["otimo"]
+
+    # Outro modelo, outras chaves
+    prever_com_cache(["bom"], prever, cache, "outro")
+    assert chamadas[-1] == ["bom"]
+    assert chave_predicao("bom", "m") != chave_predicao("bom", "outro")
+
+
+def test_lru_limita_a_memoria():
+    cache = CachePredicoes(max_itens=2)
+    cache.guardar_muitos({"a": {"POS": 1.0}, "b": {"POS": 1.0}})
+    cache.obter_muitos(["a"])
+    cache.guardar_muitos({"c": {"POS": 1.0}})
+    assert set(cache.obter_muitos(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_sqlite_sobrevive_a_nova_instancia(tmp_path):
+    caminho = str(tmp_path / "cache.sqlite")
+    prever, chamadas = _previsor()
+    prever_com_cache(["bom"], prever, CachePredicoes(caminho_sqlite=caminho), "m")
+
+    cache = CachePredicoes(caminho_sqlite=caminho)
+    assert prever_com_cache(["bom"], prever, cache, "m") == [{"POS": 0.03, "NEG": 0.0, "NEU": 0.0}]
+    assert len(chamadas) == 1
+    assert cache.estatisticas()["acertos_disco"] == 1
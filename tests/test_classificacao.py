@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from sentimento.classificacao import CATEGORIAS, decidir_codigos, decidir_sentimento, matriz_probas, reclassificar
+from sentimento.resultados import BufferResultados
+
+
+def _probas_aleatorias(n, semente=0):
+    rng = np.random.default_rng(semente)
+    matriz = rng.dirichlet([1, 1, 1], n).astype(np.float32)
+    # Empates e valores em cima do threshold
+    matriz[:4] = [[0.4, 0.2, 0.4], [0.3, 0.3, 0.4], [0.55, 0.0, 0.45], [0.2, 0.55, 0.25]]
+    return [{"POS": float(p), "NEG": float(n), "NEU": float(u)} for p, n, u in matriz]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.3, 0.55, 0.9])
+def test_decidir_codigos_igual_a_decidir_sentimento(threshold):
+    probas = _probas_aleatorias(500)
+    matriz = matriz_probas(probas)
+    codigos, probabilidades = decidir_codigos(matriz[:, 0], matriz[:, 1], matriz[:, 2], threshold)
+    for p, codigo, probabilidade in zip(probas, codigos, probabilidades):
+        sentimento, esperada = decidir_sentimento(p, threshold)
+        assert CATEGORIAS[codigo] == sentimento
+        assert probabilidade == pytest.approx(esperada, abs=1e-6)
+
+
+def test_reclassificar_nao_altera_resultados_anteriores():
+    probas = matriz_probas(_probas_aleatorias(50))
+    buffer = BufferResultados(50)
+    buffer.adicionar(["t"] * 50, ["t"] * 50, probas, threshold=0.55)
+    df = buffer.para_dataframe()
+    antes = df[["sentimento", "probabilidade"]].copy()
+
+    novo = reclassificar(df, 0.0)
+    assert not novo["sentimento"].equals(antes["sentimento"])
+    assert df["sentimento"].equals(antes["sentimento"])
+    assert df["probabilidade"].equals(antes["probabilidade"])
@@ -0,0 +1,42 @@
+from sentimento.classificacao import reclassificar
+from sentimento.dashboard import MemoriaDashboard, impressao
+from sentimento.pipeline import pontuar_textos
+from sentimento.texto import IndiceStopwords
+
+STOPWORDS = IndiceStopwords(["de", "o", "a"])
+
+
+def _processador(pontuados):
+    def processar_bloco(textos):
+        pontuados.extend(textos)
+        prever = lambda processados: [{"POS": 0.45, "NEG": 0.1, "NEU": 0.45} for _ in processados]
+        return pontuar_textos(textos, prever, 0.55, STOPWORDS).para_dataframe()
+    return processar_bloco
+
+
+def test_threshold_nao_entra_na_chave_nem_repontua(tmp_path):
+    memoria = MemoriaDashboard(str(tmp_path))
+    textos = ["produto bom", "produto ruim", "produto bom"]
+    pontuados = []
+    chave = impressao("arquivo", "config")
+    memoria.tarefa(chave, textos, "config", _processador(pontuados))(None)
+    assert pontuados == ["produto bom", "produto ruim"]
+
+    resultados = memoria.obter(chave)["resultados"]
+    assert reclassificar(resultados, 0.4)["sentimento"].tolist() == ["positivo"] * 3
+    assert reclassificar(resultados, 0.6)["sentimento"].tolist() == ["incerto"] * 3
+    assert pontuados == ["produto bom", "produto ruim"]
+
+
+def test_arquivo_alterado_pontua_so_textos_novos(tmp_path):
+    memoria = MemoriaDashboard(str(tmp_path))
+    pontuados = []
+    memoria.tarefa(impressao("v1", "config"), ["a bom", "b ruim"], "config", _processador(pontuados))(None)
+    assert memoria.pendentes(["a bom", "b ruim", "c novo"], "config") == 1
+
+    memoria.tarefa(impressao("v2", "config"), ["a bom", "b ruim", "c novo"], "config", _processador(pontuados))(None)
+    assert pontuados == ["a bom", "b ruim", "c novo"]
+    entrada = memoria.obter(impressao("v2", "config"))
+    assert (entrada["novas"], entrada["reaproveitadas"]) == (1, 2)
+    assert MemoriaDashboard(str(tmp_path)).obter(impressao("v2", "config"))["resultados"]["texto_original"].tolist() \
+        == ["a bom", "b ruim", "c novo"]
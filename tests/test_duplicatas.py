@@ -0,0 +1,71 @@
+import pandas as pd
+
+from sentimento import pipeline
+from sentimento.cache import CachePredicoes
+from sentimento.duplicatas import IndiceDuplicatas, colapsar_duplicatas, prever_com_duplicatas
+
+TEXTOS = [
+    "produto muito bom chegou rapido recomendo",
+    "produto muito bom chegou rapido recomendo!",
+    "nao gostei produto muito bom chegou rapido",
+    "produto muito bom chegou rapido",
+    "pessimo atendimento nunca mais compro",
+    "produto muito bom chegou rapido recomendo",
+]
+
+
+def test_agrupa_quase_iguais_e_separa_negacoes():
+    grupos = IndiceDuplicatas(0.8).agrupar(TEXTOS)
+    assert grupos[0] == grupos[1] == grupos[5]
+    assert grupos[2] != grupos[0]
+    assert grupos[4] not in (grupos[0], grupos[2])
+
+
+def test_representante_e_o_primeiro_texto_visto_pelo_indice():
+    parecido = "produto muito bom chegou rapido recomendo sim"
+    anterior = IndiceDuplicatas(0.8)
+    anterior.agrupar([parecido])
+    anterior.agrupar(TEXTOS)
+    assert anterior.representantes[0] == parecido
+    novo = IndiceDuplicatas(0.8)
+    novo.agrupar(TEXTOS)
+    assert novo.representantes[0] == TEXTOS[0]
+
+
+def test_prever_com_duplicatas_so_pontua_representantes():
+    vistos = []
+
+    def prever(textos):
+        vistos.extend(textos)
+        return [[len(t)] for t in textos]
+
+    indice = IndiceDuplicatas(0.8)
+    probas = prever_com_duplicatas(TEXTOS, prever, indice)
+    assert vistos == list(dict.fromkeys(indice.representantes))
+    assert probas[1] == probas[0]
+
+
+def test_colapsar_duplicatas():
+    df = pd.DataFrame({
+        "texto_original": TEXTOS,
+        "texto_processado": TEXTOS,
+        "sentimento": ["positivo", "positivo", "negativo", "positivo", "negativo", "neutro"],
+        "probabilidade": [0.9, 0.8, 0.7, 0.6, 0.9, 0.5],
+    })
+    colapsado = colapsar_duplicatas(df, IndiceDuplicatas(0.8).agrupar(TEXTOS))
+    assert colapsado["ocorrencias"].sum() == len(TEXTOS)
+    primeiro = colapsado.iloc[0]
+    assert primeiro["texto_original"] == TEXTOS[0]
+    assert primeiro["ocorrencias"] == 3 and primeiro["variacoes"] == 2
+    assert primeiro["sentimento"] == "positivo"
+
+
+def test_copias_nao_passam_de_uma_analise_para_outra(inferencia_falsa):
+    # No modelo falso, a probabilidade depende só do próprio texto
+    cache = CachePredicoes()
+
+    # Na primeira análise, TEXTOS[1] é cópia de TEXTOS[0]; na segunda, é o representante
+    primeira = pipeline.prever_probas(TEXTOS[:2], cache=cache, duplicatas=IndiceDuplicatas(0.8))
+    assert primeira[1] == {"POS": len(TEXTOS[0])}
+    segunda = pipeline.prever_probas(TEXTOS[1:2], cache=cache, duplicatas=IndiceDuplicatas(0.8))
+    assert segunda == [{"POS": len(TEXTOS[1])}]
@@ -0,0 +1,87 @@
+import io
+import os
+import time
+
+import pandas as pd
+
+from sentimento.jobs import CONCLUIDO, FilaJobs
+from sentimento.streaming import tarefa_pontuar_csv
+
+
+def _aguardar(fila, job):
+    for _ in range(500):
+        if not job.ativo:
+            return
+        time.sleep(0.01)
+    raise AssertionError("job não terminou")
+
+
+def _processar_bloco(textos):
+    return pd.DataFrame({"sentimento": ["positivo"] * len(textos), "probabilidade": [0.9] * len(textos)})
+
+
+def test_streaming_le_upload_do_disco_e_descartar_remove_arquivos(tmp_path):
+    fila = FilaJobs(str(tmp_path))
+    upload = io.BytesIO(b"Comentario\n" + b"bom\n" * 25)
+    job = fila.submeter("streaming", tarefa_pontuar_csv(upload, "Comentario", _processar_bloco, tamanho_bloco=10))
+    _aguardar(fila, job)
+
+    assert job.estado == CONCLUIDO
+    resultado = fila.resultado(job.id)
+    assert resultado["agregados"]["total"] == 25
+    assert os.path.dirname(resultado["caminho"]) == str(tmp_path)
+    assert len(pd.read_csv(resultado["caminho"])) == 25
+    # A cópia do upload é removida ao terminar
+    assert not os.path.exists(job.arquivo("entrada.csv"))
+
+    fila.descartar(job.id)
+    assert fila.obter(job.id) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_mantem_so_os_ultimos_jobs_finalizados(tmp_path):
+    fila = FilaJobs(str(tmp_path), max_finalizados=2)
+    jobs = []
+    for i in range(4):
+        jobs.append(fila.submeter(f"job {i}", lambda job, i=i: i))
+        _aguardar(fila, jobs[-1])
+    # Espera o fim de _executar (a poda acontece depois do estado final)
+    fila._executor.shutdown(wait=True)
+
+    assert [fila.obter(j.id) is not None for j in jobs] == [False, False, True, True]
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{j.id}.{e}" for j in jobs[2:] for e in ("json", "pkl"))
+    assert fila.resultado(jobs[3].id) == 3
+
+    # Ao reabrir o diretório, o limite também vale
+    assert len(FilaJobs(str(tmp_path), max_finalizados=1).listar()) == 1
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_sem_guardar_resultado_nao_grava_pickle(tmp_path):
+    fila = FilaJobs(str(tmp_path))
+    job = fila.submeter("dashboard", lambda job: "grande", guardar_resultado=False)
+    fila._executor.shutdown(wait=True)
+    assert fila.resultado(job.id) is None
+    assert os.listdir(tmp_path) == [f"{job.id}.json"]
+
+
+def test_limite_de_finalizados_vale_por_sessao(tmp_path):
+    fila = FilaJobs(str(tmp_path), max_finalizados=2)
+    job_a = fila.submeter("a", lambda job: "a", sessao="a")
+    jobs_b = [fila.submeter(f"b {i}", lambda job, i=i: i, sessao="b") for i in range(4)]
+    fila._executor.shutdown(wait=True)
+
+    assert fila.resultado(job_a.id) == "a"
+    assert [fila.obter(j.id) is not None for j in jobs_b] == [False, False, True, True]
+    # A sessão é gravada nos metadados e o limite continua por sessão ao reabrir
+    assert {j.sessao for j in FilaJobs(str(tmp_path), max_finalizados=1).listar()} == {"a", "b"}
+
+
+def test_descarta_finalizados_antigos(tmp_path):
+    fila = FilaJobs(str(tmp_path))
+    job = fila.submeter("antigo", lambda job: 1, sessao="a")
+    fila._executor.shutdown(wait=True)
+    assert fila.obter(job.id) is not None
+
+    assert FilaJobs(str(tmp_path), max_idade=0).listar() == []
+    assert os.listdir(tmp_path) == []
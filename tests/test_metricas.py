@@ -0,0 +1,32 @@
+import threading
+
+from sentimento.metricas import Metricas
+
+
+def test_ativacao_local_nao_vaza_para_outras_threads():
+    metricas = Metricas()
+    metricas.ativar_local(True)
+    with metricas.medir("limpeza"):
+        pass
+
+    def outra_sessao():
+        with metricas.medir("limpeza"):
+            pass
+
+    thread = threading.Thread(target=outra_sessao)
+    thread.start()
+    thread.join()
+    assert metricas.resumo()["limpeza"]["chamadas"] == 1
+
+
+def test_ativado_vale_so_no_bloco():
+    metricas = Metricas()
+    with metricas.ativado(True):
+        with metricas.medir("inferencia", 4):
+            pass
+    with metricas.medir("inferencia"):
+        pass
+    with metricas.medir("inferencia", ativo=True):
+        pass
+    assert metricas.resumo()["inferencia"]["chamadas"] == 2
+    assert metricas.resumo()["inferencia"]["itens"] == 5
@@ -0,0 +1,21 @@
+from sentimento import pipeline
+from sentimento.texto import IndiceStopwords
+
+STOPWORDS = IndiceStopwords(["de", "o", "a"])
+
+
+def test_texto_unico_usa_o_caminho_do_lote(inferencia_falsa):
+    chamadas = []
+
+    def prever_probas_lote(analyzer, textos, batch_size, max_tokens, truncamento, **kwargs):
+        chamadas.append((list(textos), max_tokens, truncamento))
+        return [{"POS": 0.9, "NEG": 0.05, "NEU": 0.05} for _ in textos]
+
+    inferencia_falsa.prever_probas_lote = prever_probas_lote
+
+    modelo = pipeline.SentimentPipeline()
+    resultado = modelo.processar_texto("Produto BOM de verdade", STOPWORDS)
+    lote = modelo.processar_lote(["Produto BOM de verdade"], indice_stopwords=STOPWORDS).para_dataframe()
+
+    assert chamadas == [(["produto bom verdade"], 128, "inicio")] * 2
+    assert resultado["sentimento"] == lote["sentimento"].iat[0] == "positivo"
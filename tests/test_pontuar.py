@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from sentimento import pontuar
+from sentimento.artefato import ArtefatoInvalido
+from sentimento.pontuar import CheckpointInvalido, pontuar_arquivo
+from sentimento.texto import IndiceStopwords
+
+STOPWORDS = IndiceStopwords(["de", "o", "a"])
+
+
+def _prever(processados):
+    return [{"POS": 0.8 if "bom" in t else 0.1, "NEG": 0.1, "NEU": 0.1} for t in processados]
+
+
+def _entrada(tmp_path, linhas=25):
+    caminho = tmp_path / "entrada.csv"
+    textos = [f"produto {'bom' if i % 2 else 'ruim'} numero {chr(97 + i % 26)}" for i in range(linhas)]
+    pd.DataFrame({"id": range(linhas), "Comentario": textos}).to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def _interromper_apos(blocos):
+    chamadas = []
+
+    def prever(processados):
+        if len(chamadas) == blocos:
+            raise KeyboardInterrupt
+        chamadas.append(1)
+        return _prever(processados)
+
+    return prever
+
+
+def test_retomada_gera_a_mesma_saida(tmp_path):
+    entrada = _entrada(tmp_path)
+    completa, retomada = str(tmp_path / "completa.csv"), str(tmp_path / "retomada.csv")
+    pontuar_arquivo(entrada, completa, "Comentario", _prever, "m", indice_stopwords=STOPWORDS,
+                    tamanho_bloco=10, log=lambda m: None)
+
+    with pytest.raises(KeyboardInterrupt):
+        pontuar_arquivo(entrada, retomada, "Comentario", _interromper_apos(2), "m", indice_stopwords=STOPWORDS,
+                        tamanho_bloco=10, log=lambda m: None)
+    resumo = pontuar_arquivo(entrada, retomada, "Comentario", _prever, "m", indice_stopwords=STOPWORDS,
+                             tamanho_bloco=10, log=lambda m: None)
+
+    assert resumo["linhas_nesta_execucao"] == 5
+    assert resumo["agregados"]["total"] == 25
+    colunas = ["id", "Comentario", "texto_processado", "sentimento", "probabilidade"]
+    pd.testing.assert_frame_equal(pd.read_csv(completa)[colunas], pd.read_csv(retomada)[colunas])
+
+
+@pytest.mark.parametrize("mudanca", [
+    {"indice_stopwords": STOPWORDS.com_palavras(["produto"])},
+    {"configuracao": {"max_tokens": 64}},
+    {"threshold": 0.7},
+])
+def test_checkpoint_de_outra_configuracao_e_recusado(tmp_path, mudanca):
+    entrada, saida = _entrada(tmp_path), str(tmp_path / "saida.csv")
+    base = dict(indice_stopwords=STOPWORDS, configuracao={"max_tokens": 128}, tamanho_bloco=10, log=lambda m: None)
+    with pytest.raises(KeyboardInterrupt):
+        pontuar_arquivo(entrada, saida, "Comentario", _interromper_apos(1), "m", **base)
+    with pytest.raises(CheckpointInvalido):
+        pontuar_arquivo(entrada, saida, "Comentario", _prever, "m", **{**base, **mudanca})
+
+
+def test_cli_artefato_invalido_sai_com_erro(tmp_path, monkeypatch, capsys, inferencia_falsa):
+    def obter_analyzer(backend=None):
+        raise ArtefatoInvalido("modelo_sentimento/model.safetensors: SHA-256 diferente do manifesto")
+
+    monkeypatch.setattr(pontuar, "obter_analyzer", obter_analyzer)
+    monkeypatch.setattr(pontuar, "obter_stopwords", lambda: STOPWORDS)
+    with pytest.raises(SystemExit) as saida:
+        pontuar.main([_entrada(tmp_path), str(tmp_path / "saida.csv")])
+    assert saida.value.code == 1
+    assert "SHA-256 diferente do manifesto" in capsys.readouterr().err
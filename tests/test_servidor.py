@@ -0,0 +1,43 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sentimento.servidor import ServicoSentimento, criar_servidor
+from sentimento.texto import IndiceStopwords
+
+
+@pytest.fixture
+def url():
+    servico = ServicoSentimento(lambda textos: [{"POS": 0.9, "NEG": 0.05, "NEU": 0.05} for _ in textos], "m",
+                                indice_stopwords=IndiceStopwords(["de"]), janela_ms=0)
+    servidor = criar_servidor(servico, porta=0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+    servico.fechar()
+
+
+def _post(url, corpo):
+    requisicao = urllib.request.Request(url, json.dumps(corpo).encode("utf-8"), method="POST")
+    try:
+        with urllib.request.urlopen(requisicao) as resposta:
+            return resposta.status, json.load(resposta)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_analisar(url):
+    status, corpo = _post(url + "/analisar", {"texto": "muito bom", "threshold": 0.5})
+    assert status == 200
+    assert corpo["sentimento"] == "positivo"
+
+
+@pytest.mark.parametrize("threshold", [True, "0.5", [0.5]])
+def test_threshold_invalido(url, threshold):
+    status, corpo = _post(url + "/analisar", {"texto": "muito bom", "threshold": threshold})
+    assert status == 400
+    assert "threshold" in corpo["erro"]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from sentimento.classificacao import CATEGORIAS
+from sentimento.tendencias import ArmazemTendencias, gerar_dados_sinteticos
+
+
+def test_serie_diaria_igual_ao_groupby():
+    df = gerar_dados_sinteticos(5_000, inicio="2024-01-01", fim="2024-01-31")
+    serie = ArmazemTendencias().registrar_resultados(df).serie("D")
+    esperado = df.groupby([df["timestamp"].dt.normalize(), "sentimento"], observed=False).size().unstack()
+    for sentimento in CATEGORIAS:
+        assert np.array_equal(serie[sentimento].to_numpy(), esperado[sentimento].to_numpy())
+    assert serie["total"].sum() == len(df)
+
+
+def test_lote_com_mesma_chave_registrado_uma_vez(tmp_path):
+    caminho = str(tmp_path / "diario.csv")
+    df = gerar_dados_sinteticos(100)
+    armazem = ArmazemTendencias(caminho)
+    armazem.registrar_resultados(df, "lote-1").registrar_resultados(df, "lote-1")
+    assert armazem.registros == 100
+
+    # A chave continua valendo depois de reabrir o armazém
+    reaberto = ArmazemTendencias(caminho)
+    reaberto.registrar_resultados(df, "lote-1")
+    assert reaberto.registros == 100
+    reaberto.registrar_resultados(df, "lote-2").registrar_resultados(df)
+    assert reaberto.registros == 300
+    assert pd.read_csv(caminho)[[f"n_{s}" for s in CATEGORIAS]].to_numpy().sum() == 300
+
+
+def test_chaves_de_lotes_limitadas(tmp_path):
+    caminho = str(tmp_path / "diario.csv")
+    df = gerar_dados_sinteticos(10)
+    armazem = ArmazemTendencias(caminho, max_lotes=3)
+    for i in range(8):
+        armazem.registrar_resultados(df, f"lote-{i}")
+    with open(caminho + ".lotes", encoding="utf-8") as f:
+        assert len(f.read().split()) <= 2 * 3
+
+    # Só as chaves mais recentes são lembradas, também depois de reabrir
+    reaberto = ArmazemTendencias(caminho, max_lotes=3)
+    reaberto.registrar_resultados(df, "lote-7").registrar_resultados(df, "lote-0")
+    assert reaberto.registros == 90
@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+import pytest
+
+from sentimento.texto import NORMALIZADOR, IndiceStopwords, _limpar_texto_original, _TabelaAcentos, verificar_paridade
+
+TEXTOS = [
+    "Muito bom!!! Recomendo 100%",
+    "Não gostei... chegou QUEBRADO 😡😡",
+    "Veja em https://www.amazon.com.br/produto?id=123 e www.exemplo.com",
+    "@fulano obrigado #recomendo",
+    "@fulanohttp://site.com colado na menção",
+    "#hashtag_com_underscore e @user_123",
+    "Ação, coração, pão e maçã à vista",
+    "ÁÉÍÓÚ âêô ãõ ç ü ñ",
+    "  espaços\t\tdemais \n quebra  ",
+    "números 2024 e 3,14 no meio",
+    "só emojis 👏🏼👏🏼👏🏼",
+    "",
+    "   ",
+    "ﬁ ligadura e ª ordinal",
+]
+
+CSV_COMENTARIOS = os.path.join(os.path.dirname(__file__), os.pardir, "comments_amazon.csv")
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_normalizar_igual_ao_original(texto):
+    assert NORMALIZADOR.normalizar(texto) == _limpar_texto_original(texto)
+
+
+def test_normalizar_serie_igual_ao_original():
+    serie = pd.Series(TEXTOS + [None, float("nan"), 42, TEXTOS[0]], dtype=object)
+    esperado = [_limpar_texto_original(t) for t in serie]
+    assert NORMALIZADOR.normalizar_serie(serie).tolist() == esperado
+
+
+@pytest.mark.skipif(not os.path.exists(CSV_COMENTARIOS), reason="comments_amazon.csv ausente")
+def test_paridade_com_comments_amazon():
+    assert verificar_paridade(CSV_COMENTARIOS) == []
+
+
+def test_tabela_acentos_remove_marcas():
+    tabela = _TabelaAcentos()
+    assert "ãéíôüç".translate(tabela) == "aeiouc"
+    assert "abc".translate(tabela) == "abc"
+    assert ord("a") in tabela
+
+
+def test_indice_stopwords_normaliza_e_mantem_negacao():
+    indice = IndiceStopwords(["de", "Não", "Você"])
+    assert "voce" in indice
+    assert "nao" not in indice
+    assert indice.remover("nao gostei de voce") == "nao gostei"
+    assert indice.com_palavras(["gostei"]).remover("nao gostei de voce") == "nao"